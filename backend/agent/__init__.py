@@ -1 +1,4 @@
 from .growth_agent import GrowthAgent
+from .plan_cache import PlanCache, fingerprint, plan_key
+from .plan_parser import GrowthPlanParser
+from .single_flight import SingleFlight
@@ -2,33 +2,22 @@
 LangChain Growth Agent powered by Google Gemini
 Analyzes CRM data and provides strategic growth plans
 """
+import asyncio
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
+import httpx
 from dotenv import load_dotenv
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
 
-load_dotenv()
+from .plan_parser import SECTION_FIELDS, GrowthPlanParser
 
+load_dotenv()
 
-class GrowthAgent:
-    """AI Agent for analyzing CRM data and generating growth plans"""
-    
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            raise ValueError("Please set a valid GEMINI_API_KEY in your .env file")
-        
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
-            google_api_key=api_key,
-            temperature=0.7
-        )
-        
-        self.system_prompt = """You are an expert CRM analyst and business growth strategist. 
+SYSTEM_PROMPT = """You are an expert CRM analyst and business growth strategist. 
 Your role is to analyze customer relationship management data and provide actionable growth plans.
 
 You have access to the following CRM data metrics:
@@ -49,6 +38,56 @@ Format your response as a structured growth plan with:
 
 Be data-driven and reference specific metrics from the provided data."""
 
+TIMEFRAME_CONTEXT = {
+    "day": "the next 24 hours, focusing on immediate actions and quick wins",
+    "week": "the next 7 days, balancing quick wins with short-term initiatives",
+    "month": "the next 30 days, with emphasis on measurable monthly targets",
+    "quarter": "the next 90 days, focusing on strategic initiatives and quarterly goals",
+    "year": "the next 12 months, with long-term vision and major milestones"
+}
+
+FOCUS_CONTEXT = {
+    "sales": "Focus specifically on sales pipeline optimization, deal closure strategies, and revenue growth.",
+    "marketing": "Focus specifically on lead generation, marketing campaigns, and brand awareness.",
+    "retention": "Focus specifically on customer retention, reducing churn, and increasing customer lifetime value."
+}
+
+
+class GrowthAgent:
+    """AI Agent for analyzing CRM data and generating growth plans
+
+    Build one per process and share it: the LLM client keeps a pool of
+    keep-alive connections (GEMINI_MAX_CONNECTIONS, GEMINI_KEEPALIVE_SECONDS)
+    so requests skip connection and TLS setup. Call aclose() on shutdown.
+    The async methods allow GEMINI_MAX_CONCURRENCY calls in flight at once
+    and give each GEMINI_TIMEOUT_SECONDS to answer; the astream methods
+    hold their slot until the answer has finished streaming.
+    """
+    
+    def __init__(self):
+        api_key = os.getenv("GEMINI_API_KEY")
+        if not api_key or api_key == "your_gemini_api_key_here":
+            raise ValueError("Please set a valid GEMINI_API_KEY in your .env file")
+        
+        max_connections = int(os.getenv("GEMINI_MAX_CONNECTIONS", "20"))
+        self.llm = ChatGoogleGenerativeAI(
+            model="gemini-2.0-flash",
+            google_api_key=api_key,
+            temperature=0.7,
+            client_args={"limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "60"))
+            )}
+        )
+        self.timeout_seconds = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "60"))
+        self._slots = asyncio.Semaphore(int(os.getenv("GEMINI_MAX_CONCURRENCY", "8")))
+
+    async def aclose(self) -> None:
+        """Close the LLM client's connection pools"""
+        await self.llm.aclose()
+
+
     def _format_crm_data(self, analytics_data: dict) -> str:
         """Format CRM analytics data for the prompt"""
         return f"""
@@ -123,27 +162,48 @@ TOP PERFORMING:
         Returns:
             Structured growth plan dictionary
         """
-        timeframe_context = {
-            "day": "the next 24 hours, focusing on immediate actions and quick wins",
-            "week": "the next 7 days, balancing quick wins with short-term initiatives",
-            "month": "the next 30 days, with emphasis on measurable monthly targets",
-            "quarter": "the next 90 days, focusing on strategic initiatives and quarterly goals",
-            "year": "the next 12 months, with long-term vision and major milestones"
-        }
+        messages = self._growth_plan_messages(timeframe, analytics_data, focus_area)
+        try:
+            response = self.llm.invoke(messages)
+            plan_content = response.content
+            
+            # Parse the response into structured format
+            return self._parse_growth_plan(plan_content, timeframe, analytics_data)
+            
+        except Exception as e:
+            return self._error_plan(timeframe, e)
+
+    async def agenerate_growth_plan(
+        self,
+        timeframe: str,
+        analytics_data: dict,
+        focus_area: Optional[str] = None
+    ) -> dict:
+        """
+        Async generate_growth_plan that never blocks a worker thread
         
+        Raises:
+            asyncio.TimeoutError: when no answer arrives within the call deadline
+        """
+        messages = self._growth_plan_messages(timeframe, analytics_data, focus_area)
+        try:
+            response = await self._ainvoke(messages)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            return self._error_plan(timeframe, e)
+        return self._parse_growth_plan(response.content, timeframe, analytics_data)
+
+    def _growth_plan_messages(self, timeframe: str, analytics_data: dict, focus_area: Optional[str]) -> list:
+        """Build the prompt messages for a growth plan"""
         focus_context = ""
         if focus_area and focus_area != "all":
-            focus_map = {
-                "sales": "Focus specifically on sales pipeline optimization, deal closure strategies, and revenue growth.",
-                "marketing": "Focus specifically on lead generation, marketing campaigns, and brand awareness.",
-                "retention": "Focus specifically on customer retention, reducing churn, and increasing customer lifetime value."
-            }
-            focus_context = focus_map.get(focus_area, "")
+            focus_context = FOCUS_CONTEXT.get(focus_area, "")
         
         crm_data_formatted = self._format_crm_data(analytics_data)
         
         user_prompt = f"""
-Please analyze the CRM data and create a comprehensive growth plan for {timeframe_context.get(timeframe, 'the specified period')}.
+Please analyze the CRM data and create a comprehensive growth plan for {TIMEFRAME_CONTEXT.get(timeframe, 'the specified period')}.
 
 {focus_context}
 
@@ -191,95 +251,45 @@ If these recommendations are implemented:
 Please be specific, data-driven, and actionable in your recommendations.
 """
 
-        messages = [
-            SystemMessage(content=self.system_prompt.format(crm_data=crm_data_formatted)),
+        return [
+            SystemMessage(content=SYSTEM_PROMPT.format(crm_data=crm_data_formatted)),
             HumanMessage(content=user_prompt)
         ]
-        
-        try:
-            response = self.llm.invoke(messages)
-            plan_content = response.content
-            
-            # Parse the response into structured format
-            return self._parse_growth_plan(plan_content, timeframe, analytics_data)
-            
-        except Exception as e:
-            return {
-                "timeframe": timeframe,
-                "analysis_summary": f"Error generating plan: {str(e)}",
-                "key_insights": ["Unable to generate insights due to an error"],
-                "action_items": [],
-                "predicted_outcomes": {},
-                "risks_and_challenges": ["Please check your API key and try again"],
-                "generated_at": datetime.utcnow().isoformat()
-            }
+
+    def _error_plan(self, timeframe: str, error: Exception) -> dict:
+        """Plan returned when the LLM call failed"""
+        return {
+            "timeframe": timeframe,
+            "analysis_summary": f"Error generating plan: {str(error)}",
+            "key_insights": ["Unable to generate insights due to an error"],
+            "action_items": [],
+            "predicted_outcomes": {},
+            "risks_and_challenges": ["Please check your API key and try again"],
+            "generated_at": datetime.utcnow().isoformat(),
+            "error": str(error)
+        }
+
+    async def _ainvoke(self, messages: list):
+        """Call the LLM without blocking, within the concurrency limit and the call deadline
+
+        Waiting for a free slot counts towards the deadline.
+        """
+        async def call():
+            async with self._slots:
+                return await self.llm.ainvoke(messages)
+
+        return await asyncio.wait_for(call(), self.timeout_seconds)
 
     def _parse_growth_plan(self, content: str, timeframe: str, analytics_data: dict) -> dict:
         """Parse the LLM response into a structured format"""
-        
-        # Extract sections from the response
-        sections = {
-            "summary": "",
-            "insights": [],
-            "actions": [],
-            "outcomes": {},
-            "risks": []
-        }
-        
-        # Simple parsing - in production, you'd want more robust parsing
-        lines = content.split('\n')
-        current_section = None
-        current_text = []
-        
-        for line in lines:
-            line_lower = line.lower().strip()
-            
-            if 'executive summary' in line_lower:
-                current_section = 'summary'
-                current_text = []
-            elif 'key insight' in line_lower:
-                if current_section == 'summary':
-                    sections['summary'] = ' '.join(current_text).strip()
-                current_section = 'insights'
-                current_text = []
-            elif 'action item' in line_lower or 'immediate action' in line_lower:
-                current_section = 'actions'
-            elif 'predicted outcome' in line_lower:
-                current_section = 'outcomes'
-            elif 'risk' in line_lower and 'challenge' in line_lower:
-                current_section = 'risks'
-            elif current_section:
-                if line.strip():
-                    if current_section == 'summary':
-                        current_text.append(line.strip())
-                    elif current_section == 'insights' and line.strip().startswith(('1', '2', '3', '4', '5', '-', '*', '•')):
-                        # Clean up the insight text
-                        insight = line.strip().lstrip('0123456789.-*• ')
-                        if insight and len(insight) > 5:
-                            sections['insights'].append(insight)
-                    elif current_section == 'actions' and line.strip():
-                        # Parse action items
-                        if line.strip().startswith(('1', '2', '3', '-', '*', '•')) or '**' in line or 'Title' in line:
-                            action_text = line.strip().lstrip('0123456789.-*• ')
-                            if action_text and len(action_text) > 5:
-                                priority = 'medium'
-                                if 'high' in line.lower():
-                                    priority = 'high'
-                                elif 'low' in line.lower():
-                                    priority = 'low'
-                                sections['actions'].append({
-                                    "title": action_text[:100].replace('**', '').strip(),
-                                    "priority": priority,
-                                    "description": action_text
-                                })
-                    elif current_section == 'risks' and line.strip().startswith(('1', '2', '3', '-', '*', '•')):
-                        risk = line.strip().lstrip('0123456789.-*• ')
-                        if risk and len(risk) > 5:
-                            sections['risks'].append(risk)
-        
-        # Finalize summary if not done
-        if current_section == 'summary' and current_text:
-            sections['summary'] = ' '.join(current_text).strip()
+        parser = GrowthPlanParser()
+        parser.feed(content)
+        parser.close()
+        return self._build_plan(parser, content, timeframe)
+
+    def _build_plan(self, parser: GrowthPlanParser, content: str, timeframe: str) -> dict:
+        """Assemble the growth plan from parsed sections, filling in missing ones"""
+        sections = parser.sections
         
         # Ensure we have some content
         if not sections['summary']:
@@ -294,18 +304,82 @@ Please be specific, data-driven, and actionable in your recommendations.
         return {
             "timeframe": timeframe,
             "analysis_summary": sections['summary'],
-            "key_insights": sections['insights'][:5],  # Limit to 5
-            "action_items": sections['actions'][:10],  # Limit to 10
+            "key_insights": parser.value('insights'),  # Limit to 5
+            "action_items": parser.value('actions'),  # Limit to 10
             "predicted_outcomes": {
                 "revenue_impact": "See detailed analysis",
                 "customer_impact": "See detailed analysis",
                 "pipeline_impact": "See detailed analysis"
             },
-            "risks_and_challenges": sections['risks'][:5],  # Limit to 5
+            "risks_and_challenges": parser.value('risks'),  # Limit to 5
             "generated_at": datetime.utcnow().isoformat(),
             "full_response": content  # Include full response for reference
         }
 
+    async def astream_growth_plan(
+        self,
+        timeframe: str,
+        analytics_data: dict,
+        focus_area: Optional[str] = None
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Stream a growth plan as it is generated
+        
+        Yields ("token", text) for every chunk of the response, ("section",
+        {"name", "content"}) as each of summary, insights, actions and risks
+        completes, then ("plan", plan) with the full structured plan. Sections
+        the response lacks, or that came out empty and got fallback content,
+        are (re)sent before the plan, so the last section event for each name
+        always matches the plan.
+        Unlike agenerate_growth_plan, LLM errors are raised rather than turned
+        into an error plan, since part of the answer may already be streamed.
+        
+        Raises:
+            asyncio.TimeoutError: when the answer does not finish within the call deadline
+            Exception: whatever the LLM call raised
+        """
+        messages = self._growth_plan_messages(timeframe, analytics_data, focus_area)
+        parser = GrowthPlanParser()
+        chunks, reported = [], {}
+        async for text in self._astream(messages):
+            chunks.append(text)
+            yield "token", text
+            for name in parser.feed(text):
+                reported[name] = parser.value(name)
+                yield "section", {"name": name, "content": reported[name]}
+
+        content = "".join(chunks)
+        parser.close()
+        plan = self._build_plan(parser, content, timeframe)
+        for name, field in SECTION_FIELDS.items():
+            if name not in reported or reported[name] != plan[field]:
+                yield "section", {"name": name, "content": plan[field]}
+        yield "plan", plan
+
+    async def _astream(self, messages: list) -> AsyncIterator[str]:
+        """Stream the LLM's answer as text chunks, within the concurrency limit and the call deadline
+
+        The slot is held until the stream ends; waiting for it counts towards
+        the deadline, which covers the whole answer.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout_seconds
+        await asyncio.wait_for(self._slots.acquire(), self.timeout_seconds)
+        stream = None
+        try:
+            stream = self.llm.astream(messages)
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(stream.__anext__(), deadline - loop.time())
+                except StopAsyncIteration:
+                    return
+                if isinstance(chunk.content, str) and chunk.content:
+                    yield chunk.content
+        finally:
+            self._slots.release()
+            if stream is not None:
+                await stream.aclose()
+
     def ask_question(self, question: str, analytics_data: dict) -> str:
         """
         Ask a free-form question about the CRM data
@@ -317,9 +391,43 @@ Please be specific, data-driven, and actionable in your recommendations.
         Returns:
             AI response as a string
         """
+        try:
+            response = self.llm.invoke(self._question_messages(question, analytics_data))
+            return response.content
+        except Exception as e:
+            return f"I apologize, but I encountered an error processing your question: {str(e)}"
+
+    async def aask_question(self, question: str, analytics_data: dict) -> str:
+        """
+        Async ask_question that never blocks a worker thread
+        
+        Raises:
+            asyncio.TimeoutError: when no answer arrives within the call deadline
+        """
+        try:
+            response = await self._ainvoke(self._question_messages(question, analytics_data))
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            return f"I apologize, but I encountered an error processing your question: {str(e)}"
+        return response.content
+
+    async def astream_answer(self, question: str, analytics_data: dict) -> AsyncIterator[str]:
+        """
+        Stream the answer to a free-form question as text chunks
+        
+        Raises:
+            asyncio.TimeoutError: when the answer does not finish within the call deadline
+            Exception: whatever the LLM call raised
+        """
+        async for text in self._astream(self._question_messages(question, analytics_data)):
+            yield text
+
+    def _question_messages(self, question: str, analytics_data: dict) -> list:
+        """Build the prompt messages for a free-form question"""
         crm_data_formatted = self._format_crm_data(analytics_data)
         
-        messages = [
+        return [
             SystemMessage(content=f"""You are a helpful CRM analyst assistant. 
 You have access to the following business data:
 
@@ -329,9 +437,3 @@ Answer questions clearly and concisely, referencing specific data points when re
 If you don't have enough information to answer accurately, say so."""),
             HumanMessage(content=question)
         ]
-        
-        try:
-            response = self.llm.invoke(messages)
-            return response.content
-        except Exception as e:
-            return f"I apologize, but I encountered an error processing your question: {str(e)}"
@@ -0,0 +1,170 @@
+"""
+Growth plan cache
+Plans are keyed by timeframe, focus area and a fingerprint of the analytics
+data they were generated from, so a repeat request against unchanged data is
+answered without another LLM round trip. Entries expire after a TTL, the
+memory tier evicts least recently used plans, and an optional directory of
+JSON files keeps plans across restarts
+"""
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+def fingerprint(analytics_data: dict) -> str:
+    """Get a stable hash of analytics data, independent of key order"""
+    payload = json.dumps(analytics_data, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def plan_key(timeframe: str, focus_area: Optional[str], analytics_data: dict) -> str:
+    """Get the cache key of a growth plan request; no focus area means "all\""""
+    return f"{timeframe}:{focus_area or 'all'}:{fingerprint(analytics_data)}"
+
+
+class PlanCache:
+    """TTL + LRU cache of generated plans with an optional on-disk tier
+
+    The memory tier holds at most max_entries plans. With a directory, every
+    plan is also written there as one JSON file and read back on a memory
+    miss, e.g. after a restart. Expired files are deleted when read, and
+    swept by age on startup and at most once per TTL on writes.
+    """
+
+    def __init__(self, ttl_seconds: float = 900.0, max_entries: int = 128, directory: Optional[str] = None):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.shared = 0
+        self.evictions = 0
+        # key -> (expires_at wall clock time, plan), least recently used first
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._swept_at = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._sweep(time.time())
+
+    @classmethod
+    def from_env(cls) -> "PlanCache":
+        """Build the cache from GROWTH_PLAN_CACHE_TTL, GROWTH_PLAN_CACHE_SIZE and GROWTH_PLAN_CACHE_DIR"""
+        return cls(
+            ttl_seconds=float(os.getenv("GROWTH_PLAN_CACHE_TTL", "900")),
+            max_entries=int(os.getenv("GROWTH_PLAN_CACHE_SIZE", "128")),
+            directory=os.getenv("GROWTH_PLAN_CACHE_DIR") or None
+        )
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get a fresh cached plan, or None"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        entry = self._read(key, now)
+        if entry is not None:
+            self._remember(key, entry)
+            self.disk_hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def share(self) -> None:
+        """Count the last miss as shared: the request joined a plan already being generated"""
+        self.misses -= 1
+        self.shared += 1
+
+    def put(self, key: str, plan: dict) -> None:
+        """Cache a plan for ttl_seconds"""
+        now = time.time()
+        entry = (now + self.ttl_seconds, plan)
+        self._remember(key, entry)
+        self._write(key, entry)
+        if self.directory and now - self._swept_at > self.ttl_seconds:
+            self._sweep(now)
+
+    def clear(self) -> None:
+        """Drop every plan from both tiers"""
+        self._entries.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def stats(self) -> dict:
+        """Get the entry count and hit/miss counters
+
+        hit_rate is the share of lookups answered without a model call of
+        their own: hits, disk hits and misses that shared another request's call.
+        """
+        avoided = self.hits + self.disk_hits + self.shared
+        lookups = avoided + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk": self.directory is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "evictions": self.evictions,
+            "hit_rate": round(avoided / lookups, 3) if lookups else 0.0
+        }
+
+    def _remember(self, key: str, entry: tuple[float, dict]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _sweep(self, now: float) -> None:
+        """Delete plan files written more than a TTL ago"""
+        self._swept_at = now
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".json") and os.path.getmtime(path) + self.ttl_seconds <= now:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest() + ".json")
+
+    def _read(self, key: str, now: float) -> Optional[tuple[float, dict]]:
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if stored.get("key") != key or stored.get("expires_at", 0) <= now:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored["expires_at"], stored["plan"]
+
+    def _write(self, key: str, entry: tuple[float, dict]) -> None:
+        if not self.directory:
+            return
+        path = self._path(key)
+        # Write then rename, so a crash never leaves a half-written plan behind
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"key": key, "expires_at": entry[0], "plan": entry[1]}, file, default=str)
+        os.replace(temporary, path)
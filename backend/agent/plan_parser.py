@@ -0,0 +1,125 @@
+"""
+Incremental growth plan parser
+Reads the LLM response line by line as it streams in and reports each
+section (summary, insights, actions, risks) as soon as the next section
+header shows it is complete
+"""
+from typing import Optional
+
+# Sections reported to clients, with the growth plan field holding each one
+SECTION_FIELDS = {
+    "summary": "analysis_summary",
+    "insights": "key_insights",
+    "actions": "action_items",
+    "risks": "risks_and_challenges"
+}
+
+SECTION_LIMITS = {"insights": 5, "actions": 10, "risks": 5}
+
+
+class GrowthPlanParser:
+    """Stateful parser for growth plan text fed in arbitrary chunks
+
+    feed() and close() return the names of the sections they completed; a
+    section is complete when the text moves on to another header, or at
+    the end of the text. Each section is reported once.
+    """
+
+    def __init__(self):
+        self.sections = {
+            "summary": "",
+            "insights": [],
+            "actions": [],
+            "outcomes": {},
+            "risks": []
+        }
+        self._section: Optional[str] = None
+        self._summary_lines: list[str] = []
+        self._partial = ""
+        self._completed: list[str] = []
+
+    def feed(self, text: str) -> list[str]:
+        """Consume a chunk of the response, parsing every line it finishes"""
+        *lines, self._partial = (self._partial + text).split('\n')
+        completed = []
+        for line in lines:
+            completed += self._line(line)
+        return completed
+
+    def close(self) -> list[str]:
+        """Consume the end of the response, completing the open section"""
+        completed = self._line(self._partial)
+        self._partial = ""
+        return completed + self._leave()
+
+    def value(self, section: str):
+        """Get the parsed value of a section, limited as in the final plan"""
+        value = self.sections[section]
+        limit = SECTION_LIMITS.get(section)
+        return value[:limit] if limit else value
+
+    def _line(self, line: str) -> list[str]:
+        line_lower = line.lower().strip()
+
+        if 'executive summary' in line_lower:
+            completed = self._enter('summary')
+            self._summary_lines = []
+            return completed
+        if 'key insight' in line_lower:
+            return self._enter('insights')
+        if 'action item' in line_lower or 'immediate action' in line_lower:
+            return self._enter('actions')
+        if 'predicted outcome' in line_lower:
+            return self._enter('outcomes')
+        if 'risk' in line_lower and 'challenge' in line_lower:
+            return self._enter('risks')
+
+        section = self._section
+        stripped = line.strip()
+        if not section or not stripped:
+            return []
+
+        if section == 'summary':
+            self._summary_lines.append(stripped)
+        elif section == 'insights' and stripped.startswith(('1', '2', '3', '4', '5', '-', '*', '•')):
+            # Clean up the insight text
+            insight = stripped.lstrip('0123456789.-*• ')
+            if insight and len(insight) > 5:
+                self.sections['insights'].append(insight)
+        elif section == 'actions':
+            if stripped.startswith(('1', '2', '3', '-', '*', '•')) or '**' in line or 'Title' in line:
+                action_text = stripped.lstrip('0123456789.-*• ')
+                if action_text and len(action_text) > 5:
+                    priority = 'medium'
+                    if 'high' in line_lower:
+                        priority = 'high'
+                    elif 'low' in line_lower:
+                        priority = 'low'
+                    self.sections['actions'].append({
+                        "title": action_text[:100].replace('**', '').strip(),
+                        "priority": priority,
+                        "description": action_text
+                    })
+        elif section == 'risks' and stripped.startswith(('1', '2', '3', '-', '*', '•')):
+            risk = stripped.lstrip('0123456789.-*• ')
+            if risk and len(risk) > 5:
+                self.sections['risks'].append(risk)
+        return []
+
+    def _enter(self, section: str) -> list[str]:
+        """Switch to a section header, completing the previous section"""
+        if section == self._section:
+            return []
+        completed = self._leave()
+        self._section = section
+        return completed
+
+    def _leave(self) -> list[str]:
+        section = self._section
+        self._section = None
+        if section == 'summary' and self._summary_lines:
+            self.sections['summary'] = ' '.join(self._summary_lines).strip()
+        if section not in SECTION_FIELDS or section in self._completed:
+            return []
+        self._completed.append(section)
+        return [section]
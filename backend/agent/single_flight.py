@@ -0,0 +1,49 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight call and
+all receive its result (or its exception), so a burst of identical
+requests costs one LLM round trip
+"""
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """Run at most one call per key at a time, sharing it with every caller that asks meanwhile
+
+    The shared call is shielded from its callers: one of them giving up
+    (e.g. a client disconnecting) does not cancel it for the others, and it
+    still finishes when all of them gave up. A key is released as soon as
+    its call finishes, so later callers start a new call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights: dict[str, asyncio.Future] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._flights
+
+    async def run(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await call() for key, or join the call already running for it"""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finish(key, done))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: str, flight: asyncio.Future) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as seen, the callers may all have given up on it
+        if not flight.cancelled():
+            flight.exception()
+
+    def stats(self) -> dict:
+        """Get the calls started, callers that joined one, and calls now in flight"""
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
@@ -0,0 +1,76 @@
+"""
+Benchmark customer substring search: linear scan vs trigram index
+Usage: python -m benchmarks.customer_search [sizes, e.g. 10000,100000,1000000]
+"""
+import gc
+import random
+import sys
+import time
+
+from seed_data import FIRST_NAMES, LAST_NAMES, COMPANIES, generate_email
+from store import EntityStore
+
+QUERIES = ["sophia", "quantum", "nexus innov", "wright@", "son", "zz"]
+REPEAT = 5
+
+
+def generate_customers(count: int) -> list:
+    """Generate customer records shaped like fake_data.CUSTOMERS"""
+    customers = []
+    for i in range(1, count + 1):
+        first_name = random.choice(FIRST_NAMES)
+        last_name = random.choice(LAST_NAMES)
+        company = f"{random.choice(COMPANIES)} {i % 997}"
+        customers.append({
+            "id": i,
+            "name": f"{first_name} {last_name}",
+            "email": generate_email(first_name, last_name, company),
+            "company": company,
+            "status": "active",
+            "industry": "Technology",
+        })
+    return customers
+
+
+def scan_search(customers: list, search: str) -> list:
+    """The original full-scan search from get_customers_filtered"""
+    search_lower = search.lower()
+    return [c for c in customers if
+            search_lower in c["name"].lower() or
+            search_lower in c["email"].lower() or
+            search_lower in c["company"].lower()]
+
+
+def timed(fn, *args) -> tuple:
+    """Run fn REPEAT times with GC paused, returning the last result and the mean time in ms"""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            result = fn(*args)
+        return result, (time.perf_counter() - start) / REPEAT * 1000
+    finally:
+        gc.enable()
+
+
+def run(size: int) -> None:
+    random.seed(42)
+    customers = generate_customers(size)
+
+    start = time.perf_counter()
+    store = EntityStore("customers", customers, text_fields=("name", "email", "company"))
+    build_seconds = time.perf_counter() - start
+
+    print(f"\n📊 {size:,} customers (index build {build_seconds:.1f}s)")
+    print(f"   {'query':<14}{'matches':>10}{'scan ms':>12}{'index ms':>12}{'speedup':>10}")
+    for query in QUERIES:
+        expected, scan_ms = timed(scan_search, customers, query)
+        found, index_ms = timed(store.search, query)
+        assert {c["id"] for c in expected} == {c["id"] for c in found}
+        print(f"   {query!r:<14}{len(found):>10,}{scan_ms:>12.2f}{index_ms:>12.2f}{scan_ms / index_ms:>9.1f}x")
+
+
+if __name__ == "__main__":
+    sizes = sys.argv[1] if len(sys.argv) > 1 else "10000,100000,1000000"
+    for size in sizes.split(","):
+        run(int(size))
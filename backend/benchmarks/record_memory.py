@@ -0,0 +1,88 @@
+"""
+Benchmark memory per record: plain dicts vs slotted records
+Usage: python -m benchmarks.record_memory [count, default 100000]
+"""
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from store import CustomerRecord, LeadRecord, DealRecord, TaskRecord
+
+NOW = datetime.utcnow()
+
+
+def fresh(value: str) -> str:
+    """Build a new string object, as parsing JSON or reading a DB row would"""
+    return "".join(list(value))
+
+
+def random_date() -> datetime:
+    return NOW - timedelta(seconds=random.randint(0, 10_000_000))
+
+
+def customer_row(i: int) -> dict:
+    return {
+        "id": i, "name": f"Customer {i}", "email": f"customer{i}@example.com", "phone": f"+1-555-{i:07d}",
+        "company": f"Company {i % 500}", "status": fresh(random.choice(["active", "inactive", "churned"])),
+        "industry": fresh(random.choice(["Technology", "Healthcare", "Finance"])),
+        "lifetime_value": random.uniform(1000, 500000), "acquisition_source": fresh("referral"),
+        "notes": None, "created_at": random_date(), "updated_at": random_date(),
+    }
+
+
+def lead_row(i: int) -> dict:
+    return {
+        "id": i, "name": f"Lead {i}", "email": f"lead{i}@example.com", "phone": None, "company": f"Company {i % 500}",
+        "job_title": None, "status": fresh(random.choice(["new", "contacted", "qualified"])),
+        "source": fresh(random.choice(["website", "referral", "linkedin"])), "score": random.randint(0, 100),
+        "estimated_value": random.uniform(5000, 250000), "notes": None, "created_at": random_date(), "updated_at": random_date(),
+    }
+
+
+def deal_row(i: int) -> dict:
+    return {
+        "id": i, "title": f"Deal {i}", "value": random.uniform(10000, 400000),
+        "stage": fresh(random.choice(["prospecting", "proposal", "negotiation"])), "probability": random.randint(0, 100),
+        "customer_id": random.randint(1, 1000), "expected_close": random_date(), "notes": None,
+        "created_at": random_date(), "updated_at": random_date(),
+    }
+
+
+def task_row(i: int) -> dict:
+    return {
+        "id": i, "title": f"Task {i}", "description": None, "status": fresh(random.choice(["todo", "in_progress", "completed"])),
+        "priority": fresh(random.choice(["low", "medium", "high"])), "assignee": fresh(random.choice(["Sales Team", "Admin"])),
+        "due_date": random_date(), "customer_id": None, "deal_id": None, "completed_at": None,
+        "created_at": random_date(), "updated_at": random_date(),
+    }
+
+
+def measure(build) -> int:
+    """Get the bytes still allocated after building a table"""
+    tracemalloc.start()
+    table = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del table
+    return size
+
+
+def run(count: int) -> None:
+    print(f"\n📦 {count:,} records per table (bytes per record)")
+    print(f"   {'table':<12}{'dict':>10}{'record':>10}{'saved':>10}")
+    for name, make_row, record_type in [
+        ("customers", customer_row, CustomerRecord),
+        ("leads", lead_row, LeadRecord),
+        ("deals", deal_row, DealRecord),
+        ("tasks", task_row, TaskRecord),
+    ]:
+        random.seed(7)
+        as_dicts = measure(lambda: [make_row(i) for i in range(count)]) / count
+        random.seed(7)
+        as_records = measure(lambda: [record_type.from_dict(make_row(i)) for i in range(count)]) / count
+        print(f"   {name:<12}{as_dicts:>10.0f}{as_records:>10.0f}{1 - as_records / as_dicts:>9.0%}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
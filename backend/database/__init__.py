@@ -1,2 +1,5 @@
-from .database import Base, engine, get_db, SessionLocal
+from .database import (
+    Base, engine, get_db, SessionLocal, async_engine, get_async_db, AsyncSessionLocal,
+    get_async_write_db, AsyncWriteSessionLocal, write_engine, write_queue, run_write, dispose_async_engines
+)
 from .models import Customer, Lead, Deal, Task, Interaction, Revenue, MarketingCampaign
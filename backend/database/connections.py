@@ -0,0 +1,142 @@
+"""
+SQLite connection management
+WAL mode lets readers run alongside a writer, so reads use a pool of
+query-only connections while every write is queued for one dedicated writer
+connection. The writer commits whatever has queued up in one transaction
+(group commit), so concurrent writes never wait on "database is locked"
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+
+def configure_sqlite(
+    engine,
+    mmap_size: int = 256 * 1024 * 1024,
+    cache_size: int = -64_000,
+    busy_timeout: int = 5_000,
+    query_only: bool = False,
+    explicit_begin: bool = False
+) -> None:
+    """Set WAL mode and per-connection pragmas on every new connection of a (sync) engine
+
+    cache_size follows SQLite's convention: negative values are KiB, positive values pages.
+    synchronous=NORMAL is safe in WAL mode; a power cut can only lose the last commits.
+    explicit_begin turns off the driver's own transaction handling, which only
+    starts a transaction at the first INSERT/UPDATE/DELETE, and emits BEGIN
+    when SQLAlchemy begins one: a SAVEPOINT run first then nests in the
+    transaction instead of starting one that its RELEASE commits.
+    """
+    pragmas = [
+        "PRAGMA journal_mode = WAL",
+        "PRAGMA synchronous = NORMAL",
+        f"PRAGMA mmap_size = {int(mmap_size)}",
+        f"PRAGMA cache_size = {int(cache_size)}",
+        f"PRAGMA busy_timeout = {int(busy_timeout)}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if query_only:
+        pragmas.append("PRAGMA query_only = ON")
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        if explicit_begin:
+            dbapi_connection.isolation_level = None
+
+    if explicit_begin:
+        @event.listens_for(engine, "begin")
+        def emit_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+
+class WriteQueue:
+    """Single writer that applies queued writes in group commits
+
+    submit() queues a coroutine function taking the writer's connection and
+    waits until the transaction holding it commits. Each batch is one
+    transaction and each write runs in a savepoint of it: a write that
+    raises rolls back every statement it ran and only fails its own caller,
+    while a failed commit fails the batch.
+    """
+
+    def __init__(self, engine: AsyncEngine, max_batch: int = 256):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.commits = 0
+        self.writes = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def submit(self, work: Callable[[AsyncConnection], Awaitable[Any]]) -> Any:
+        """Run work(connection) in the next group commit and return its result"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(self._queue))
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((work, future))
+        return await future
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                while True:
+                    batch = [await queue.get()]
+                    while len(batch) < self.max_batch and not queue.empty():
+                        batch.append(queue.get_nowait())
+                    # None is the stop signal from close(), queued after every write it should wait for
+                    stopping = None in batch
+                    batch = [item for item in batch if item is not None]
+                    if batch:
+                        await self._commit(conn, batch)
+                    if stopping:
+                        return
+        except Exception as error:
+            # Lost the writer connection: fail the waiting writes, the next submit starts a new writer
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is not None and not item[1].done():
+                    item[1].set_exception(error)
+            raise
+
+    async def _commit(self, conn: AsyncConnection, batch: list) -> None:
+        results = []
+        try:
+            async with conn.begin():
+                for work, future in batch:
+                    if future.cancelled():
+                        continue
+                    try:
+                        async with conn.begin_nested():
+                            result = await work(conn)
+                        results.append((future, result, None))
+                    except Exception as error:
+                        results.append((future, None, error))
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.commits += 1
+        self.writes += len(results)
+        for future, result, error in results:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Stop the writer once the writes already queued are committed"""
+        if self._worker is None:
+            return
+        if not self._worker.done():
+            self._queue.put_nowait(None)
+            await self._worker
+        self._worker = None
@@ -1,20 +1,81 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
 
+from .connections import WriteQueue, configure_sqlite
+
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./crm.db")
+# The app only talks to the database when DATABASE_URL is set (see repository.BACKEND);
+# the memory backend still imports the models, so it skips building the async engines
+ASYNC_ENABLED = bool(os.getenv("DATABASE_URL"))
+
+# File-backed SQLite gets WAL, a query-only reader pool and a single queued writer
+_url = make_url(DATABASE_URL)
+SQLITE_FILE = _url.get_backend_name() == "sqlite" and _url.database not in (None, "", ":memory:")
+SQLITE_PRAGMAS = {
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),
+}
 
 engine = create_engine(
     DATABASE_URL, 
     connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
 )
+if SQLITE_FILE:
+    configure_sqlite(engine, **SQLITE_PRAGMAS)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same database, used by the request handlers
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+}
+
+
+def to_async_url(url: str) -> str:
+    """Swap a sync driver in a database URL for its asyncio counterpart"""
+    scheme, separator, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+if not ASYNC_ENABLED:
+    async_engine = write_engine = write_queue = None
+elif SQLITE_FILE:
+    # Readers never take the write lock in WAL mode, so they get a pool of their own.
+    # aiosqlite defaulted to NullPool for files before SQLAlchemy 2.0.38, so the pool is explicit
+    async_engine = create_async_engine(
+        to_async_url(DATABASE_URL),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=int(os.getenv("SQLITE_READ_POOL_SIZE", "8")),
+        max_overflow=0
+    )
+    configure_sqlite(async_engine.sync_engine, query_only=True, **SQLITE_PRAGMAS)
+    write_engine = create_async_engine(
+        to_async_url(DATABASE_URL), poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0
+    )
+    configure_sqlite(write_engine.sync_engine, explicit_begin=True, **SQLITE_PRAGMAS)
+    write_queue = WriteQueue(write_engine, max_batch=int(os.getenv("SQLITE_WRITE_BATCH", "256")))
+else:
+    async_engine = write_engine = create_async_engine(to_async_url(DATABASE_URL))
+    write_queue = None
+
+if ASYNC_ENABLED:
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    AsyncWriteSessionLocal = async_sessionmaker(write_engine, autoflush=False, expire_on_commit=False)
+else:
+    AsyncSessionLocal = AsyncWriteSessionLocal = None
+
 Base = declarative_base()
 
 def get_db():
@@ -23,3 +84,48 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Session for handlers that only read
+
+    With file-backed SQLite it comes from the query-only reader pool and
+    any write fails with "attempt to write a readonly database"; writers
+    use get_async_write_db or run_write.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_write_db():
+    """Session for handlers that write, committed by the caller
+
+    With file-backed SQLite it holds the single writer connection, so it
+    waits for queued run_write commits and they wait for it: keep it short,
+    and prefer run_write for batched writes.
+    """
+    async with AsyncWriteSessionLocal() as db:
+        yield db
+
+
+async def run_write(work):
+    """Run work(connection) in a committed write transaction and return its result
+
+    With SQLite the work joins the writer queue's next group commit,
+    otherwise it gets a transaction of its own.
+    """
+    if write_queue is not None:
+        return await write_queue.submit(work)
+    async with write_engine.begin() as conn:
+        return await work(conn)
+
+
+async def dispose_async_engines():
+    """Commit queued writes and close the async connection pools"""
+    if async_engine is None:
+        return
+    if write_queue is not None:
+        await write_queue.close()
+    await async_engine.dispose()
+    if write_engine is not async_engine:
+        await write_engine.dispose()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -64,6 +64,12 @@ class Customer(Base):
     deals = relationship("Deal", back_populates="customer")
     tasks = relationship("Task", back_populates="customer")
     interactions = relationship("Interaction", back_populates="customer")
+    
+    # List endpoints filter on these and page in ID order
+    __table_args__ = (
+        Index("ix_customers_status_industry", status, industry),
+        Index("ix_customers_industry", industry),
+    )
 
 
 class Lead(Base):
@@ -84,6 +90,13 @@ class Lead(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     converted_at = Column(DateTime, nullable=True)
     converted_to_customer_id = Column(Integer, ForeignKey("customers.id"), nullable=True)
+    
+    # Leads are listed by score, highest first, optionally filtered by status or source
+    __table_args__ = (
+        Index("ix_leads_score", score.desc()),
+        Index("ix_leads_status_score", status, score.desc()),
+        Index("ix_leads_source_score", source, score.desc()),
+    )
 
 
 class Deal(Base):
@@ -102,6 +115,13 @@ class Deal(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     customer = relationship("Customer", back_populates="deals")
+    
+    # Deals are listed by value, highest first, optionally filtered by stage or customer
+    __table_args__ = (
+        Index("ix_deals_value", value.desc()),
+        Index("ix_deals_stage_value", stage, value.desc()),
+        Index("ix_deals_customer_value", customer_id, value.desc()),
+    )
 
 
 class Task(Base):
@@ -120,6 +140,15 @@ class Task(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     customer = relationship("Customer", back_populates="tasks")
+    
+    # Tasks are listed by due date, optionally filtered by status, priority, assignee or customer
+    __table_args__ = (
+        Index("ix_tasks_due_date", due_date),
+        Index("ix_tasks_status_due_date", status, due_date),
+        Index("ix_tasks_priority_due_date", priority, due_date),
+        Index("ix_tasks_assignee_due_date", assignee, due_date),
+        Index("ix_tasks_customer_due_date", customer_id, due_date),
+    )
 
 
 class Interaction(Base):
@@ -135,6 +164,11 @@ class Interaction(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     customer = relationship("Customer", back_populates="interactions")
+    
+    # Customer timelines read the latest interactions of each customer
+    __table_args__ = (
+        Index("ix_interactions_customer_created", customer_id, created_at.desc()),
+    )
 
 
 class Revenue(Base):
@@ -147,6 +181,11 @@ class Revenue(Base):
     description = Column(String(255))
     date = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Revenue is totalled per customer
+    __table_args__ = (
+        Index("ix_revenue_customer_date", customer_id, date),
+    )
 
 
 class MarketingCampaign(Base):
@@ -0,0 +1,692 @@
+"""
+SQL repository for the CRM tables
+Async counterparts of the fake_data helpers, with filters, ordering and
+pagination pushed down into SQL so list endpoints only read one page
+"""
+import asyncio
+import os
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
+from typing import Any, Hashable, Iterable, Mapping, Optional
+
+from sqlalchemy import DateTime, Float, Integer, Numeric, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from store import decode_cursor, next_page
+from .database import AsyncSessionLocal, run_write
+from .models import Customer, Lead, Deal, Task, Interaction, Revenue
+from .summary import AnalyticsSummary, CLOSED_TASK_STATUSES
+
+DEAL_STAGES = ["prospecting", "qualification", "proposal", "negotiation", "closed_won", "closed_lost"]
+CLOSED_STAGES = ["closed_won", "closed_lost"]
+RECENT_INTERACTIONS = 10
+# IDs per IN (...) list in bulk writes, well under SQLite's bound parameter limit
+IN_CHUNK = 500
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class SQLTable:
+    """Table wrapper with the EntityStore read/write interface used by the routers"""
+
+    def __init__(self, model):
+        self.model = model
+        self.table = model.__table__
+        self.name = self.table.name
+        self._datetime_fields = {
+            column.name for column in self.table.columns if isinstance(column.type, DateTime)
+        }
+        self._numeric_fields = {
+            column.name for column in self.table.columns if isinstance(column.type, (Integer, Float, Numeric))
+        }
+        self._indexes = []
+        self._gate = None
+
+    def attach(self, index):
+        """Keep an index (add/remove protocol, see store.indexes) in step with writes through this table"""
+        self._indexes.append(index)
+        return index
+
+    def attach_gate(self, gate) -> None:
+        """Run every later write, with the index updates after it, inside gate.writing()"""
+        self._gate = gate
+
+    def _writing(self):
+        return self._gate.writing() if self._gate is not None else nullcontext()
+
+    def _coerce(self, data: Mapping) -> dict:
+        """Check field names and numbers, parse ISO strings in datetime fields and convert aware datetimes to naive UTC
+
+        SQLite would store a string in a numeric column as-is, so numbers
+        are checked here rather than left to the database.
+        """
+        row = {}
+        for field, value in data.items():
+            if field == "id":
+                continue
+            if field not in self.table.columns:
+                raise ValueError(f"Unknown field for {self.name}: {field}")
+            if field in self._datetime_fields and isinstance(value, str):
+                try:
+                    value = datetime.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f"Invalid datetime for {field}: {value}")
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            if field in self._numeric_fields and value is not None and (
+                isinstance(value, bool) or not isinstance(value, (int, float))
+            ):
+                raise ValueError(f"Invalid number for {field}: {value!r}")
+            row[field] = value
+        return row
+
+    async def _write(self, work):
+        """run_write, reporting constraint violations (a missing required field, a duplicate unique value) as ValueError"""
+        try:
+            return await run_write(work)
+        except IntegrityError as error:
+            raise ValueError(str(error.orig)) from error
+
+    async def _fetch(self, conditions: Iterable, order_by: Iterable, skip: int, limit: int) -> list[dict]:
+        statement = select(self.table).where(*conditions).order_by(*order_by).offset(skip).limit(limit)
+        async with AsyncSessionLocal() as db:
+            return [dict(row) for row in (await db.execute(statement)).mappings()]
+
+    async def _count(self, conditions: Iterable) -> int:
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(func.count()).select_from(self.table).where(*conditions))).scalar_one()
+
+    async def get(self, item_id: int) -> Optional[dict]:
+        """Get a record by ID"""
+        rows = await self._fetch((self.table.c.id == item_id,), (), 0, 1)
+        return rows[0] if rows else None
+
+    async def insert(self, data: Mapping) -> dict:
+        """Insert a new record and let the database assign its ID"""
+        statement = insert(self.table).values(**self._coerce(data)).returning(*self.table.columns)
+
+        async def write(conn):
+            return dict((await conn.execute(statement)).mappings().one())
+
+        async with self._writing():
+            row = await self._write(write)
+            for index in self._indexes:
+                index.add(row["id"], row)
+        return row
+
+    async def update(self, item_id: int, changes: Mapping) -> Optional[dict]:
+        """Apply changes to an existing record, returns None if it does not exist"""
+        row = self._coerce(changes)
+        if not row:
+            return await self.get(item_id)
+        statement = (
+            update(self.table).where(self.table.c.id == item_id).values(**row).returning(*self.table.columns)
+        )
+
+        async def write(conn):
+            existing = None
+            if self._indexes:
+                current = select(self.table).where(self.table.c.id == item_id).with_for_update()
+                existing = (await conn.execute(current)).mappings().first()
+            updated = (await conn.execute(statement)).mappings().first()
+            return existing, updated
+
+        async with self._writing():
+            existing, updated = await self._write(write)
+            if updated is None:
+                return None
+            updated = dict(updated)
+            for index in self._indexes:
+                if existing is not None:
+                    index.remove(item_id, existing)
+                index.add(item_id, updated)
+        return updated
+
+    async def delete(self, item_id: int) -> bool:
+        """Delete a record by ID, returns False if it does not exist"""
+        statement = delete(self.table).where(self.table.c.id == item_id).returning(*self.table.columns)
+
+        async def write(conn):
+            return (await conn.execute(statement)).mappings().first()
+
+        async with self._writing():
+            existing = await run_write(write)
+            if existing is None:
+                return False
+            for index in self._indexes:
+                index.remove(item_id, existing)
+        return True
+
+    async def bulk(
+        self,
+        creates: Iterable[Mapping] = (),
+        updates: Iterable[tuple[int, Mapping]] = (),
+        deletes: Iterable[int] = ()
+    ) -> dict[str, list]:
+        """Apply many inserts, updates and deletes in one write transaction, with a result per item
+
+        Results follow EntityStore.bulk. Inserts with the same fields share a
+        multi-row statement, updates making the same changes share one UPDATE
+        ... WHERE id IN, and deletes share one DELETE ... WHERE id IN. When a
+        shared statement fails its items are retried one by one, so only the
+        items at fault fail.
+        """
+        c = self.table.c
+        creates, updates, deletes = list(creates), list(updates), list(deletes)
+        results = {"create": [None] * len(creates), "update": [None] * len(updates), "delete": [False] * len(deletes)}
+        inserts, changes = {}, {}
+        for position, data in enumerate(creates):
+            try:
+                row = self._coerce(data)
+            except ValueError as error:
+                results["create"][position] = error
+                continue
+            inserts.setdefault(tuple(row), []).append((position, row))
+        for position, (item_id, data) in enumerate(updates):
+            try:
+                row = self._coerce(data)
+            except ValueError as error:
+                results["update"][position] = error
+                continue
+            changes.setdefault(_changes_key(row, position), []).append((position, item_id, row))
+
+        async def write(conn):
+            # Index changes to apply, in order, once the transaction commits
+            events = []
+            current = await self._rows_by_id(conn, [item_id for item_id, _ in updates])
+
+            statement = insert(self.table).returning(*self.table.columns, sort_by_parameter_order=True)
+            for items in inserts.values():
+                run = lambda batch: _attempt(conn, statement, [row for _, row in batch])
+                for batch, rows in await _batched(run, items):
+                    for (position, _), row in zip(batch, _spread(rows, len(batch))):
+                        results["create"][position] = row
+                        if not isinstance(row, Exception):
+                            events.append(("add", row["id"], row))
+
+            for items in changes.values():
+                values = items[0][2]
+                if not values:
+                    for position, item_id, _ in items:
+                        results["update"][position] = current.get(item_id)
+                    continue
+                run = lambda batch, values=values: _attempt(conn, (
+                    update(self.table).where(c.id.in_([item_id for _, item_id, _ in batch]))
+                    .values(**values).returning(*self.table.columns)
+                ))
+                for batch, rows in await _batched(run, items):
+                    by_id = rows if isinstance(rows, Exception) else {row["id"]: row for row in rows}
+                    for position, item_id, _ in batch:
+                        row = by_id if isinstance(by_id, Exception) else by_id.get(item_id)
+                        results["update"][position] = row
+                        if isinstance(row, dict):
+                            events += [("remove", item_id, current[item_id]), ("add", item_id, row)]
+                            current[item_id] = row
+
+            deleted = {}
+            run = lambda batch: _attempt(conn, delete(self.table).where(c.id.in_(batch)).returning(*self.table.columns))
+            for batch, rows in await _batched(run, list(dict.fromkeys(deletes))):
+                if isinstance(rows, Exception):
+                    deleted.update(dict.fromkeys(batch, rows))
+                    continue
+                for row in rows:
+                    deleted[row["id"]] = True
+                    events.append(("remove", row["id"], row))
+            # A repeated ID is only deleted once, like deleting it twice in a row
+            results["delete"] = [deleted.pop(item_id, False) for item_id in deletes]
+            return events
+
+        async with self._writing():
+            for action, item_id, row in await run_write(write):
+                for index in self._indexes:
+                    getattr(index, action)(item_id, row)
+        return results
+
+    async def _rows_by_id(self, conn, ids: list[int]) -> dict[int, dict]:
+        rows = {}
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), IN_CHUNK):
+            statement = select(self.table).where(self.table.c.id.in_(ids[start:start + IN_CHUNK]))
+            rows.update((row["id"], dict(row)) for row in (await conn.execute(statement)).mappings())
+        return rows
+
+    async def page(
+        self,
+        *conditions,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[tuple[Any, int]] = None
+    ) -> list[dict]:
+        """Get a page of records in ID order or ordered by a field, ties broken by ID
+
+        Records missing the sort field come last, as in the in-memory store.
+        They are read with a second query so the first can walk an index on
+        the sort field. after is the (sort value, id) of the last record of
+        the previous page (see store.cursors): the page starts with a range
+        condition on the index instead of an OFFSET scan.
+        """
+        if limit <= 0:
+            return []
+        c = self.table.c
+        if order_by is None:
+            if after is not None:
+                conditions = (*conditions, c.id > after[1])
+            return await self._fetch(conditions, (c.id,), skip, limit)
+
+        column = c[order_by]
+        ordering = (column.desc() if descending else column.asc(), c.id)
+        rows = []
+        if after is None or after[0] is not None:
+            keyset = ()
+            if after is not None:
+                value, item_id = after
+                # The first condition bounds the index range, the second drops the ties already served
+                if descending:
+                    keyset = (column <= value, or_(column < value, c.id > item_id))
+                else:
+                    keyset = (column >= value, or_(column > value, c.id > item_id))
+            rows = await self._fetch((*conditions, *keyset, column.isnot(None)), ordering, skip, limit)
+        if len(rows) < limit:
+            null_conditions = (*conditions, column.is_(None))
+            if after is not None and after[0] is None:
+                null_conditions += (c.id > after[1],)
+                null_skip = skip
+            elif rows:
+                null_skip = 0
+            else:
+                null_skip = max(0, skip - await self._count((*conditions, column.isnot(None))))
+            rows += await self._fetch(null_conditions, (c.id,), null_skip, limit - len(rows))
+        return rows
+
+
+def _changes_key(row: dict, position: int) -> Hashable:
+    """Group key for updates making the same changes; unhashable changes get a group of their own"""
+    key = tuple(sorted(row.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return position
+    return key
+
+
+async def _attempt(conn, statement, parameters=None) -> list[dict]:
+    """Execute a statement so that its failure leaves the rest of the transaction intact
+
+    SQLite already rolls back just the failing statement; other databases need a savepoint.
+    """
+    if conn.dialect.name == "sqlite":
+        return [dict(row) for row in (await conn.execute(statement, parameters)).mappings()]
+    async with conn.begin_nested():
+        return [dict(row) for row in (await conn.execute(statement, parameters)).mappings()]
+
+
+async def _batched(run, items: list, size: int = IN_CHUNK) -> list[tuple[list, Any]]:
+    """Call run(batch) on batches of items, retrying a failed batch one item at a time
+
+    Returns (batch, result or exception) pairs.
+    """
+    outcomes = []
+    for start in range(0, len(items), size):
+        batch = items[start:start + size]
+        try:
+            outcomes.append((batch, await run(batch)))
+            continue
+        except SQLAlchemyError as error:
+            if len(batch) == 1:
+                outcomes.append((batch, error))
+                continue
+        for item in batch:
+            try:
+                outcomes.append(([item], await run([item])))
+            except SQLAlchemyError as error:
+                outcomes.append(([item], error))
+    return outcomes
+
+
+def _spread(rows, count: int) -> list:
+    """Pair a failed batch's exception with each of its items"""
+    return [rows] * count if isinstance(rows, Exception) else rows
+
+
+CUSTOMERS = SQLTable(Customer)
+LEADS = SQLTable(Lead)
+DEALS = SQLTable(Deal)
+TASKS = SQLTable(Task)
+REVENUE = SQLTable(Revenue)
+
+# Materialized totals behind the summaries and the analytics overview
+SUMMARY = AnalyticsSummary(float(os.getenv("ANALYTICS_REFRESH_SECONDS", "30")))
+CUSTOMERS.attach(SUMMARY.observe(SUMMARY.customers))
+LEADS.attach(SUMMARY.observe(SUMMARY.leads))
+DEALS.attach(SUMMARY.observe(SUMMARY.deals))
+TASKS.attach(SUMMARY.observe(SUMMARY.tasks))
+REVENUE.attach(SUMMARY.observe(SUMMARY.revenue))
+CUSTOMERS.attach_gate(SUMMARY)
+LEADS.attach_gate(SUMMARY)
+DEALS.attach_gate(SUMMARY)
+TASKS.attach_gate(SUMMARY)
+REVENUE.attach_gate(SUMMARY)
+
+
+def _equals(table: SQLTable, **filters) -> list:
+    """Build equality conditions, ignoring filters that are not set"""
+    return [table.table.c[field] == value for field, value in filters.items() if value]
+
+
+async def _rows(statement) -> list:
+    async with AsyncSessionLocal() as db:
+        return (await db.execute(statement)).all()
+
+
+async def get_customers_filtered(status=None, industry=None, search=None, skip=0, limit=100, cursor=None):
+    """Get filtered customers, searching name, email and company"""
+    after = decode_cursor(cursor, "id") if cursor else None
+    conditions = _equals(CUSTOMERS, status=status, industry=industry)
+    if search:
+        c = CUSTOMERS.table.c
+        conditions.append(or_(
+            c.name.icontains(search, autoescape=True),
+            c.email.icontains(search, autoescape=True),
+            c.company.icontains(search, autoescape=True)
+        ))
+    return next_page(await CUSTOMERS.page(*conditions, skip=skip, limit=limit, after=after), limit)
+
+
+async def get_leads_filtered(status=None, source=None, min_score=None, skip=0, limit=100, cursor=None):
+    """Get filtered leads, sorted by score descending"""
+    after = decode_cursor(cursor, "score") if cursor else None
+    conditions = _equals(LEADS, status=status, source=source)
+    if min_score:
+        conditions.append(LEADS.table.c.score >= min_score)
+    rows = await LEADS.page(*conditions, order_by="score", descending=True, skip=skip, limit=limit, after=after)
+    return next_page(rows, limit, "score")
+
+
+async def get_deals_filtered(stage=None, customer_id=None, min_value=None, skip=0, limit=100, cursor=None):
+    """Get filtered deals, sorted by value descending"""
+    after = decode_cursor(cursor, "value") if cursor else None
+    conditions = _equals(DEALS, stage=stage, customer_id=customer_id)
+    if min_value:
+        conditions.append(DEALS.table.c.value >= min_value)
+    rows = await DEALS.page(*conditions, order_by="value", descending=True, skip=skip, limit=limit, after=after)
+    return next_page(rows, limit, "value")
+
+
+def _overdue(as_of: datetime) -> list:
+    c = TASKS.table.c
+    return [or_(c.status.is_(None), c.status.notin_(CLOSED_TASK_STATUSES)), c.due_date < as_of]
+
+
+async def get_tasks_filtered(status=None, priority=None, assignee=None, overdue_only=False, skip=0, limit=100, cursor=None):
+    """Get filtered tasks, sorted by due date"""
+    after = decode_cursor(cursor, "due_date") if cursor else None
+    conditions = _equals(TASKS, status=status, priority=priority, assignee=assignee)
+    if overdue_only:
+        conditions += _overdue(datetime.utcnow())
+    return next_page(await TASKS.page(*conditions, order_by="due_date", skip=skip, limit=limit, after=after), limit, "due_date")
+
+
+async def count_overdue_tasks(as_of=None):
+    """Count open tasks whose due date has passed"""
+    return await TASKS._count(_overdue(as_of or datetime.utcnow()))
+
+
+def _sum_by(groups: dict, position: int) -> dict:
+    """Re-group (count, *sums) totals keyed by tuples on one key position"""
+    totals = {}
+    for key, values in groups.items():
+        running = totals.get(key[position])
+        totals[key[position]] = values if running is None else tuple(a + b for a, b in zip(running, values))
+    return totals
+
+
+async def get_lead_source_counts():
+    """Get lead counts by source, largest first"""
+    summary = await SUMMARY.current()
+    by_source = _sum_by(summary.leads.groups(), 0)
+    return [
+        {"source": source, "count": count}
+        for source, (count, _) in sorted(by_source.items(), key=lambda item: item[1][0], reverse=True)
+        if source is not None
+    ]
+
+
+async def get_customer_industry_totals():
+    """Get customer counts and lifetime value by industry, highest value first"""
+    summary = await SUMMARY.current()
+    by_industry = _sum_by(summary.customers.groups(), 1)
+    return [
+        {"industry": industry, "count": count, "value": round(value, 2)}
+        for industry, (count, value) in sorted(by_industry.items(), key=lambda item: item[1][1], reverse=True)
+        if industry is not None
+    ]
+
+
+async def get_pipeline_summary():
+    """Get deal count, total value and average probability per stage"""
+    summary = await SUMMARY.current()
+    stages = summary.deals.groups()
+
+    ordered = DEAL_STAGES + [stage for stage in stages if stage not in DEAL_STAGES and stage is not None]
+    result = []
+    for stage in ordered:
+        count, total_value, total_probability = stages.get(stage, (0, 0.0, 0.0))
+        result.append({
+            "stage": stage,
+            "count": count,
+            "total_value": round(total_value, 2),
+            "avg_probability": round(total_probability / count, 1) if count else 0.0
+        })
+    return result
+
+
+async def get_task_summary():
+    """Get task counts by status and priority"""
+    summary = await SUMMARY.current()
+    groups = summary.tasks.groups()
+    by_status = {status: count for status, (count,) in _sum_by(groups, 0).items() if status is not None}
+    by_priority = {priority: count for priority, (count,) in _sum_by(groups, 1).items() if priority is not None}
+
+    return {
+        "total": sum(count for (count,) in groups.values()),
+        "by_status": by_status,
+        "by_priority": by_priority,
+        "overdue": await count_overdue_tasks()
+    }
+
+
+def _chart_point(point: dict, granularity: str) -> dict:
+    period = point["period"]
+    labels = {"month": MONTH_NAMES[period.month - 1], "year": period.year} if granularity == "month" else {}
+    return {
+        **labels,
+        "period": period.isoformat(),
+        "revenue": round(point["total"], 2),
+        "payments": point["count"],
+        "by_type": {revenue_type: round(amount, 2) for revenue_type, amount in point["by_category"].items()}
+    }
+
+
+async def get_revenue_chart(start=None, end=None, granularity="month"):
+    """Get revenue per day, week or month from start to end (default the last 12 months), by revenue type
+
+    Served from the daily and monthly rollup in the analytics summary, never from the raw rows.
+    """
+    summary = await SUMMARY.current()
+    return [_chart_point(point, granularity) for point in summary.revenue.series(start, end, granularity)]
+
+
+async def _mappings(statement) -> list[dict]:
+    async with AsyncSessionLocal() as db:
+        return [dict(row) for row in (await db.execute(statement)).mappings()]
+
+
+def _by_customer(rows: list[dict]) -> dict[int, list[dict]]:
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row["customer_id"], []).append(row)
+    return grouped
+
+
+async def get_customers_360(customer_ids):
+    """Get customers with their deals, open tasks, recent interactions and revenue, in the order asked
+
+    Each relationship is one IN query over all the customers, and the five
+    queries run concurrently. Unknown IDs are left out.
+    """
+    ids = list(dict.fromkeys(customer_ids))
+    if not ids:
+        return []
+    customer, deal, task = Customer.__table__.c, Deal.__table__.c, Task.__table__.c
+    interaction, revenue = Interaction.__table__.c, Revenue.__table__.c
+    month_ago = datetime.utcnow() - timedelta(days=30)
+
+    newest = func.row_number().over(
+        partition_by=interaction.customer_id, order_by=(interaction.created_at.desc(), interaction.id.desc())
+    ).label("position")
+    recent = select(Interaction.__table__, newest).where(interaction.customer_id.in_(ids)).subquery()
+    customers, deals, tasks, interactions, revenues = await asyncio.gather(
+        _mappings(select(Customer.__table__).where(customer.id.in_(ids))),
+        _mappings(select(Deal.__table__).where(deal.customer_id.in_(ids)).order_by(deal.value.desc(), deal.id)),
+        _mappings(
+            select(Task.__table__)
+            .where(task.customer_id.in_(ids), or_(task.status.is_(None), task.status.notin_(CLOSED_TASK_STATUSES)))
+            .order_by(task.due_date.is_(None), task.due_date, task.id)
+        ),
+        _mappings(
+            select(*[column for column in recent.c if column.name != "position"])
+            .where(recent.c.position <= RECENT_INTERACTIONS)
+            .order_by(recent.c.created_at.desc(), recent.c.id.desc())
+        ),
+        _mappings(
+            select(
+                revenue.customer_id,
+                func.coalesce(func.sum(revenue.amount), 0).label("total"),
+                func.count().label("payments"),
+                func.coalesce(func.sum(case((revenue.date >= month_ago, revenue.amount))), 0).label("last_30_days"),
+                func.max(revenue.date).label("last_payment_at")
+            ).where(revenue.customer_id.in_(ids)).group_by(revenue.customer_id)
+        )
+    )
+
+    customers = {row["id"]: row for row in customers}
+    deals, tasks, interactions = _by_customer(deals), _by_customer(tasks), _by_customer(interactions)
+    revenues = {
+        row["customer_id"]: {
+            "total": round(float(row["total"]), 2),
+            "payments": row["payments"],
+            "last_30_days": round(float(row["last_30_days"]), 2),
+            "last_payment_at": row["last_payment_at"]
+        }
+        for row in revenues
+    }
+    no_revenue = {"total": 0.0, "payments": 0, "last_30_days": 0.0, "last_payment_at": None}
+    return [
+        {
+            "customer": customers[customer_id],
+            "deals": deals.get(customer_id, []),
+            "open_tasks": tasks.get(customer_id, []),
+            "recent_interactions": interactions.get(customer_id, []),
+            "revenue": revenues.get(customer_id, no_revenue)
+        }
+        for customer_id in ids
+        if customer_id in customers
+    ]
+
+
+_overview_cache = (None, None)
+
+
+async def get_analytics_overview():
+    """Get the analytics overview, rebuilt from the materialized summary only after it changes"""
+    global _overview_cache
+    summary = await SUMMARY.current()
+    version, overview = _overview_cache
+    if version != summary.version:
+        overview = _build_overview(summary)
+        _overview_cache = (summary.version, overview)
+    return dict(overview)
+
+
+def _build_overview(summary: AnalyticsSummary) -> dict:
+    windows = summary.windows
+    customer_groups = summary.customers.groups()
+    lead_groups = summary.leads.groups()
+    customer_status = _sum_by(customer_groups, 0)
+    lead_status = _sum_by(lead_groups, 1)
+    deal_stage = summary.deals.groups()
+    task_status = _sum_by(summary.tasks.groups(), 0)
+
+    leads_by_source, won_by_source = {}, {}
+    for (source, status), (count, _) in lead_groups.items():
+        if source is None:
+            continue
+        leads_by_source[source] = leads_by_source.get(source, 0) + count
+        if status == "won":
+            won_by_source[source] = won_by_source.get(source, 0) + count
+
+    total_customers = sum(count for count, _ in customer_status.values())
+    churned_customers = customer_status.get("churned", (0, 0.0))[0]
+    total_ltv = sum(value for _, value in customer_status.values())
+    total_leads = sum(count for count, _ in lead_status.values())
+    won_leads = lead_status.get("won", (0, 0))[0]
+
+    open_stages = [stage for stage in deal_stage if stage not in CLOSED_STAGES]
+    active_deals = sum(deal_stage[stage][0] for stage in open_stages)
+    pipeline_value = sum(deal_stage[stage][1] for stage in open_stages)
+    won_deals, won_value, _ = deal_stage.get("closed_won", (0, 0.0, 0))
+    lost_deals = deal_stage.get("closed_lost", (0, 0.0, 0))[0]
+
+    # Campaign conversions are valued at the average won deal
+    marketing_spend = windows["marketing_spend"]
+    attributed_revenue = windows["campaign_conversions"] * (won_value / won_deals if won_deals else 0.0)
+    revenue_prev_30d = windows["revenue_prev_30d"]
+    interactions_30d = windows["interactions_30d"]
+
+    def top(totals):
+        candidates = {key: value for key, value in totals.items() if key is not None}
+        return max(candidates, key=candidates.get) if candidates else "N/A"
+
+    return {
+        "total_customers": total_customers,
+        "active_customers": customer_status.get("active", (0, 0.0))[0],
+        "churned_customers": churned_customers,
+        "retention_rate": round((total_customers - churned_customers) / total_customers * 100, 1) if total_customers else 0.0,
+        "total_leads": total_leads,
+        "new_leads_30d": windows["new_leads_30d"],
+        "qualified_leads": lead_status.get("qualified", (0, 0))[0],
+        "lead_conversion_rate": round(won_leads / total_leads * 100, 1) if total_leads else 0.0,
+        "avg_lead_score": round(sum(score for _, score in lead_status.values()) / total_leads, 1) if total_leads else 0.0,
+        "best_lead_source": top(won_by_source or leads_by_source),
+        "active_deals": active_deals,
+        "pipeline_value": round(pipeline_value, 2),
+        "avg_deal_size": round(pipeline_value / active_deals, 2) if active_deals else 0.0,
+        "win_rate": round(won_deals / (won_deals + lost_deals) * 100, 1) if won_deals + lost_deals else 0.0,
+        "deals_prospecting": deal_stage.get("prospecting", (0,))[0],
+        "deals_qualification": deal_stage.get("qualification", (0,))[0],
+        "deals_proposal": deal_stage.get("proposal", (0,))[0],
+        "deals_negotiation": deal_stage.get("negotiation", (0,))[0],
+        "total_revenue": round(windows["total_revenue"], 2),
+        "mrr": round(windows["mrr"], 2),
+        "revenue_growth": round((windows["revenue_30d"] - revenue_prev_30d) / revenue_prev_30d * 100, 1) if revenue_prev_30d else 0.0,
+        "avg_ltv": round(total_ltv / total_customers, 2) if total_customers else 0.0,
+        "top_industry": top({industry: value for industry, (_, value) in _sum_by(customer_groups, 1).items()}),
+        "top_acquisition_channel": top({source: count for source, (count, _) in _sum_by(customer_groups, 2).items()}),
+        "open_tasks": sum(count for status, (count,) in task_status.items() if status not in CLOSED_TASK_STATUSES),
+        "overdue_tasks": windows["overdue_tasks"],
+        "completed_tasks_7d": windows["completed_tasks_7d"],
+        "active_campaigns": windows["active_campaigns"],
+        "marketing_spend": round(marketing_spend, 2),
+        "marketing_leads": windows["marketing_leads"],
+        "marketing_roi": round((attributed_revenue - marketing_spend) / marketing_spend * 100, 1) if marketing_spend else 0.0,
+        "interactions_30d": interactions_30d,
+        "positive_interactions": round(windows["positive_interactions_30d"] / interactions_30d * 100, 1) if interactions_30d else 0.0,
+        # Response times are not recorded in the database
+        "avg_response_time": 0
+    }
+
+
+async def get_item_by_id(table, item_id):
+    """Get an item by ID from a table"""
+    return await table.get(item_id)
@@ -0,0 +1,208 @@
+"""
+Materialized analytics summary for the SQL backend
+Grouped totals and the daily revenue rollup are loaded with one aggregate
+query each and then kept current by the writes that go through the
+repository; time-windowed metrics are recomputed in the background with a
+single query
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timedelta
+from typing import Hashable, Optional
+
+from sqlalchemy import case, func, select, true
+
+from store import GroupedTotals, TimeSeriesRollup
+from .database import AsyncSessionLocal
+from .models import Customer, Lead, Deal, Task, Interaction, Revenue, MarketingCampaign
+
+CLOSED_TASK_STATUSES = ["completed", "cancelled"]
+
+
+def grouped_statement(model, totals: GroupedTotals):
+    """Build the GROUP BY query that computes a GroupedTotals from scratch"""
+    c = model.__table__.c
+    key_fields = (totals.key_fields,) if isinstance(totals.key_fields, str) else totals.key_fields
+    keys = [c[field] for field in key_fields]
+    sums = [func.coalesce(func.sum(c[field]), 0) for field in totals.sum_fields]
+    return select(*keys, func.count(), *sums).group_by(*keys)
+
+
+def rollup_statement(model, rollup: TimeSeriesRollup):
+    """Build the query that computes a TimeSeriesRollup from scratch, one row per day and category"""
+    c = model.__table__.c
+    day, category = func.date(c[rollup.date_field]), c[rollup.category_field]
+    return (
+        select(day, category, func.coalesce(func.sum(c[rollup.value_field]), 0), func.count())
+        .where(c[rollup.date_field].isnot(None)).group_by(day, category)
+    )
+
+
+def window_statement(now: datetime):
+    """Build one query for the time-windowed metrics and the tables the API never writes
+
+    Each table is aggregated once in a single-row subquery and the subqueries
+    are cross joined, so the whole summary costs one round trip.
+    """
+    month_ago = now - timedelta(days=30)
+    lead, task = Lead.__table__.c, Task.__table__.c
+    revenue, campaign, interaction = Revenue.__table__.c, MarketingCampaign.__table__.c, Interaction.__table__.c
+    recent = revenue.date >= month_ago
+    previous = (revenue.date >= month_ago - timedelta(days=30)) & (revenue.date < month_ago)
+    open_task = task.status.is_(None) | task.status.notin_(CLOSED_TASK_STATUSES)
+
+    def total(expression):
+        return func.coalesce(func.sum(expression), 0)
+
+    leads = select(func.count().label("new_leads_30d")).where(lead.created_at >= month_ago).subquery()
+    tasks = select(
+        func.count(case((open_task & (task.due_date < now), 1))).label("overdue_tasks"),
+        func.count(case((task.completed_at >= now - timedelta(days=7), 1))).label("completed_tasks_7d")
+    ).subquery()
+    revenues = select(
+        total(revenue.amount).label("total_revenue"),
+        total(case((recent & (revenue.type == "subscription"), revenue.amount))).label("mrr"),
+        total(case((recent, revenue.amount))).label("revenue_30d"),
+        total(case((previous, revenue.amount))).label("revenue_prev_30d")
+    ).subquery()
+    campaigns = select(
+        func.count(case((campaign.status == "active", 1))).label("active_campaigns"),
+        total(campaign.spent).label("marketing_spend"),
+        total(campaign.leads_generated).label("marketing_leads"),
+        total(campaign.conversions).label("campaign_conversions")
+    ).subquery()
+    interactions = select(
+        func.count().label("interactions_30d"),
+        func.count(case((interaction.outcome == "positive", 1))).label("positive_interactions_30d")
+    ).where(interaction.created_at >= month_ago).subquery()
+    return select(leads, tasks, revenues, campaigns, interactions).select_from(
+        leads.join(tasks, true()).join(revenues, true()).join(campaigns, true()).join(interactions, true())
+    )
+
+
+class AnalyticsSummary:
+    """Grouped totals and windowed metrics behind the analytics overview
+
+    Attach the totals to the repository tables so every insert, update and
+    delete adjusts them in O(1), and attach the summary as their write gate
+    (see writing()). A full reload every refresh_seconds picks up rows
+    written outside the API; readers never wait for it after the first load.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self.customers = GroupedTotals(("status", "industry", "acquisition_source"), ("lifetime_value",))
+        self.leads = GroupedTotals(("source", "status"), ("score",))
+        self.deals = GroupedTotals("stage", ("value", "probability"))
+        self.tasks = GroupedTotals(("status", "priority"))
+        self.revenue = TimeSeriesRollup("date", "amount", "type")
+        self.windows: dict[str, float] = {}
+        self._grouped = [
+            (Customer, self.customers), (Lead, self.leads), (Deal, self.deals), (Task, self.tasks)
+        ]
+        self._writes = 0
+        self._loaded_at: Optional[float] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        # Writes between entering writing() and applying their deltas
+        self._active_writes = 0
+        # Set while a refresh reads the tables; resolved when it is done
+        self._gate: Optional[asyncio.Future] = None
+        # Resolved when the last active write leaves, for a refresh waiting on them
+        self._drained: Optional[asyncio.Future] = None
+
+    @property
+    def version(self) -> tuple:
+        """Changes whenever the totals or windows may have changed"""
+        return (self._writes, self._loaded_at)
+
+    def observe(self, totals) -> "_Observer":
+        """Get an index-protocol observer that forwards writes to totals (a GroupedTotals or TimeSeriesRollup)"""
+        return _Observer(self, totals)
+
+    @asynccontextmanager
+    async def writing(self):
+        """Hold for a write and the deltas it applies once committed
+
+        Any number of writes hold it at once; they wait while a refresh
+        reads the tables.
+        """
+        while self._gate is not None:
+            await asyncio.shield(self._gate)
+        self._active_writes += 1
+        try:
+            yield
+        finally:
+            self._active_writes -= 1
+            if not self._active_writes and self._drained is not None and not self._drained.done():
+                self._drained.set_result(None)
+
+    async def refresh(self) -> None:
+        """Recompute everything from the tables
+
+        New writes wait while the tables are read and the ones in progress
+        finish first, so every write is either in the query results or
+        applied as a delta after the reload, never both.
+        """
+        loop = asyncio.get_running_loop()
+        self._gate = loop.create_future()
+        try:
+            while self._active_writes:
+                self._drained = loop.create_future()
+                await self._drained
+            async with AsyncSessionLocal() as db:
+                grouped = []
+                for model, totals in self._grouped:
+                    grouped.append((totals, (await db.execute(grouped_statement(model, totals))).all()))
+                revenue = (await db.execute(rollup_statement(Revenue, self.revenue))).all()
+                windows = (await db.execute(window_statement(datetime.utcnow()))).mappings().one()
+            self.windows = dict(windows)
+            for totals, rows in grouped:
+                key_count = 1 if isinstance(totals.key_fields, str) else len(totals.key_fields)
+                totals.load({_key(row, key_count): tuple(row[key_count:]) for row in rows})
+            # SQLite returns date() as text, other databases as a date
+            self.revenue.load(
+                (date.fromisoformat(day) if isinstance(day, str) else day, category, total, count)
+                for day, category, total, count in revenue
+            )
+        finally:
+            gate, self._gate, self._drained = self._gate, None, None
+            gate.set_result(None)
+        self._loaded_at = time.monotonic()
+
+    async def current(self) -> "AnalyticsSummary":
+        """Get the summary, loading it on first use and refreshing it in the background when stale"""
+        stale = self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds
+        if stale and self._refreshing is None:
+            self._refreshing = asyncio.create_task(self._refresh_once())
+        if self._loaded_at is None:
+            await asyncio.shield(self._refreshing)
+        return self
+
+    async def _refresh_once(self) -> None:
+        try:
+            await self.refresh()
+        finally:
+            self._refreshing = None
+
+
+def _key(row, key_count: int) -> Hashable:
+    return row[0] if key_count == 1 else tuple(row[:key_count])
+
+
+class _Observer:
+    """Forwards table writes to a GroupedTotals or TimeSeriesRollup and counts them for AnalyticsSummary.version"""
+
+    __slots__ = ("summary", "totals")
+
+    def __init__(self, summary: AnalyticsSummary, totals):
+        self.summary = summary
+        self.totals = totals
+
+    def add(self, item_id: int, row: dict) -> None:
+        self.summary._writes += 1
+        self.totals.add(item_id, row)
+
+    def remove(self, item_id: int, row: dict) -> None:
+        self.summary._writes += 1
+        self.totals.remove(item_id, row)
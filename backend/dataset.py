@@ -0,0 +1,316 @@
+"""
+Streaming synthetic CRM datasets for benchmarks
+Writes deterministic NDJSON, CSV or Parquet files with the seed_data row
+generators one chunk at a time, so memory stays bounded at any scale, and
+loads them into the SQL database or the in-memory store
+Usage:
+    python dataset.py generate data/bench --scale 1000 --format csv
+    python dataset.py load data/bench                  (SQL database, needs DATABASE_URL)
+    CRM_DATASET_DIR=data/bench uvicorn main:app        (in-memory store)
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import func, select, text
+
+from database.database import engine, Base
+from database.models import Customer, Lead, Deal, Task, Interaction, Revenue, MarketingCampaign
+from seed_data import (
+    DEFAULT_COUNTS, customer_row, lead_row, deal_row, task_row, interaction_row, revenue_row, campaign_row,
+    generate_chunks, bulk_load
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover - pyarrow is an optional dependency
+    pa = pq = None
+    HAS_PYARROW = False
+
+MANIFEST_FILE = "manifest.json"
+FORMATS = ("ndjson", "csv", "parquet")
+
+# name, model, row generator and whether rows reference customers; customers come first
+TABLES = [
+    ("customers", Customer, customer_row, False),
+    ("leads", Lead, lead_row, False),
+    ("deals", Deal, deal_row, True),
+    ("tasks", Task, task_row, True),
+    ("interactions", Interaction, interaction_row, True),
+    ("revenue", Revenue, revenue_row, True),
+    ("campaigns", MarketingCampaign, campaign_row, False),
+]
+
+# In-memory store fields that the SQL schema names differently
+STORE_RENAMES = {"deals": {"expected_close": "expected_close_date", "notes": "description"}}
+
+
+def column_types(model) -> dict[str, type]:
+    """Get the Python type of every column of a model, in table order"""
+    types = {}
+    for column in model.__table__.columns:
+        try:
+            types[column.name] = column.type.python_type
+        except NotImplementedError:
+            types[column.name] = str
+    return types
+
+
+def parse_row(row: dict, types: dict[str, type]) -> dict:
+    """Convert a row read from a file back to column types; empty strings become None"""
+    parsed = {}
+    for field, kind in types.items():
+        value = row.get(field)
+        if value is None or value == "":
+            value = None
+        elif kind is datetime:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+        elif kind in (int, float):
+            value = kind(value)
+        parsed[field] = value
+    return parsed
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class NdjsonWriter:
+    """One JSON object per line"""
+
+    def __init__(self, path: str, types: dict[str, type]):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: list[dict]) -> None:
+        self._file.writelines(json.dumps(row, default=_encode, separators=(",", ":")) + "\n" for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class CsvWriter:
+    """Header row plus one line per record, datetimes in ISO format and None as an empty field"""
+
+    def __init__(self, path: str, types: dict[str, type]):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._datetime_fields = [field for field, kind in types.items() if kind is datetime]
+        self._writer = csv.DictWriter(self._file, fieldnames=list(types))
+        self._writer.writeheader()
+
+    def write(self, rows: list[dict]) -> None:
+        for row in rows:
+            for field in self._datetime_fields:
+                if row[field] is not None:
+                    row[field] = row[field].isoformat()
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetWriter:
+    """One Parquet row group per chunk (needs pyarrow)"""
+
+    ARROW_TYPES = {int: "int64", float: "float64", str: "string", bool: "bool_"}
+
+    def __init__(self, path: str, types: dict[str, type]):
+        if not HAS_PYARROW:
+            raise RuntimeError("Parquet output requires pyarrow")
+        self._schema = pa.schema([
+            (field, pa.timestamp("us") if kind is datetime else getattr(pa, self.ARROW_TYPES.get(kind, "string"))())
+            for field, kind in types.items()
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list[dict]) -> None:
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {"ndjson": NdjsonWriter, "csv": CsvWriter, "parquet": ParquetWriter}
+
+
+def read_chunks(path: str, file_format: str, types: dict[str, type], chunk_size: int = 10_000) -> Iterator[list[dict]]:
+    """Stream a dataset file as chunks of rows converted back to column types"""
+    if file_format == "parquet":
+        if not HAS_PYARROW:
+            raise RuntimeError("Parquet input requires pyarrow")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield [parse_row(row, types) for row in batch.to_pylist()]
+        return
+
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        lines = csv.DictReader(file) if file_format == "csv" else map(json.loads, file)
+        chunk = []
+        for row in lines:
+            chunk.append(parse_row(row, types))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def table_path(directory: str, name: str, file_format: str) -> str:
+    return os.path.join(directory, f"{name}.{file_format}")
+
+
+def read_manifest(directory: str) -> dict:
+    """Get the format, seed, reference time and row counts a dataset was generated with"""
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as manifest:
+        return json.load(manifest)
+
+
+def generate_dataset(
+    directory: str,
+    counts: Optional[dict] = None,
+    file_format: str = "ndjson",
+    seed: int = 42,
+    as_of: Optional[datetime] = None,
+    chunk_size: int = 10_000
+) -> dict:
+    """Write one file per table plus a manifest and return the manifest
+
+    Rows get IDs 1..count, so every customer_id refers to a generated
+    customer. The same seed, counts and as_of always produce the same files,
+    whatever the chunk size.
+    """
+    if file_format not in WRITERS:
+        raise ValueError(f"Unknown format: {file_format}. Valid formats: {', '.join(FORMATS)}")
+    counts = {**DEFAULT_COUNTS, **(counts or {})}
+    as_of = as_of or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    os.makedirs(directory, exist_ok=True)
+    print(f"📦 Generating {file_format} dataset in {directory} (seed {seed}, as of {as_of.isoformat()})")
+
+    customer_ids = range(1, counts["customers"] + 1)
+    for name, model, make_row, needs_customers in TABLES:
+        types = column_types(model)
+        empty = dict.fromkeys(types)
+        args = (customer_ids,) if needs_customers else ()
+        writer = WRITERS[file_format](table_path(directory, name, file_format), types)
+        started = time.perf_counter()
+        try:
+            # generate_chunk seeds per chunk of 10,000 regardless of chunk_size, keeping files reproducible
+            item_id = 0
+            for chunk in generate_chunks(make_row, counts[name], args, 10_000, seed, as_of):
+                rows = []
+                for row in chunk:
+                    item_id += 1
+                    rows.append({**empty, **row, "id": item_id})
+                for start in range(0, len(rows), chunk_size):
+                    writer.write(rows[start:start + chunk_size])
+        finally:
+            writer.close()
+        seconds = time.perf_counter() - started
+        print(f"   ✓ Wrote {counts[name]:,} {name} in {seconds:.2f}s ({counts[name] / max(seconds, 1e-9):,.0f} rows/sec)")
+
+    manifest = {"format": file_format, "seed": seed, "as_of": as_of.isoformat(), "counts": counts}
+    with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+    return manifest
+
+
+def load_into_database(directory: str, chunk_size: int = 10_000) -> dict:
+    """Stream every table of a dataset into the SQL database and return the rows loaded per table
+
+    Nothing is loaded when the database already has customers, since the files carry their own IDs.
+    """
+    manifest = read_manifest(directory)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        existing = conn.execute(select(func.count()).select_from(Customer.__table__)).scalar_one()
+    if existing > 0:
+        print(f"⚠️  Database already contains {existing} customers. Skipping load.")
+        return {}
+
+    loaded = {}
+    for name, model, _, _ in TABLES:
+        types = column_types(model)
+        chunks = read_chunks(table_path(directory, name, manifest["format"]), manifest["format"], types, chunk_size)
+        loaded[name], seconds = bulk_load(model, chunks)
+        print(f"   ✓ Loaded {loaded[name]:,} {name} in {seconds:.2f}s ({loaded[name] / max(seconds, 1e-9):,.0f} rows/sec)")
+        if engine.dialect.name == "postgresql":
+            # Explicit IDs bypass the sequence, so move it past them
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{model.__tablename__}', 'id'), "
+                    f"(SELECT COALESCE(MAX(id), 0) + 1 FROM {model.__tablename__}), false)"
+                ))
+    return loaded
+
+
+def load_into_stores(directory: str, stores: dict, chunk_size: int = 10_000) -> dict:
+    """Replace the records of the in-memory stores with a dataset and return the rows loaded per table
+
+    Only tables with a store are loaded; fields the store does not keep are dropped.
+    """
+    manifest = read_manifest(directory)
+    loaded = {}
+    for name, model, _, _ in TABLES:
+        store = stores.get(name)
+        if store is None:
+            continue
+        types = column_types(model)
+        chunks = read_chunks(table_path(directory, name, manifest["format"]), manifest["format"], types, chunk_size)
+        store.restore(store_rows(name, chunks, store.fields), next_id=1)
+        loaded[name] = len(store)
+    return loaded
+
+
+def store_rows(name: str, chunks: Iterator[list[dict]], fields: Optional[tuple]) -> Iterator[dict]:
+    """Flatten chunks into rows shaped for an in-memory store"""
+    renames = STORE_RENAMES.get(name, {})
+    for chunk in chunks:
+        for row in chunk:
+            if fields is None:
+                yield {renames.get(field, field): value for field, value in row.items()} if renames else row
+            else:
+                yield {field: row.get(renames.get(field, field)) for field in fields}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate or load synthetic CRM datasets")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="write a dataset to files")
+    generate.add_argument("directory")
+    generate.add_argument("--format", choices=FORMATS, default="ndjson")
+    for name, default in DEFAULT_COUNTS.items():
+        generate.add_argument(f"--{name}", type=int, default=default, help=f"number of {name} (default {default})")
+    generate.add_argument("--scale", type=float, default=1.0, help="multiply every count, e.g. --scale 10000")
+    generate.add_argument("--seed", type=int, default=42, help="random seed (default 42)")
+    generate.add_argument("--as-of", type=datetime.fromisoformat, default=None,
+                          help="time generated dates are relative to (default today, midnight UTC)")
+    generate.add_argument("--chunk-size", type=int, default=10_000, help="rows written at a time (default 10000)")
+
+    load = commands.add_parser("load", help="load a dataset into the database at DATABASE_URL")
+    load.add_argument("directory")
+    load.add_argument("--chunk-size", type=int, default=10_000, help="rows per insert transaction (default 10000)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "generate":
+        generate_dataset(
+            args.directory,
+            counts={name: int(getattr(args, name) * args.scale) for name in DEFAULT_COUNTS},
+            file_format=args.format,
+            seed=args.seed,
+            as_of=args.as_of,
+            chunk_size=args.chunk_size
+        )
+    else:
+        print(f"📥 Loading dataset from {args.directory}")
+        load_into_database(args.directory, args.chunk_size)
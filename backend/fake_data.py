@@ -3,13 +3,20 @@ Fake/Mock data for the CRM application
 Replaces database integration with local static data
 """
 from datetime import datetime, timedelta
+from itertools import islice
 import random
 
+from store import (
+    EntityStore, SortedIndex, ColumnarIndex, GroupedTotals, TimeSeriesRollup, HAS_NUMPY, decode_cursor, next_page,
+    CustomerRecord, LeadRecord, DealRecord, TaskRecord
+)
+from store.rollups import months_back
+
 # Generate dates
 now = datetime.utcnow()
 
 # Fake Customers Data
-CUSTOMERS = [
+CUSTOMERS = EntityStore("customers", [
     {"id": 1, "name": "John Smith", "email": "john.smith@techcorp.com", "phone": "+1-555-0101", "company": "TechCorp Inc", "status": "active", "industry": "Technology", "lifetime_value": 125000.00, "acquisition_source": "referral", "notes": "Key enterprise client", "created_at": now - timedelta(days=365), "updated_at": now - timedelta(days=30)},
     {"id": 2, "name": "Sarah Johnson", "email": "sarah.j@healthplus.com", "phone": "+1-555-0102", "company": "HealthPlus", "status": "active", "industry": "Healthcare", "lifetime_value": 89000.00, "acquisition_source": "website", "notes": "Growing account", "created_at": now - timedelta(days=300), "updated_at": now - timedelta(days=15)},
     {"id": 3, "name": "Mike Davis", "email": "mike.davis@finserv.com", "phone": "+1-555-0103", "company": "FinServ Solutions", "status": "active", "industry": "Finance", "lifetime_value": 210000.00, "acquisition_source": "conference", "notes": "Premium tier client", "created_at": now - timedelta(days=450), "updated_at": now - timedelta(days=7)},
@@ -20,10 +27,10 @@ CUSTOMERS = [
     {"id": 8, "name": "Jennifer Martinez", "email": "jen.m@mediagroup.com", "phone": "+1-555-0108", "company": "MediaGroup", "status": "inactive", "industry": "Media", "lifetime_value": 34000.00, "acquisition_source": "advertising", "notes": "Paused services", "created_at": now - timedelta(days=250), "updated_at": now - timedelta(days=90)},
     {"id": 9, "name": "Robert Garcia", "email": "r.garcia@energyco.com", "phone": "+1-555-0109", "company": "EnergyCo", "status": "active", "industry": "Energy", "lifetime_value": 289000.00, "acquisition_source": "conference", "notes": "Strategic partner", "created_at": now - timedelta(days=600), "updated_at": now - timedelta(days=3)},
     {"id": 10, "name": "Amanda Lee", "email": "amanda.lee@foodserv.com", "phone": "+1-555-0110", "company": "FoodServ", "status": "active", "industry": "Food & Beverage", "lifetime_value": 92000.00, "acquisition_source": "referral", "notes": "Expansion planned", "created_at": now - timedelta(days=150), "updated_at": now - timedelta(days=20)},
-]
+], record_type=CustomerRecord, indexed_fields=("status", "industry"), numeric_fields=("lifetime_value",), text_fields=("name", "email", "company"))
 
 # Fake Leads Data
-LEADS = [
+LEADS = EntityStore("leads", [
     {"id": 1, "name": "Chris Parker", "email": "c.parker@startup.io", "phone": "+1-555-0201", "company": "StartupIO", "status": "new", "source": "website", "score": 85, "notes": "Interested in enterprise plan", "created_at": now - timedelta(days=5), "updated_at": now - timedelta(days=1)},
     {"id": 2, "name": "Nancy White", "email": "n.white@bigretail.com", "phone": "+1-555-0202", "company": "BigRetail", "status": "qualified", "source": "referral", "score": 92, "notes": "Budget approved", "created_at": now - timedelta(days=10), "updated_at": now - timedelta(days=2)},
     {"id": 3, "name": "Tom Harris", "email": "tom.h@cloudtech.com", "phone": "+1-555-0203", "company": "CloudTech", "status": "contacted", "source": "linkedin", "score": 78, "notes": "Scheduled demo", "created_at": now - timedelta(days=7), "updated_at": now - timedelta(days=3)},
@@ -34,10 +41,10 @@ LEADS = [
     {"id": 8, "name": "Samantha Hill", "email": "s.hill@insurance.com", "phone": "+1-555-0208", "company": "SafeInsure", "status": "contacted", "source": "website", "score": 72, "notes": "Following up next week", "created_at": now - timedelta(days=8), "updated_at": now - timedelta(days=2)},
     {"id": 9, "name": "Mark Thompson", "email": "m.thompson@autoparts.com", "phone": "+1-555-0209", "company": "AutoParts Plus", "status": "new", "source": "advertising", "score": 58, "notes": "Initial inquiry", "created_at": now - timedelta(days=1), "updated_at": now - timedelta(hours=12)},
     {"id": 10, "name": "Laura King", "email": "l.king@consulting.com", "phone": "+1-555-0210", "company": "KingConsult", "status": "qualified", "source": "linkedin", "score": 90, "notes": "High priority prospect", "created_at": now - timedelta(days=12), "updated_at": now - timedelta(days=1)},
-]
+], record_type=LeadRecord, indexed_fields=("status", "source"), sorted_fields={"score": "desc"}, numeric_fields=("score", "estimated_value"))
 
 # Fake Deals Data
-DEALS = [
+DEALS = EntityStore("deals", [
     {"id": 1, "title": "TechCorp Enterprise License", "value": 150000.00, "stage": "negotiation", "probability": 80, "customer_id": 1, "expected_close": now + timedelta(days=15), "notes": "Final contract review", "created_at": now - timedelta(days=60), "updated_at": now - timedelta(days=2)},
     {"id": 2, "title": "HealthPlus Expansion", "value": 75000.00, "stage": "proposal", "probability": 60, "customer_id": 2, "expected_close": now + timedelta(days=30), "notes": "Waiting for budget approval", "created_at": now - timedelta(days=30), "updated_at": now - timedelta(days=5)},
     {"id": 3, "title": "FinServ Premium Upgrade", "value": 200000.00, "stage": "closed_won", "probability": 100, "customer_id": 3, "expected_close": now - timedelta(days=10), "notes": "Deal closed successfully", "created_at": now - timedelta(days=90), "updated_at": now - timedelta(days=10)},
@@ -48,10 +55,13 @@ DEALS = [
     {"id": 8, "title": "FoodServ POS Integration", "value": 55000.00, "stage": "qualification", "probability": 50, "customer_id": 10, "expected_close": now + timedelta(days=45), "notes": "Technical review ongoing", "created_at": now - timedelta(days=15), "updated_at": now - timedelta(days=6)},
     {"id": 9, "title": "StartupIO Basic Plan", "value": 25000.00, "stage": "prospecting", "probability": 25, "customer_id": None, "expected_close": now + timedelta(days=120), "notes": "New lead conversion", "created_at": now - timedelta(days=5), "updated_at": now - timedelta(days=2)},
     {"id": 10, "title": "BigRetail Enterprise", "value": 290000.00, "stage": "closed_lost", "probability": 0, "customer_id": None, "expected_close": now - timedelta(days=5), "notes": "Lost to competitor pricing", "created_at": now - timedelta(days=100), "updated_at": now - timedelta(days=5)},
-]
+], record_type=DealRecord, indexed_fields=("stage", "customer_id"), sorted_fields={"value": "desc"}, datetime_fields=("expected_close",), numeric_fields=("value", "probability"))
+
+# Deal fields the SQL models and API schemas name differently
+DEAL_FIELD_RENAMES = {"expected_close_date": "expected_close", "description": "notes"}
 
 # Fake Tasks Data
-TASKS = [
+TASKS = EntityStore("tasks", [
     {"id": 1, "title": "Follow up with TechCorp", "description": "Schedule final contract review meeting", "status": "in_progress", "priority": "high", "assignee": "Sales Team", "due_date": now + timedelta(days=2), "customer_id": 1, "deal_id": 1, "completed_at": None, "created_at": now - timedelta(days=5), "updated_at": now - timedelta(days=1)},
     {"id": 2, "title": "Send proposal to HealthPlus", "description": "Prepare and send updated proposal", "status": "todo", "priority": "high", "assignee": "Sales Team", "due_date": now + timedelta(days=3), "customer_id": 2, "deal_id": 2, "completed_at": None, "created_at": now - timedelta(days=3), "updated_at": now - timedelta(days=1)},
     {"id": 3, "title": "Demo for CloudTech", "description": "Product demonstration for new lead", "status": "todo", "priority": "medium", "assignee": "Product Team", "due_date": now + timedelta(days=5), "customer_id": None, "deal_id": None, "completed_at": None, "created_at": now - timedelta(days=2), "updated_at": now - timedelta(days=1)},
@@ -62,37 +72,78 @@ TASKS = [
     {"id": 8, "title": "Follow up on lost deal", "description": "Understand why BigRetail chose competitor", "status": "todo", "priority": "low", "assignee": "Sales Team", "due_date": now - timedelta(days=1), "customer_id": None, "deal_id": 10, "completed_at": None, "created_at": now - timedelta(days=5), "updated_at": now - timedelta(days=4)},
     {"id": 9, "title": "Prepare marketing materials", "description": "Create new case study from FinServ success", "status": "in_progress", "priority": "medium", "assignee": "Marketing", "due_date": now + timedelta(days=10), "customer_id": 3, "deal_id": 3, "completed_at": None, "created_at": now - timedelta(days=8), "updated_at": now - timedelta(days=2)},
     {"id": 10, "title": "Onboarding call - PharmaCare", "description": "Schedule onboarding for new customer", "status": "todo", "priority": "high", "assignee": "Customer Success", "due_date": now + timedelta(days=4), "customer_id": None, "deal_id": None, "completed_at": None, "created_at": now - timedelta(days=1), "updated_at": now - timedelta(hours=12)},
+], record_type=TaskRecord, indexed_fields=("status", "priority", "assignee", "customer_id"), sorted_fields={"due_date": "asc"}, datetime_fields=("due_date", "completed_at"))
+
+# Fake Revenue Data: monthly revenue over the last 12 months (oldest first),
+# split across payment types and paid mid-month by the active customers
+MONTHLY_REVENUE = [
+    85000.00, 92000.00, 105000.00, 98000.00, 115000.00, 128000.00,
+    135000.00, 142000.00, 138000.00, 155000.00, 162000.00, 130000.00
 ]
+REVENUE_MIX = {"subscription": 0.6, "renewal": 0.15, "upsell": 0.15, "one_time": 0.1}
+PAYING_CUSTOMERS = [1, 2, 3, 4, 6, 7, 9, 10]
+
+
+def _revenue_rows():
+    rows = []
+    for months_ago, total in zip(range(11, -1, -1), MONTHLY_REVENUE):
+        month = datetime.combine(months_back(now.date(), months_ago), datetime.min.time())
+        paid = min(month + timedelta(days=14), now)
+        for revenue_type, share in REVENUE_MIX.items():
+            rows.append({
+                "id": len(rows) + 1,
+                "customer_id": PAYING_CUSTOMERS[len(rows) % len(PAYING_CUSTOMERS)],
+                "amount": round(total * share, 2),
+                "type": revenue_type,
+                "description": f"{revenue_type.replace('_', ' ').capitalize()} payment",
+                "date": paid,
+                "created_at": paid
+            })
+    return rows
+
+
+REVENUE = EntityStore("revenue", _revenue_rows(), indexed_fields=("customer_id",), datetime_fields=("date",), numeric_fields=("amount",))
+
+# All persistent tables, by store name
+TABLES = {store.name: store for store in (CUSTOMERS, LEADS, DEALS, TASKS, REVENUE)}
+
+# Incrementally maintained totals behind the dashboard summaries
+CUSTOMERS_BY_STATUS = CUSTOMERS.attach(GroupedTotals("status", ("lifetime_value",)))
+CUSTOMERS_BY_INDUSTRY = CUSTOMERS.attach(GroupedTotals("industry", ("lifetime_value",)))
+CUSTOMERS_BY_SOURCE = CUSTOMERS.attach(GroupedTotals("acquisition_source"))
+LEADS_BY_STATUS = LEADS.attach(GroupedTotals("status", ("score",)))
+LEADS_BY_SOURCE_STATUS = LEADS.attach(GroupedTotals(("source", "status")))
+DEALS_BY_STAGE = DEALS.attach(GroupedTotals("stage", ("value", "probability")))
+TASKS_BY_STATUS = TASKS.attach(GroupedTotals("status"))
+TASKS_BY_PRIORITY = TASKS.attach(GroupedTotals("priority"))
+REVENUE_ROLLUP = REVENUE.attach(TimeSeriesRollup("date", "amount", "type"))
 
-# Pre-calculated Analytics Data
+# Optional columnar copies for vectorized range filters and aggregates (needs numpy)
+CUSTOMER_COLUMNS = LEAD_COLUMNS = DEAL_COLUMNS = TASK_COLUMNS = None
+if HAS_NUMPY:
+    CUSTOMER_COLUMNS = CUSTOMERS.attach(ColumnarIndex(
+        numeric_fields=("lifetime_value",),
+        datetime_fields=("created_at",),
+        categorical_fields=("status", "industry", "acquisition_source")
+    ))
+    LEAD_COLUMNS = LEADS.attach(ColumnarIndex(
+        numeric_fields=("score", "estimated_value"),
+        datetime_fields=("created_at",),
+        categorical_fields=("status", "source")
+    ))
+    DEAL_COLUMNS = DEALS.attach(ColumnarIndex(
+        numeric_fields=("value", "probability"),
+        datetime_fields=("expected_close", "created_at"),
+        categorical_fields=("stage",)
+    ))
+    TASK_COLUMNS = TASKS.attach(ColumnarIndex(
+        datetime_fields=("due_date", "completed_at"),
+        categorical_fields=("status", "priority")
+    ))
+
+# Metrics without backing tables in fake_data; everything else in the
+# analytics overview is computed live by get_analytics_overview()
 ANALYTICS_DATA = {
-    "total_customers": 10,
-    "active_customers": 7,
-    "churned_customers": 1,
-    "retention_rate": 90.0,
-    "total_leads": 10,
-    "new_leads_30d": 8,
-    "qualified_leads": 3,
-    "lead_conversion_rate": 10.0,
-    "avg_lead_score": 76.8,
-    "best_lead_source": "referral",
-    "active_deals": 7,
-    "pipeline_value": 760000.00,
-    "avg_deal_size": 142500.00,
-    "win_rate": 50.0,
-    "deals_prospecting": 2,
-    "deals_qualification": 2,
-    "deals_proposal": 2,
-    "deals_negotiation": 2,
-    "total_revenue": 1285000.00,
-    "mrr": 107083.33,
-    "revenue_growth": 12.5,
-    "avg_ltv": 138714.29,
-    "top_industry": "Energy",
-    "top_acquisition_channel": "referral",
-    "open_tasks": 7,
-    "overdue_tasks": 1,
-    "completed_tasks_7d": 2,
     "active_campaigns": 3,
     "marketing_spend": 45000.00,
     "marketing_leads": 25,
@@ -102,138 +153,316 @@ ANALYTICS_DATA = {
     "avg_response_time": 4
 }
 
-# Revenue Chart Data (last 12 months)
-REVENUE_CHART = [
-    {"month": "Jan", "year": 2025, "revenue": 85000.00},
-    {"month": "Feb", "year": 2025, "revenue": 92000.00},
-    {"month": "Mar", "year": 2025, "revenue": 105000.00},
-    {"month": "Apr", "year": 2025, "revenue": 98000.00},
-    {"month": "May", "year": 2025, "revenue": 115000.00},
-    {"month": "Jun", "year": 2025, "revenue": 128000.00},
-    {"month": "Jul", "year": 2025, "revenue": 135000.00},
-    {"month": "Aug", "year": 2025, "revenue": 142000.00},
-    {"month": "Sep", "year": 2025, "revenue": 138000.00},
-    {"month": "Oct", "year": 2025, "revenue": 155000.00},
-    {"month": "Nov", "year": 2025, "revenue": 162000.00},
-    {"month": "Dec", "year": 2025, "revenue": 130000.00},
-]
-
-# Lead Sources Distribution
-LEAD_SOURCES = [
-    {"source": "website", "count": 3},
-    {"source": "referral", "count": 3},
-    {"source": "linkedin", "count": 2},
-    {"source": "advertising", "count": 2},
-    {"source": "conference", "count": 1},
-    {"source": "cold_call", "count": 1},
-]
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
-# Customer Industries Distribution
-CUSTOMER_INDUSTRIES = [
-    {"industry": "Technology", "count": 1, "value": 125000.00},
-    {"industry": "Healthcare", "count": 1, "value": 89000.00},
-    {"industry": "Finance", "count": 1, "value": 210000.00},
-    {"industry": "Retail", "count": 1, "value": 67000.00},
-    {"industry": "Manufacturing", "count": 1, "value": 45000.00},
-    {"industry": "Education", "count": 1, "value": 78000.00},
-    {"industry": "Logistics", "count": 1, "value": 156000.00},
-    {"industry": "Media", "count": 1, "value": 34000.00},
-    {"industry": "Energy", "count": 1, "value": 289000.00},
-    {"industry": "Food & Beverage", "count": 1, "value": 92000.00},
-]
+DEAL_STAGES = ["prospecting", "qualification", "proposal", "negotiation", "closed_won", "closed_lost"]
+CLOSED_STAGES = ["closed_won", "closed_lost"]
+CLOSED_TASK_STATUSES = ["completed", "cancelled"]
 
-# Pipeline Summary
-PIPELINE_SUMMARY = [
-    {"stage": "prospecting", "count": 2, "total_value": 110000.00, "avg_probability": 27.5},
-    {"stage": "qualification", "count": 2, "total_value": 100000.00, "avg_probability": 45.0},
-    {"stage": "proposal", "count": 2, "total_value": 255000.00, "avg_probability": 65.0},
-    {"stage": "negotiation", "count": 2, "total_value": 470000.00, "avg_probability": 82.5},
-    {"stage": "closed_won", "count": 1, "total_value": 200000.00, "avg_probability": 100.0},
-    {"stage": "closed_lost", "count": 1, "total_value": 290000.00, "avg_probability": 0.0},
-]
+# Open tasks ordered by due date, so overdue lookups only touch overdue tasks
+OPEN_TASKS_BY_DUE = TASKS.attach(SortedIndex(
+    "due_date",
+    include=lambda t: t.get("due_date") is not None and t.get("status") not in CLOSED_TASK_STATUSES
+))
 
-# Task Summary
-TASK_SUMMARY = {
-    "total": 10,
-    "by_status": {"todo": 5, "in_progress": 3, "completed": 2},
-    "by_priority": {"high": 5, "medium": 3, "low": 2},
-    "overdue": 1
-}
+# Leads by creation time and tasks by completion time, so "since" counts are a bisection
+LEADS_BY_CREATED = LEADS.attach(SortedIndex("created_at", include=lambda l: l.get("created_at") is not None))
+TASKS_BY_COMPLETED = TASKS.attach(SortedIndex("completed_at", include=lambda t: t.get("completed_at") is not None))
 
 
 # Helper functions to work with fake data
-def get_customers_filtered(status=None, industry=None, search=None, skip=0, limit=100):
-    """Get filtered customers"""
-    result = CUSTOMERS.copy()
+def get_customers_filtered(status=None, industry=None, search=None, skip=0, limit=100, cursor=None):
+    """Get filtered customers, ranked by match quality when searching"""
+    with CUSTOMERS.reading():
+        ids = CUSTOMERS.find_ids(status=status or None, industry=industry or None)
+        
+        if search:
+            after = decode_cursor(cursor, "relevance") if cursor else None
+            rows = CUSTOMERS.search(search, ids, after)[skip:skip + limit]
+            return next_page(rows, limit, key=lambda c: CUSTOMERS.search_rank(search, c["id"]), order="relevance")
+        
+        after = decode_cursor(cursor, "id") if cursor else None
+        return next_page(CUSTOMERS.page(ids, skip=skip, limit=limit, after=after), limit)
+
+
+def get_leads_filtered(status=None, source=None, min_score=None, skip=0, limit=100, cursor=None):
+    """Get filtered leads, sorted by score descending"""
+    after = decode_cursor(cursor, "score") if cursor else None
+    # The score index is descending, so the walk can stop at the first lead below min_score
+    below_min = None
+    if min_score:
+        below_min = lambda l: l.get("score") is None or l["score"] < min_score
     
-    if status:
-        result = [c for c in result if c["status"] == status]
-    if industry:
-        result = [c for c in result if c["industry"] == industry]
-    if search:
-        search_lower = search.lower()
-        result = [c for c in result if 
-                  search_lower in c["name"].lower() or 
-                  search_lower in c["email"].lower() or 
-                  search_lower in c["company"].lower()]
+    with LEADS.reading():
+        if min_score and LEAD_COLUMNS is not None:
+            ids = LEAD_COLUMNS.ids(LEAD_COLUMNS.mask(
+                equals={"status": status or None, "source": source or None},
+                minimum={"score": min_score}
+            ))
+        else:
+            ids = LEADS.find_ids(status=status or None, source=source or None)
+        
+        rows = LEADS.page(ids, order_by="score", skip=skip, limit=limit, until=below_min, after=after)
+        return next_page(rows, limit, "score")
+
+
+def get_deals_filtered(stage=None, customer_id=None, min_value=None, skip=0, limit=100, cursor=None):
+    """Get filtered deals, sorted by value descending"""
+    after = decode_cursor(cursor, "value") if cursor else None
+    below_min = None
+    if min_value:
+        below_min = lambda d: d.get("value") is None or d["value"] < min_value
     
-    return result[skip:skip + limit]
+    with DEALS.reading():
+        if min_value and not customer_id and DEAL_COLUMNS is not None:
+            ids = DEAL_COLUMNS.ids(DEAL_COLUMNS.mask(
+                equals={"stage": stage or None},
+                minimum={"value": min_value}
+            ))
+        else:
+            ids = DEALS.find_ids(stage=stage or None, customer_id=customer_id or None)
+        
+        rows = DEALS.page(ids, order_by="value", skip=skip, limit=limit, until=below_min, after=after)
+        return next_page(rows, limit, "value")
+
+
+def get_tasks_filtered(status=None, priority=None, assignee=None, overdue_only=False, skip=0, limit=100, cursor=None):
+    """Get filtered tasks, sorted by due date"""
+    after = decode_cursor(cursor, "due_date") if cursor else None
+    with TASKS.reading():
+        ids = TASKS.find_ids(status=status or None, priority=priority or None, assignee=assignee or None)
+        
+        if overdue_only:
+            # Already in due date order, so only the overdue tasks are touched
+            after_key = OPEN_TASKS_BY_DUE.key(after[1], {"due_date": after[0]}) if after else None
+            overdue = OPEN_TASKS_BY_DUE.ids_before(datetime.utcnow(), after_key)
+            if ids is not None:
+                overdue = (item_id for item_id in overdue if item_id in ids)
+            rows = [TASKS.get(item_id) for item_id in islice(overdue, skip, skip + limit)]
+            return next_page(rows, limit, "due_date")
+        
+        rows = TASKS.page(ids, order_by="due_date", skip=skip, limit=limit, after=after)
+        return next_page(rows, limit, "due_date")
+
+
+def get_customers_360(customer_ids):
+    """Get customers with their deals, open tasks, recent interactions and revenue, in the order asked
+
+    Relationships are read from the customer_id hash indexes. The fake data
+    has no interactions, so those are always empty. Unknown IDs are left out.
+    """
+    month_ago = datetime.utcnow() - timedelta(days=30)
+    views = []
+    for customer_id in dict.fromkeys(customer_ids):
+        customer = CUSTOMERS.get(customer_id)
+        if customer is None:
+            continue
+        with DEALS.reading():
+            deal_ids = DEALS.find_ids(customer_id=customer_id)
+            deals = DEALS.page(deal_ids, order_by="value", limit=len(deal_ids))
+        with TASKS.reading():
+            task_ids = TASKS.find_ids(customer_id=customer_id)
+            tasks = TASKS.page(
+                task_ids, order_by="due_date", limit=len(task_ids),
+                where=lambda t: t.get("status") not in CLOSED_TASK_STATUSES
+            )
+        with REVENUE.reading():
+            payments = [REVENUE.get(item_id) for item_id in REVENUE.find_ids(customer_id=customer_id)]
+        paid_at = [payment["date"] for payment in payments if payment.get("date") is not None]
+        views.append({
+            "customer": customer,
+            "deals": deals,
+            "open_tasks": tasks,
+            "recent_interactions": [],
+            "revenue": {
+                "total": round(sum((payment.get("amount") or 0 for payment in payments), 0.0), 2),
+                "payments": len(payments),
+                "last_30_days": round(sum((
+                    payment.get("amount") or 0 for payment in payments
+                    if payment.get("date") is not None and payment["date"] >= month_ago
+                ), 0.0), 2),
+                "last_payment_at": max(paid_at, default=None)
+            }
+        })
+    return views
 
 
-def get_leads_filtered(status=None, source=None, min_score=None, skip=0, limit=100):
-    """Get filtered leads"""
-    result = LEADS.copy()
+def get_lead_source_counts():
+    """Get lead counts by source, largest first"""
+    with LEADS.reading():
+        groups = LEADS_BY_SOURCE_STATUS.counts()
     
-    if status:
-        result = [l for l in result if l["status"] == status]
-    if source:
-        result = [l for l in result if l["source"] == source]
-    if min_score:
-        result = [l for l in result if l["score"] >= min_score]
+    counts = {}
+    for (source, _), count in groups.items():
+        if source is not None:
+            counts[source] = counts.get(source, 0) + count
     
-    # Sort by score descending
-    result.sort(key=lambda x: x["score"], reverse=True)
-    return result[skip:skip + limit]
+    return [
+        {"source": source, "count": count}
+        for source, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+    ]
 
 
-def get_deals_filtered(stage=None, customer_id=None, min_value=None, skip=0, limit=100):
-    """Get filtered deals"""
-    result = DEALS.copy()
+def get_customer_industry_totals():
+    """Get customer counts and lifetime value by industry, highest value first"""
+    with CUSTOMERS.reading():
+        totals = CUSTOMERS_BY_INDUSTRY.groups()
     
-    if stage:
-        result = [d for d in result if d["stage"] == stage]
-    if customer_id:
-        result = [d for d in result if d["customer_id"] == customer_id]
-    if min_value:
-        result = [d for d in result if d["value"] >= min_value]
+    return [
+        {"industry": industry, "count": count, "value": round(value, 2)}
+        for industry, (count, value) in sorted(totals.items(), key=lambda item: item[1][1], reverse=True)
+        if industry is not None
+    ]
+
+
+def get_pipeline_summary():
+    """Get deal count, total value and average probability per stage"""
+    with DEALS.reading():
+        stages = DEALS_BY_STAGE.groups()
     
-    # Sort by value descending
-    result.sort(key=lambda x: x["value"], reverse=True)
-    return result[skip:skip + limit]
+    ordered = DEAL_STAGES + [stage for stage in stages if stage not in DEAL_STAGES and stage is not None]
+    summary = []
+    for stage in ordered:
+        count, total_value, total_probability = stages.get(stage, (0, 0.0, 0.0))
+        summary.append({
+            "stage": stage,
+            "count": count,
+            "total_value": round(total_value, 2),
+            "avg_probability": round(total_probability / count, 1) if count else 0.0
+        })
+    return summary
+
+
+def count_overdue_tasks(as_of=None):
+    """Count open tasks whose due date has passed"""
+    with TASKS.reading():
+        return OPEN_TASKS_BY_DUE.count_before(as_of or datetime.utcnow())
 
 
-def get_tasks_filtered(status=None, priority=None, assignee=None, overdue_only=False, skip=0, limit=100):
-    """Get filtered tasks"""
-    result = TASKS.copy()
+def count_since(store, index, since):
+    """Count the records in an ascending SortedIndex whose field is at or after since"""
+    with store.reading():
+        return len(index) - index.count_before(since)
+
+
+def get_task_summary():
+    """Get task counts by status and priority"""
+    with TASKS.reading():
+        by_status = TASKS_BY_STATUS.counts()
+        by_priority = TASKS_BY_PRIORITY.counts()
+    
+    return {
+        "total": sum(by_status.values()),
+        "by_status": {status: count for status, count in by_status.items() if status is not None},
+        "by_priority": {priority: count for priority, count in by_priority.items() if priority is not None},
+        "overdue": count_overdue_tasks()
+    }
+
+
+def get_analytics_overview():
+    """Get the analytics overview, computed from the maintained totals"""
+    current_time = datetime.utcnow()
+    
+    with CUSTOMERS.reading():
+        customer_status = CUSTOMERS_BY_STATUS.groups()
+        customer_industry = CUSTOMERS_BY_INDUSTRY.groups()
+        customer_source = CUSTOMERS_BY_SOURCE.counts()
+    with LEADS.reading():
+        lead_status = LEADS_BY_STATUS.groups()
+        lead_source_status = LEADS_BY_SOURCE_STATUS.counts()
+    with DEALS.reading():
+        deal_stage = DEALS_BY_STAGE.groups()
+    with TASKS.reading():
+        task_status = TASKS_BY_STATUS.counts()
+    # Revenue windows of 30 days, to the day, as the SQL overview
+    today = current_time.date()
+    month_ago = today - timedelta(days=30)
+    with REVENUE.reading():
+        total_revenue = REVENUE_ROLLUP.grand_total()
+        revenue_30d = REVENUE_ROLLUP.totals(month_ago, today)
+        revenue_prev_30d = REVENUE_ROLLUP.totals(month_ago - timedelta(days=30), month_ago - timedelta(days=1))["total"]
     
-    if status:
-        result = [t for t in result if t["status"] == status]
-    if priority:
-        result = [t for t in result if t["priority"] == priority]
-    if assignee:
-        result = [t for t in result if t["assignee"] == assignee]
-    if overdue_only:
-        result = [t for t in result if 
-                  t["due_date"] < now and t["status"] not in ["completed", "cancelled"]]
+    total_customers = sum(count for count, _ in customer_status.values())
+    churned_customers = customer_status.get("churned", (0, 0.0))[0]
+    total_ltv = sum(value for _, value in customer_status.values())
     
-    # Sort by due date
-    result.sort(key=lambda x: x["due_date"])
-    return result[skip:skip + limit]
+    total_leads = sum(count for count, _ in lead_status.values())
+    won_leads = lead_status.get("won", (0, 0.0))[0]
+    won_by_source = {}
+    leads_by_source = {}
+    for (source, status), count in lead_source_status.items():
+        if source is None:
+            continue
+        leads_by_source[source] = leads_by_source.get(source, 0) + count
+        if status == "won":
+            won_by_source[source] = won_by_source.get(source, 0) + count
+    
+    open_stages = [stage for stage in deal_stage if stage not in CLOSED_STAGES]
+    active_deals = sum(deal_stage[stage][0] for stage in open_stages)
+    pipeline_value = sum(deal_stage[stage][1] for stage in open_stages)
+    won_deals = deal_stage.get("closed_won", (0, 0.0, 0.0))[0]
+    lost_deals = deal_stage.get("closed_lost", (0, 0.0, 0.0))[0]
+    
+    def top(totals):
+        candidates = {key: value for key, value in totals.items() if key is not None}
+        return max(candidates, key=candidates.get) if candidates else "N/A"
+    
+    return {
+        "total_customers": total_customers,
+        "active_customers": customer_status.get("active", (0, 0.0))[0],
+        "churned_customers": churned_customers,
+        "retention_rate": round((total_customers - churned_customers) / total_customers * 100, 1) if total_customers else 0.0,
+        "total_leads": total_leads,
+        "new_leads_30d": count_since(LEADS, LEADS_BY_CREATED, current_time - timedelta(days=30)),
+        "qualified_leads": lead_status.get("qualified", (0, 0.0))[0],
+        "lead_conversion_rate": round(won_leads / total_leads * 100, 1) if total_leads else 0.0,
+        "avg_lead_score": round(sum(score for _, score in lead_status.values()) / total_leads, 1) if total_leads else 0.0,
+        "best_lead_source": top(won_by_source or leads_by_source),
+        "active_deals": active_deals,
+        "pipeline_value": round(pipeline_value, 2),
+        "avg_deal_size": round(pipeline_value / active_deals, 2) if active_deals else 0.0,
+        "win_rate": round(won_deals / (won_deals + lost_deals) * 100, 1) if won_deals + lost_deals else 0.0,
+        "deals_prospecting": deal_stage.get("prospecting", (0,))[0],
+        "deals_qualification": deal_stage.get("qualification", (0,))[0],
+        "deals_proposal": deal_stage.get("proposal", (0,))[0],
+        "deals_negotiation": deal_stage.get("negotiation", (0,))[0],
+        "total_revenue": round(total_revenue, 2),
+        "mrr": round(revenue_30d["by_category"].get("subscription", 0.0), 2),
+        "revenue_growth": round((revenue_30d["total"] - revenue_prev_30d) / revenue_prev_30d * 100, 1) if revenue_prev_30d else 0.0,
+        "avg_ltv": round(total_ltv / total_customers, 2) if total_customers else 0.0,
+        "top_industry": top({industry: value for industry, (_, value) in customer_industry.items()}),
+        "top_acquisition_channel": top(customer_source),
+        "open_tasks": sum(count for status, count in task_status.items() if status not in CLOSED_TASK_STATUSES),
+        "overdue_tasks": count_overdue_tasks(current_time),
+        "completed_tasks_7d": count_since(TASKS, TASKS_BY_COMPLETED, current_time - timedelta(days=7)),
+        "active_campaigns": ANALYTICS_DATA["active_campaigns"],
+        "marketing_spend": ANALYTICS_DATA["marketing_spend"],
+        "marketing_leads": ANALYTICS_DATA["marketing_leads"],
+        "marketing_roi": ANALYTICS_DATA["marketing_roi"],
+        "interactions_30d": ANALYTICS_DATA["interactions_30d"],
+        "positive_interactions": ANALYTICS_DATA["positive_interactions"],
+        "avg_response_time": ANALYTICS_DATA["avg_response_time"]
+    }
+
+
+def get_revenue_chart(start=None, end=None, granularity="month"):
+    """Get revenue per day, week or month from start to end (default the last 12 months), by revenue type"""
+    with REVENUE.reading():
+        series = REVENUE_ROLLUP.series(start, end, granularity)
+    points = []
+    for point in series:
+        period = point["period"]
+        labels = {"month": MONTH_NAMES[period.month - 1], "year": period.year} if granularity == "month" else {}
+        points.append({
+            **labels,
+            "period": period.isoformat(),
+            "revenue": round(point["total"], 2),
+            "payments": point["count"],
+            "by_type": {revenue_type: round(amount, 2) for revenue_type, amount in point["by_category"].items()}
+        })
+    return points
 
 
-def get_item_by_id(data_list, item_id):
-    """Get an item by ID from a list"""
-    for item in data_list:
-        if item["id"] == item_id:
-            return item.copy()
-    return None
+def get_item_by_id(store, item_id):
+    """Get an item by ID from a store"""
+    return store.get(item_id)
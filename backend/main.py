@@ -1,20 +1,65 @@
 """
 CRM Backend API with AI-Powered Growth Agent
 FastAPI application for managing customers, leads, deals, tasks, and analytics
-Using local fake data (no database required)
+Uses local fake data unless DATABASE_URL points at a database
 """
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from routers import customers_router, leads_router, deals_router, tasks_router, analytics_router
+from agent import GrowthAgent
+from database import Base, engine, dispose_async_engines
+from repository import BACKEND
+from routers import customers_router, leads_router, deals_router, tasks_router, revenue_router, analytics_router
+from store import Persistence
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler - runs on startup and shutdown"""
-    print("✅ CRM API started with fake data")
+    persistence = None
+    if BACKEND == "sql":
+        Base.metadata.create_all(bind=engine)
+        print("✅ CRM API started with the SQL database")
+    else:
+        dataset_dir = os.getenv("CRM_DATASET_DIR")
+        if dataset_dir:
+            from dataset import load_into_stores
+            from fake_data import TABLES
+            loaded = load_into_stores(dataset_dir, TABLES)
+            print(f"📦 Loaded dataset from {dataset_dir} ({sum(loaded.values()):,} records)")
+        data_dir = os.getenv("CRM_DATA_DIR")
+        if data_dir:
+            from fake_data import TABLES
+            persistence = Persistence(
+                data_dir,
+                TABLES,
+                sync_every=int(os.getenv("CRM_JOURNAL_SYNC_EVERY", "256")),
+                snapshot_every=int(os.getenv("CRM_SNAPSHOT_EVERY", "100000"))
+            )
+            stats = persistence.open()
+            print(f"💾 Restored data from {data_dir} ({stats['replayed']} journal entries replayed in {stats['seconds']}s)")
+            if stats["skipped"]:
+                print(f"⚠️  Skipped {stats['skipped']} invalid records while restoring")
+        print("✅ CRM API started with fake data")
+
+    # One agent and LLM client for every AI request, so none pays for client setup
+    try:
+        app.state.growth_agent = GrowthAgent()
+    except ValueError as e:
+        app.state.growth_agent = None
+        app.state.growth_agent_error = str(e)
+        print(f"⚠️  AI agent disabled: {e}")
+    
     yield
+    
+    if app.state.growth_agent is not None:
+        await app.state.growth_agent.aclose()
+    if persistence is not None:
+        persistence.close()
+    if BACKEND == "sql":
+        await dispose_async_engines()
     print("👋 Shutting down CRM API")
 
 
@@ -28,6 +73,7 @@ app = FastAPI(
     - **Leads**: Track and convert leads through the sales funnel
     - **Deals**: Manage sales pipeline and deal stages
     - **Tasks**: Organize and prioritize team activities
+    - **Revenue**: Record payments behind the revenue charts
     - **Analytics**: Get insights and AI-powered growth recommendations
     
     ## AI Agent
@@ -48,6 +94,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -55,6 +102,7 @@ app.include_router(customers_router, prefix="/api")
 app.include_router(leads_router, prefix="/api")
 app.include_router(deals_router, prefix="/api")
 app.include_router(tasks_router, prefix="/api")
+app.include_router(revenue_router, prefix="/api")
 app.include_router(analytics_router, prefix="/api")
 
 
@@ -71,6 +119,7 @@ def root():
             "leads": "/api/leads",
             "deals": "/api/deals",
             "tasks": "/api/tasks",
+            "revenue": "/api/revenue",
             "analytics": "/api/analytics"
         }
     }
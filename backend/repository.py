@@ -0,0 +1,104 @@
+"""
+Data access layer used by the routers
+Reads and writes the SQL database when DATABASE_URL is set, otherwise the
+in-memory fake data. Both backends expose the same coroutine API.
+"""
+import os
+from functools import wraps
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BACKEND = "sql" if os.getenv("DATABASE_URL") else "memory"
+
+if BACKEND == "sql":
+    from database.repository import (
+        CUSTOMERS, LEADS, DEALS, TASKS, REVENUE, DEAL_STAGES,
+        get_customers_filtered, get_leads_filtered, get_deals_filtered, get_tasks_filtered,
+        get_lead_source_counts, get_customer_industry_totals, get_pipeline_summary,
+        get_task_summary, get_revenue_chart, get_analytics_overview, get_customers_360, get_item_by_id
+    )
+else:
+    from fastapi.concurrency import run_in_threadpool
+
+    import fake_data
+    from store.text_index import GRAM_SIZE
+
+    class AsyncStore:
+        """Coroutine view of an in-memory EntityStore
+
+        Reads never wait on I/O, so they run inline on the event loop. Writes
+        do too, unless the store is journaled (CRM_DATA_DIR): they then
+        write to the journal file, so they run in the threadpool.
+        Fields named as in the SQL schema are renamed to the store's fields.
+        """
+
+        def __init__(self, store, renames=None):
+            self.store = store
+            self.name = store.name
+            self.renames = renames or {}
+
+        def _rename(self, data):
+            if not self.renames:
+                return data
+            return {self.renames.get(field, field): value for field, value in data.items()}
+
+        async def _write(self, function, *args):
+            if self.store.journaled:
+                return await run_in_threadpool(function, *args)
+            return function(*args)
+
+        async def get(self, item_id):
+            return self.store.get(item_id)
+
+        async def insert(self, data):
+            return await self._write(self.store.insert, self._rename(data))
+
+        async def update(self, item_id, changes):
+            return await self._write(self.store.update, item_id, self._rename(changes))
+
+        async def delete(self, item_id):
+            return await self._write(self.store.delete, item_id)
+
+        async def bulk(self, creates=(), updates=(), deletes=()):
+            return await self._write(
+                self.store.bulk,
+                [self._rename(data) for data in creates],
+                [(item_id, self._rename(changes)) for item_id, changes in updates],
+                deletes
+            )
+
+    def _coroutine(function):
+        @wraps(function)
+        async def call(*args, **kwargs):
+            return function(*args, **kwargs)
+        return call
+
+    CUSTOMERS = AsyncStore(fake_data.CUSTOMERS)
+    LEADS = AsyncStore(fake_data.LEADS)
+    DEALS = AsyncStore(fake_data.DEALS, fake_data.DEAL_FIELD_RENAMES)
+    TASKS = AsyncStore(fake_data.TASKS)
+    REVENUE = AsyncStore(fake_data.REVENUE)
+    DEAL_STAGES = fake_data.DEAL_STAGES
+
+    async def get_customers_filtered(status=None, industry=None, search=None, skip=0, limit=100, cursor=None):
+        """Get filtered customers; searches shorter than a trigram check every customer, so they run in the threadpool"""
+        args = (status, industry, search, skip, limit, cursor)
+        if search and len(search) < GRAM_SIZE:
+            return await run_in_threadpool(fake_data.get_customers_filtered, *args)
+        return fake_data.get_customers_filtered(*args)
+
+    get_leads_filtered = _coroutine(fake_data.get_leads_filtered)
+    get_deals_filtered = _coroutine(fake_data.get_deals_filtered)
+    get_tasks_filtered = _coroutine(fake_data.get_tasks_filtered)
+    get_lead_source_counts = _coroutine(fake_data.get_lead_source_counts)
+    get_customer_industry_totals = _coroutine(fake_data.get_customer_industry_totals)
+    get_pipeline_summary = _coroutine(fake_data.get_pipeline_summary)
+    get_task_summary = _coroutine(fake_data.get_task_summary)
+    get_revenue_chart = _coroutine(fake_data.get_revenue_chart)
+    get_analytics_overview = _coroutine(fake_data.get_analytics_overview)
+    get_customers_360 = _coroutine(fake_data.get_customers_360)
+
+    async def get_item_by_id(table, item_id):
+        """Get an item by ID from a table"""
+        return await table.get(item_id)
@@ -2,4 +2,5 @@ from .customers import router as customers_router
 from .leads import router as leads_router
 from .deals import router as deals_router
 from .tasks import router as tasks_router
+from .revenue import router as revenue_router
 from .analytics import router as analytics_router
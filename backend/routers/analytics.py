@@ -1,73 +1,215 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime
 from typing import Optional
-from fake_data import (
-    ANALYTICS_DATA, REVENUE_CHART, LEAD_SOURCES, CUSTOMER_INDUSTRIES
+from repository import (
+    get_analytics_overview, get_lead_source_counts, get_customer_industry_totals,
+    get_revenue_chart as build_revenue_chart
 )
 from schemas import GrowthPlanRequest
-from agent import GrowthAgent
+from agent import GrowthAgent, PlanCache, SingleFlight, plan_key
+from agent.plan_parser import SECTION_FIELDS
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
+# Generated plans by timeframe, focus area and analytics data fingerprint
+plan_cache = PlanCache.from_env()
+# Plans being generated, shared by identical concurrent requests
+plan_flights = SingleFlight()
 
-def get_analytics_data() -> dict:
-    """Return pre-calculated analytics data"""
-    return ANALYTICS_DATA.copy()
+
+def get_growth_agent(request: Request) -> GrowthAgent:
+    """Get the agent shared by all requests, created by the app lifespan"""
+    agent = getattr(request.app.state, "growth_agent", None)
+    if agent is None:
+        detail = getattr(request.app.state, "growth_agent_error", "The AI agent is not available")
+        raise HTTPException(status_code=400, detail=detail)
+    return agent
+
+
+def sse(event: str, data) -> str:
+    """Format one server-sent event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def event_stream(events) -> StreamingResponse:
+    """Send server-sent events as they are produced, past any proxy buffering"""
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def get_analytics_data() -> dict:
+    """Return analytics data computed from the live CRM tables"""
+    return await get_analytics_overview()
 
 
 @router.get("/overview")
-def get_overview():
+async def get_overview():
     """Get analytics overview dashboard data"""
-    return get_analytics_data()
+    return await get_analytics_data()
 
 
 @router.get("/revenue-chart")
-def get_revenue_chart():
-    """Get revenue data for charts (last 12 months)"""
-    return REVENUE_CHART
+async def get_revenue_chart(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = "month"
+):
+    """Get revenue per day, week or month for charts, by revenue type (default: the last 12 months)"""
+    try:
+        return await build_revenue_chart(start, end, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/lead-sources")
-def get_lead_sources():
+async def get_lead_sources():
     """Get lead distribution by source"""
-    return LEAD_SOURCES
+    return await get_lead_source_counts()
 
 
 @router.get("/customer-industries")
-def get_customer_industries():
+async def get_customer_industries():
     """Get customer distribution by industry"""
-    return CUSTOMER_INDUSTRIES
+    return await get_customer_industry_totals()
 
 
 @router.post("/growth-plan")
-def generate_growth_plan(request: GrowthPlanRequest):
-    """Generate AI-powered growth plan"""
-    analytics_data = get_analytics_data()
-    
-    try:
-        agent = GrowthAgent()
-        plan = agent.generate_growth_plan(
+async def generate_growth_plan(
+    request: GrowthPlanRequest,
+    response: Response,
+    agent: GrowthAgent = Depends(get_growth_agent)
+):
+    """Generate AI-powered growth plan
+
+    Plans are cached per timeframe, focus area and analytics data, so the
+    agent only runs when one of them changed or the cached plan expired,
+    and identical requests arriving while a plan is generated wait for that
+    plan instead of starting their own. The X-Cache response header is
+    "hit", "shared" or "miss".
+    """
+    analytics_data = await get_analytics_data()
+    key = plan_key(request.timeframe, request.focus_area, analytics_data)
+    plan = plan_cache.get(key)
+    if plan is not None:
+        response.headers["X-Cache"] = "hit"
+        return plan
+
+    async def generate() -> dict:
+        plan = await agent.agenerate_growth_plan(
             timeframe=request.timeframe,
             analytics_data=analytics_data,
             focus_area=request.focus_area
         )
+        if "error" not in plan:
+            plan_cache.put(key, plan)
         return plan
+
+    shared = key in plan_flights
+    if shared:
+        plan_cache.share()
+    try:
+        plan = await plan_flights.run(key, generate)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The AI agent did not answer in time")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating plan: {str(e)}")
+    response.headers["X-Cache"] = "shared" if shared else "miss"
+    return plan
+
+
+@router.post("/growth-plan/stream")
+async def stream_growth_plan(request: GrowthPlanRequest, agent: GrowthAgent = Depends(get_growth_agent)):
+    """Stream an AI-powered growth plan as server-sent events
+
+    "token" events carry the raw text as it is generated, a "section" event
+    ({"name", "content"}) follows as each of summary, insights, actions and
+    risks completes, and a final "plan" event carries the whole plan. A
+    section that fell back to default content is sent again before the plan,
+    so the last event for each section matches the plan. A cached plan is
+    sent as its sections and plan right away. Failures end the stream with
+    an "error" event.
+    """
+    analytics_data = await get_analytics_data()
+    key = plan_key(request.timeframe, request.focus_area, analytics_data)
+    cached = plan_cache.get(key)
+
+    async def events():
+        if cached is not None:
+            for name, field in SECTION_FIELDS.items():
+                yield sse("section", {"name": name, "content": cached[field]})
+            yield sse("plan", cached)
+            return
+        try:
+            async for kind, value in agent.astream_growth_plan(
+                timeframe=request.timeframe,
+                analytics_data=analytics_data,
+                focus_area=request.focus_area
+            ):
+                if kind == "plan" and "error" not in value:
+                    plan_cache.put(key, value)
+                yield sse(kind, value)
+        except asyncio.TimeoutError:
+            yield sse("error", {"detail": "The AI agent did not answer in time"})
+        except Exception as e:
+            yield sse("error", {"detail": f"Error generating plan: {str(e)}"})
+
+    response = event_stream(events())
+    response.headers["X-Cache"] = "hit" if cached is not None else "miss"
+    return response
+
+
+@router.get("/growth-plan/cache")
+async def get_growth_plan_cache_stats():
+    """Get growth plan cache size and hit/miss counters, and how many plan requests were coalesced"""
+    return {**plan_cache.stats(), **plan_flights.stats()}
 
 
 @router.post("/ask")
-def ask_agent(question: str):
+async def ask_agent(question: str, agent: GrowthAgent = Depends(get_growth_agent)):
     """Ask the AI agent a question about the CRM data"""
-    analytics_data = get_analytics_data()
+    analytics_data = await get_analytics_data()
     
     try:
-        agent = GrowthAgent()
-        response = agent.ask_question(question, analytics_data)
+        response = await agent.aask_question(question, analytics_data)
         return {"question": question, "answer": response}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="The AI agent did not answer in time")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing question: {str(e)}")
+
+
+@router.post("/ask/stream")
+async def stream_answer(question: str, agent: GrowthAgent = Depends(get_growth_agent)):
+    """Stream the AI agent's answer as server-sent events
+
+    "token" events carry the text as it is generated, then a "done" event
+    carries the question and the whole answer. Failures end the stream with
+    an "error" event.
+    """
+    analytics_data = await get_analytics_data()
+
+    async def events():
+        chunks = []
+        try:
+            async for text in agent.astream_answer(question, analytics_data):
+                chunks.append(text)
+                yield sse("token", text)
+        except asyncio.TimeoutError:
+            yield sse("error", {"detail": "The AI agent did not answer in time"})
+            return
+        except Exception as e:
+            yield sse("error", {"detail": f"Error processing question: {str(e)}"})
+            return
+        yield sse("done", {"question": question, "answer": "".join(chunks)})
+
+    return event_stream(events())
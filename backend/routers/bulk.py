@@ -0,0 +1,53 @@
+"""
+Shared helpers for the bulk create/update/delete endpoints
+"""
+from fastapi import HTTPException
+
+MAX_BULK_OPERATIONS = 1000
+
+
+def bulk_operations(request) -> tuple[list, list, list]:
+    """Turn a validated bulk request into store operations, rejecting oversized batches"""
+    if len(request.create) + len(request.update) + len(request.delete) > MAX_BULK_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_OPERATIONS} operations per request")
+    creates = [item.model_dump() for item in request.create]
+    updates = [(item.id, item.model_dump(exclude_unset=True, exclude={"id"})) for item in request.update]
+    return creates, updates, request.delete
+
+
+def _error(error: Exception) -> dict:
+    # Database errors wrap the driver's message in the statement and parameters
+    return {"status": "error", "detail": str(getattr(error, "orig", None) or error)}
+
+
+def bulk_response(results: dict, update_ids: list, delete_ids: list, entity: str) -> dict:
+    """Format per-item bulk results, in request order, with totals per outcome"""
+    create = [
+        _error(row) if isinstance(row, Exception) else {"status": "created", "record": row}
+        for row in results["create"]
+    ]
+    update = []
+    for item_id, row in zip(update_ids, results["update"]):
+        if isinstance(row, Exception):
+            update.append({"id": item_id, **_error(row)})
+        elif row is None:
+            update.append({"id": item_id, "status": "not_found", "detail": f"{entity} not found"})
+        else:
+            update.append({"id": item_id, "status": "updated", "record": row})
+    delete = []
+    for item_id, deleted in zip(delete_ids, results["delete"]):
+        if isinstance(deleted, Exception):
+            delete.append({"id": item_id, **_error(deleted)})
+        elif deleted:
+            delete.append({"id": item_id, "status": "deleted"})
+        else:
+            delete.append({"id": item_id, "status": "not_found", "detail": f"{entity} not found"})
+
+    outcomes = [item["status"] for item in (*create, *update, *delete)]
+    return {
+        "created": outcomes.count("created"),
+        "updated": outcomes.count("updated"),
+        "deleted": outcomes.count("deleted"),
+        "failed": len(outcomes) - outcomes.count("created") - outcomes.count("updated") - outcomes.count("deleted"),
+        "results": {"create": create, "update": update, "delete": delete}
+    }
@@ -1,54 +1,86 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 from typing import List, Optional
-from fake_data import CUSTOMERS, get_customers_filtered, get_item_by_id
+from repository import CUSTOMERS, get_customers_filtered, get_customers_360, get_item_by_id
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 
+MAX_360_BATCH = 100
+
 
 @router.get("/")
-def get_customers(
+async def get_customers(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     industry: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
 ):
-    """Get all customers with optional filtering"""
-    return get_customers_filtered(status, industry, search, skip, limit)
+    """Get all customers with optional filtering
+
+    When a page is full the X-Next-Cursor response header holds the cursor
+    for the next one; pass it back as cursor to continue after this page.
+    """
+    try:
+        page = await get_customers_filtered(status, industry, search, skip, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
+
+
+@router.get("/batch/360")
+async def get_customers_360_batch(ids: List[int] = Query(...)):
+    """Get the 360 view of many customers (?ids=1&ids=2), in the order asked; unknown IDs are left out"""
+    if len(ids) > MAX_360_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_360_BATCH} ids per request")
+    return await get_customers_360(ids)
 
 
 @router.get("/{customer_id}")
-def get_customer(customer_id: int):
+async def get_customer(customer_id: int):
     """Get a specific customer by ID"""
-    customer = get_item_by_id(CUSTOMERS, customer_id)
+    customer = await get_item_by_id(CUSTOMERS, customer_id)
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
 
 
+@router.get("/{customer_id}/360")
+async def get_customer_360(customer_id: int):
+    """Get a customer with their deals, open tasks, recent interactions and revenue in one call"""
+    views = await get_customers_360([customer_id])
+    if not views:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return views[0]
+
+
 @router.post("/")
-def create_customer(customer: dict):
-    """Create a new customer (mock)"""
-    new_id = max(c["id"] for c in CUSTOMERS) + 1
-    customer["id"] = new_id
-    return customer
+async def create_customer(customer: dict):
+    """Create a new customer"""
+    try:
+        return await CUSTOMERS.insert(customer)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{customer_id}")
-def update_customer(customer_id: int, customer: dict):
-    """Update an existing customer (mock)"""
-    existing = get_item_by_id(CUSTOMERS, customer_id)
+async def update_customer(customer_id: int, customer: dict):
+    """Update an existing customer"""
+    try:
+        existing = await CUSTOMERS.update(customer_id, customer)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not existing:
         raise HTTPException(status_code=404, detail="Customer not found")
-    existing.update(customer)
-    existing["id"] = customer_id
     return existing
 
 
 @router.delete("/{customer_id}")
-def delete_customer(customer_id: int):
-    """Delete a customer (mock)"""
-    existing = get_item_by_id(CUSTOMERS, customer_id)
-    if not existing:
+async def delete_customer(customer_id: int):
+    """Delete a customer"""
+    if not await CUSTOMERS.delete(customer_id):
         raise HTTPException(status_code=404, detail="Customer not found")
     return {"message": "Customer deleted successfully"}
@@ -1,80 +1,126 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Optional
-from fake_data import DEALS, PIPELINE_SUMMARY, get_deals_filtered, get_item_by_id
+from repository import DEALS, get_deals_filtered, get_item_by_id, get_pipeline_summary as build_pipeline_summary
+from schemas import DealBulkRequest, DealStageChange
+from .bulk import MAX_BULK_OPERATIONS, bulk_operations, bulk_response
 
 router = APIRouter(prefix="/deals", tags=["deals"])
 
+STAGE_PROBABILITY = {
+    "prospecting": 10, "qualification": 30, "proposal": 50,
+    "negotiation": 70, "closed_won": 100, "closed_lost": 0
+}
+
 
 @router.get("/")
-def get_deals(
+async def get_deals(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     stage: Optional[str] = None,
     customer_id: Optional[int] = None,
-    min_value: Optional[float] = None
+    min_value: Optional[float] = None,
+    cursor: Optional[str] = None
 ):
-    """Get all deals with optional filtering"""
-    return get_deals_filtered(stage, customer_id, min_value, skip, limit)
+    """Get all deals with optional filtering
+
+    When a page is full the X-Next-Cursor response header holds the cursor
+    for the next one; pass it back as cursor to continue after this page.
+    """
+    try:
+        page = await get_deals_filtered(stage, customer_id, min_value, skip, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
 
 
 @router.get("/pipeline")
-def get_pipeline_summary():
+async def get_pipeline_summary():
     """Get deal pipeline summary by stage"""
-    return PIPELINE_SUMMARY
+    return await build_pipeline_summary()
+
+
+@router.post("/bulk")
+async def bulk_deals(request: DealBulkRequest):
+    """Create, update and delete many deals in one transaction, with a result per item"""
+    creates, updates, deletes = bulk_operations(request)
+    results = await DEALS.bulk(creates, updates, deletes)
+    return bulk_response(results, [item_id for item_id, _ in updates], deletes, "Deal")
+
+
+@router.put("/bulk/stage")
+async def bulk_update_deal_stage(changes: List[DealStageChange]):
+    """Move many deals to new stages in one transaction, setting each stage's probability
+
+    Deals moving to the same stage share a single update.
+    """
+    if len(changes) > MAX_BULK_OPERATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_OPERATIONS} operations per request")
+    updates, invalid = [], {}
+    for position, change in enumerate(changes):
+        if change.stage in STAGE_PROBABILITY:
+            updates.append((change.id, {"stage": change.stage, "probability": STAGE_PROBABILITY[change.stage]}))
+        else:
+            invalid[position] = ValueError(f"Invalid stage. Must be one of: {list(STAGE_PROBABILITY)}")
+    results = await DEALS.bulk(updates=updates)
+    applied = iter(results["update"])
+    results["update"] = [invalid.get(position) or next(applied) for position in range(len(changes))]
+    return bulk_response(results, [change.id for change in changes], [], "Deal")
 
 
 @router.get("/{deal_id}")
-def get_deal(deal_id: int):
+async def get_deal(deal_id: int):
     """Get a specific deal by ID"""
-    deal = get_item_by_id(DEALS, deal_id)
+    deal = await get_item_by_id(DEALS, deal_id)
     if not deal:
         raise HTTPException(status_code=404, detail="Deal not found")
     return deal
 
 
 @router.post("/")
-def create_deal(deal: dict):
-    """Create a new deal (mock)"""
-    new_id = max(d["id"] for d in DEALS) + 1
-    deal["id"] = new_id
-    return deal
+async def create_deal(deal: dict):
+    """Create a new deal"""
+    try:
+        return await DEALS.insert(deal)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{deal_id}")
-def update_deal(deal_id: int, deal: dict):
-    """Update an existing deal (mock)"""
-    existing = get_item_by_id(DEALS, deal_id)
+async def update_deal(deal_id: int, deal: dict):
+    """Update an existing deal"""
+    try:
+        existing = await DEALS.update(deal_id, deal)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not existing:
         raise HTTPException(status_code=404, detail="Deal not found")
-    existing.update(deal)
-    existing["id"] = deal_id
     return existing
 
 
 @router.delete("/{deal_id}")
-def delete_deal(deal_id: int):
-    """Delete a deal (mock)"""
-    existing = get_item_by_id(DEALS, deal_id)
-    if not existing:
+async def delete_deal(deal_id: int):
+    """Delete a deal"""
+    if not await DEALS.delete(deal_id):
         raise HTTPException(status_code=404, detail="Deal not found")
     return {"message": "Deal deleted successfully"}
 
 
 @router.put("/{deal_id}/stage")
-def update_deal_stage(deal_id: int, stage: str):
-    """Update deal stage (mock)"""
-    existing = get_item_by_id(DEALS, deal_id)
-    if not existing:
+async def update_deal_stage(deal_id: int, stage: str):
+    """Update deal stage"""
+    if await get_item_by_id(DEALS, deal_id) is None:
         raise HTTPException(status_code=404, detail="Deal not found")
     
-    valid_stages = ["prospecting", "qualification", "proposal", "negotiation", "closed_won", "closed_lost"]
-    if stage not in valid_stages:
-        raise HTTPException(status_code=400, detail=f"Invalid stage. Must be one of: {valid_stages}")
+    if stage not in STAGE_PROBABILITY:
+        raise HTTPException(status_code=400, detail=f"Invalid stage. Must be one of: {list(STAGE_PROBABILITY)}")
     
-    stage_probability = {
-        "prospecting": 10, "qualification": 30, "proposal": 50,
-        "negotiation": 70, "closed_won": 100, "closed_lost": 0
-    }
-    existing["stage"] = stage
-    existing["probability"] = stage_probability.get(stage, 10)
+    existing = await DEALS.update(deal_id, {
+        "stage": stage,
+        "probability": STAGE_PROBABILITY[stage]
+    })
+    if not existing:
+        raise HTTPException(status_code=404, detail="Deal not found")
     return existing
@@ -1,63 +1,86 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Optional
-from fake_data import LEADS, get_leads_filtered, get_item_by_id
+from repository import LEADS, get_leads_filtered, get_item_by_id
+from schemas import LeadBulkRequest
+from .bulk import bulk_operations, bulk_response
 
 router = APIRouter(prefix="/leads", tags=["leads"])
 
 
 @router.get("/")
-def get_leads(
+async def get_leads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     source: Optional[str] = None,
-    min_score: Optional[int] = None
+    min_score: Optional[int] = None,
+    cursor: Optional[str] = None
 ):
-    """Get all leads with optional filtering"""
-    return get_leads_filtered(status, source, min_score, skip, limit)
+    """Get all leads with optional filtering
+
+    When a page is full the X-Next-Cursor response header holds the cursor
+    for the next one; pass it back as cursor to continue after this page.
+    """
+    try:
+        page = await get_leads_filtered(status, source, min_score, skip, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
+
+
+@router.post("/bulk")
+async def bulk_leads(request: LeadBulkRequest):
+    """Create, update and delete many leads in one transaction, with a result per item"""
+    creates, updates, deletes = bulk_operations(request)
+    results = await LEADS.bulk(creates, updates, deletes)
+    return bulk_response(results, [item_id for item_id, _ in updates], deletes, "Lead")
 
 
 @router.get("/{lead_id}")
-def get_lead(lead_id: int):
+async def get_lead(lead_id: int):
     """Get a specific lead by ID"""
-    lead = get_item_by_id(LEADS, lead_id)
+    lead = await get_item_by_id(LEADS, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     return lead
 
 
 @router.post("/")
-def create_lead(lead: dict):
-    """Create a new lead (mock)"""
-    new_id = max(l["id"] for l in LEADS) + 1
-    lead["id"] = new_id
-    return lead
+async def create_lead(lead: dict):
+    """Create a new lead"""
+    try:
+        return await LEADS.insert(lead)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{lead_id}")
-def update_lead(lead_id: int, lead: dict):
-    """Update an existing lead (mock)"""
-    existing = get_item_by_id(LEADS, lead_id)
+async def update_lead(lead_id: int, lead: dict):
+    """Update an existing lead"""
+    try:
+        existing = await LEADS.update(lead_id, lead)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not existing:
         raise HTTPException(status_code=404, detail="Lead not found")
-    existing.update(lead)
-    existing["id"] = lead_id
     return existing
 
 
 @router.delete("/{lead_id}")
-def delete_lead(lead_id: int):
-    """Delete a lead (mock)"""
-    existing = get_item_by_id(LEADS, lead_id)
-    if not existing:
+async def delete_lead(lead_id: int):
+    """Delete a lead"""
+    if not await LEADS.delete(lead_id):
         raise HTTPException(status_code=404, detail="Lead not found")
     return {"message": "Lead deleted successfully"}
 
 
 @router.post("/{lead_id}/convert")
-def convert_lead(lead_id: int):
+async def convert_lead(lead_id: int):
     """Convert a lead to a customer (mock)"""
-    lead = get_item_by_id(LEADS, lead_id)
+    lead = await get_item_by_id(LEADS, lead_id)
     if not lead:
         raise HTTPException(status_code=404, detail="Lead not found")
     
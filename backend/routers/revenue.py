@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException
+from repository import REVENUE, get_item_by_id
+
+router = APIRouter(prefix="/revenue", tags=["revenue"])
+
+
+@router.get("/{revenue_id}")
+async def get_revenue(revenue_id: int):
+    """Get a specific revenue record by ID"""
+    revenue = await get_item_by_id(REVENUE, revenue_id)
+    if not revenue:
+        raise HTTPException(status_code=404, detail="Revenue record not found")
+    return revenue
+
+
+@router.post("/")
+async def create_revenue(revenue: dict):
+    """Record a payment; the revenue chart rollups pick it up immediately"""
+    try:
+        return await REVENUE.insert(revenue)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.put("/{revenue_id}")
+async def update_revenue(revenue_id: int, revenue: dict):
+    """Update an existing revenue record"""
+    try:
+        existing = await REVENUE.update(revenue_id, revenue)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not existing:
+        raise HTTPException(status_code=404, detail="Revenue record not found")
+    return existing
+
+
+@router.delete("/{revenue_id}")
+async def delete_revenue(revenue_id: int):
+    """Delete a revenue record"""
+    if not await REVENUE.delete(revenue_id):
+        raise HTTPException(status_code=404, detail="Revenue record not found")
+    return {"message": "Revenue record deleted successfully"}
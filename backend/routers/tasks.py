@@ -1,73 +1,97 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from typing import List, Optional
 from datetime import datetime
-from fake_data import TASKS, TASK_SUMMARY, get_tasks_filtered, get_item_by_id
+from repository import TASKS, get_tasks_filtered, get_item_by_id, get_task_summary as build_task_summary
+from schemas import TaskBulkRequest
+from .bulk import bulk_operations, bulk_response
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.get("/")
-def get_tasks(
+async def get_tasks(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: Optional[str] = None,
     priority: Optional[str] = None,
     assignee: Optional[str] = None,
-    overdue_only: bool = False
+    overdue_only: bool = False,
+    cursor: Optional[str] = None
 ):
-    """Get all tasks with optional filtering"""
-    return get_tasks_filtered(status, priority, assignee, overdue_only, skip, limit)
+    """Get all tasks with optional filtering
+
+    When a page is full the X-Next-Cursor response header holds the cursor
+    for the next one; pass it back as cursor to continue after this page.
+    """
+    try:
+        page = await get_tasks_filtered(status, priority, assignee, overdue_only, skip, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
 
 
 @router.get("/summary")
-def get_task_summary():
+async def get_task_summary():
     """Get task summary statistics"""
-    return TASK_SUMMARY
+    return await build_task_summary()
+
+
+@router.post("/bulk")
+async def bulk_tasks(request: TaskBulkRequest):
+    """Create, update and delete many tasks in one transaction, with a result per item"""
+    creates, updates, deletes = bulk_operations(request)
+    results = await TASKS.bulk(creates, updates, deletes)
+    return bulk_response(results, [item_id for item_id, _ in updates], deletes, "Task")
 
 
 @router.get("/{task_id}")
-def get_task(task_id: int):
+async def get_task(task_id: int):
     """Get a specific task by ID"""
-    task = get_item_by_id(TASKS, task_id)
+    task = await get_item_by_id(TASKS, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     return task
 
 
 @router.post("/")
-def create_task(task: dict):
-    """Create a new task (mock)"""
-    new_id = max(t["id"] for t in TASKS) + 1
-    task["id"] = new_id
-    return task
+async def create_task(task: dict):
+    """Create a new task"""
+    try:
+        return await TASKS.insert(task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{task_id}")
-def update_task(task_id: int, task: dict):
-    """Update an existing task (mock)"""
-    existing = get_item_by_id(TASKS, task_id)
+async def update_task(task_id: int, task: dict):
+    """Update an existing task"""
+    try:
+        existing = await TASKS.update(task_id, task)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not existing:
         raise HTTPException(status_code=404, detail="Task not found")
-    existing.update(task)
-    existing["id"] = task_id
     return existing
 
 
 @router.put("/{task_id}/complete")
-def complete_task(task_id: int):
-    """Mark a task as completed (mock)"""
-    existing = get_item_by_id(TASKS, task_id)
+async def complete_task(task_id: int):
+    """Mark a task as completed"""
+    existing = await TASKS.update(task_id, {
+        "status": "completed",
+        "completed_at": datetime.utcnow()
+    })
     if not existing:
         raise HTTPException(status_code=404, detail="Task not found")
-    existing["status"] = "completed"
-    existing["completed_at"] = datetime.utcnow().isoformat()
     return existing
 
 
 @router.delete("/{task_id}")
-def delete_task(task_id: int):
-    """Delete a task (mock)"""
-    existing = get_item_by_id(TASKS, task_id)
-    if not existing:
+async def delete_task(task_id: int):
+    """Delete a task"""
+    if not await TASKS.delete(task_id):
         raise HTTPException(status_code=404, detail="Task not found")
     return {"message": "Task deleted successfully"}
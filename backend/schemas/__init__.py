@@ -6,5 +6,7 @@ from .schemas import (
     InteractionBase, InteractionCreate, InteractionResponse,
     RevenueBase, RevenueCreate, RevenueResponse,
     CampaignBase, CampaignCreate, CampaignResponse,
+    LeadBulkUpdate, LeadBulkRequest, DealBulkUpdate, DealBulkRequest, DealStageChange,
+    TaskBulkUpdate, TaskBulkRequest,
     AnalyticsOverview, GrowthPlanRequest, GrowthPlanResponse
 )
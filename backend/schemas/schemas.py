@@ -220,6 +220,42 @@ class CampaignResponse(CampaignBase):
         from_attributes = True
 
 
+# Bulk Schemas
+class LeadBulkUpdate(LeadUpdate):
+    id: int
+
+
+class LeadBulkRequest(BaseModel):
+    create: list[LeadCreate] = []
+    update: list[LeadBulkUpdate] = []
+    delete: list[int] = []
+
+
+class DealBulkUpdate(DealUpdate):
+    id: int
+
+
+class DealBulkRequest(BaseModel):
+    create: list[DealCreate] = []
+    update: list[DealBulkUpdate] = []
+    delete: list[int] = []
+
+
+class DealStageChange(BaseModel):
+    id: int
+    stage: str
+
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
+class TaskBulkRequest(BaseModel):
+    create: list[TaskCreate] = []
+    update: list[TaskBulkUpdate] = []
+    delete: list[int] = []
+
+
 # Analytics Schemas
 class AnalyticsOverview(BaseModel):
     total_customers: int
@@ -1,11 +1,18 @@
 """
 Comprehensive Seed Data Generator for CRM
-Generates 100+ realistic fake records across all entities
+Generates realistic fake records across all entities with batched inserts,
+from the default 650 rows up to tens of millions (see --help)
 """
+import argparse
+import multiprocessing
 import random
+import time
+from collections import deque
 from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import func, insert, select
 from database.models import Customer, Lead, Deal, Task, Interaction, Revenue, MarketingCampaign
-from database.database import SessionLocal, engine, Base
+from database.database import engine, Base
 
 
 # Realistic data pools
@@ -98,25 +105,35 @@ MARKETING_CHANNELS = ["email", "social", "ppc", "content", "events", "webinar",
 ASSIGNEES = ["Alice Johnson", "Bob Smith", "Carol Davis", "David Wilson", "Emma Brown", "Frank Miller"]
 
 
+# Time the generated dates are relative to; generate_chunk pins it so seeded output is reproducible
+AS_OF: Optional[datetime] = None
+
+
+def reference_time() -> datetime:
+    """Get the time generated dates are relative to"""
+    return AS_OF or datetime.utcnow()
+
+
 def random_date(start_days_ago: int, end_days_ago: int = 0) -> datetime:
     """Generate a random date between start_days_ago and end_days_ago"""
     days = random.randint(end_days_ago, start_days_ago)
-    return datetime.utcnow() - timedelta(days=days)
+    return reference_time() - timedelta(days=days)
 
 
 def random_future_date(start_days: int = 1, end_days: int = 90) -> datetime:
     """Generate a random future date"""
     days = random.randint(start_days, end_days)
-    return datetime.utcnow() + timedelta(days=days)
+    return reference_time() + timedelta(days=days)
 
 
-def generate_email(first_name: str, last_name: str, company: str) -> str:
-    """Generate a realistic email address"""
+def generate_email(first_name: str, last_name: str, company: str, number: Optional[int] = None) -> str:
+    """Generate a realistic email address, made unique by number when given"""
     domain = company.lower().replace(" ", "").replace(".", "")[:15] + ".com"
+    suffix = "" if number is None else str(number)
     formats = [
-        f"{first_name.lower()}.{last_name.lower()}@{domain}",
-        f"{first_name[0].lower()}{last_name.lower()}@{domain}",
-        f"{first_name.lower()}@{domain}",
+        f"{first_name.lower()}.{last_name.lower()}{suffix}@{domain}",
+        f"{first_name[0].lower()}{last_name.lower()}{suffix}@{domain}",
+        f"{first_name.lower()}{suffix}@{domain}",
     ]
     return random.choice(formats)
 
@@ -126,313 +143,334 @@ def generate_phone() -> str:
     return f"+1-{random.randint(200,999)}-{random.randint(100,999)}-{random.randint(1000,9999)}"
 
 
-def seed_customers(db, count: int = 50) -> list:
-    """Generate customer records"""
-    customers = []
-    for _ in range(count):
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-        company = random.choice(COMPANIES)
-        
-        # Distribution: 60% active, 20% prospect, 15% inactive, 5% churned
-        status_weights = [("active", 60), ("prospect", 20), ("inactive", 15), ("churned", 5)]
-        status = random.choices([s[0] for s in status_weights], [s[1] for s in status_weights])[0]
-        
-        customer = Customer(
-            name=f"{first_name} {last_name}",
-            email=generate_email(first_name, last_name, company),
-            phone=generate_phone(),
-            company=company,
-            industry=random.choice(INDUSTRIES),
-            status=status,
-            lifetime_value=round(random.uniform(1000, 500000), 2) if status == "active" else round(random.uniform(0, 50000), 2),
-            acquisition_source=random.choice(ACQUISITION_SOURCES),
-            notes=f"Customer acquired through {random.choice(ACQUISITION_SOURCES).lower()}. Primary contact for {company}.",
-            created_at=random_date(365, 30),
-            updated_at=random_date(30, 0)
-        )
-        db.add(customer)
-        customers.append(customer)
-    
-    db.commit()
-    for c in customers:
-        db.refresh(c)
-    return customers
-
-
-def seed_leads(db, count: int = 80) -> list:
-    """Generate lead records with realistic distribution"""
-    leads = []
-    
-    # Status distribution for realistic pipeline
-    status_distribution = [
-        ("new", 25), ("contacted", 20), ("qualified", 20),
-        ("proposal", 15), ("negotiation", 10), ("won", 5), ("lost", 5)
-    ]
-    
-    for _ in range(count):
-        first_name = random.choice(FIRST_NAMES)
-        last_name = random.choice(LAST_NAMES)
-        company = random.choice(COMPANIES)
-        status = random.choices([s[0] for s in status_distribution], [s[1] for s in status_distribution])[0]
-        
-        # Score correlates with status
-        score_ranges = {
-            "new": (10, 30), "contacted": (25, 50), "qualified": (45, 70),
-            "proposal": (60, 80), "negotiation": (75, 90), "won": (85, 100), "lost": (20, 50)
-        }
-        score_range = score_ranges[status]
-        
-        lead = Lead(
-            name=f"{first_name} {last_name}",
-            email=generate_email(first_name, last_name, company),
-            phone=generate_phone(),
-            company=company,
-            job_title=random.choice(JOB_TITLES),
-            source=random.choice(LEAD_SOURCES),
-            status=status,
-            score=random.randint(score_range[0], score_range[1]),
-            estimated_value=round(random.uniform(5000, 250000), 2),
-            notes=f"Lead from {random.choice(LEAD_SOURCES)}. Interested in our {random.choice(['enterprise', 'professional', 'starter'])} plan.",
-            created_at=random_date(180, 7),
-            updated_at=random_date(7, 0),
-            converted_at=random_date(30, 0) if status == "won" else None
-        )
-        db.add(lead)
-        leads.append(lead)
-    
-    db.commit()
-    return leads
-
-
-def seed_deals(db, customers: list, count: int = 60) -> list:
-    """Generate deal records with pipeline distribution"""
-    deals = []
-    
-    stage_distribution = [
-        ("prospecting", 20), ("qualification", 20), ("proposal", 25),
-        ("negotiation", 15), ("closed_won", 12), ("closed_lost", 8)
-    ]
-    
-    for _ in range(count):
-        stage = random.choices([s[0] for s in stage_distribution], [s[1] for s in stage_distribution])[0]
-        
-        # Probability correlates with stage
-        prob_ranges = {
-            "prospecting": (5, 20), "qualification": (20, 40), "proposal": (40, 60),
-            "negotiation": (60, 80), "closed_won": (100, 100), "closed_lost": (0, 0)
-        }
-        prob_range = prob_ranges[stage]
-        
-        # Value tends to be higher for later stages (survivors)
-        value_multiplier = {"prospecting": 1, "qualification": 1.2, "proposal": 1.5, "negotiation": 1.8, "closed_won": 2, "closed_lost": 0.8}
-        base_value = random.uniform(10000, 200000)
-        
-        deal = Deal(
-            title=f"{random.choice(DEAL_TITLES)} - {random.choice(COMPANIES)}",
-            description=f"Deal for {random.choice(['annual subscription', 'multi-year contract', 'implementation project', 'consulting engagement'])}",
-            customer_id=random.choice(customers).id if customers and random.random() > 0.2 else None,
-            stage=stage,
-            value=round(base_value * value_multiplier[stage], 2),
-            probability=random.randint(prob_range[0], prob_range[1]),
-            expected_close_date=random_future_date(7, 120) if stage not in ["closed_won", "closed_lost"] else None,
-            actual_close_date=random_date(60, 0) if stage in ["closed_won", "closed_lost"] else None,
-            created_at=random_date(120, 14),
-            updated_at=random_date(14, 0)
-        )
-        db.add(deal)
-        deals.append(deal)
-    
-    db.commit()
-    return deals
-
-
-def seed_tasks(db, customers: list, count: int = 100) -> list:
-    """Generate task records"""
-    tasks = []
-    
-    priority_dist = [("low", 15), ("medium", 50), ("high", 25), ("urgent", 10)]
-    status_dist = [("todo", 40), ("in_progress", 30), ("completed", 25), ("cancelled", 5)]
-    
-    for _ in range(count):
-        status = random.choices([s[0] for s in status_dist], [s[1] for s in status_dist])[0]
-        priority = random.choices([p[0] for p in priority_dist], [p[1] for p in priority_dist])[0]
-        
-        task = Task(
-            title=random.choice(TASK_TITLES),
-            description=f"Task related to customer engagement and follow-up activities.",
-            customer_id=random.choice(customers).id if customers and random.random() > 0.3 else None,
-            priority=priority,
-            status=status,
-            due_date=random_future_date(-10, 30),  # Some overdue tasks
-            completed_at=random_date(30, 0) if status == "completed" else None,
-            assignee=random.choice(ASSIGNEES),
-            created_at=random_date(60, 7),
-            updated_at=random_date(7, 0)
-        )
-        db.add(task)
-        tasks.append(task)
-    
-    db.commit()
-    return tasks
-
-
-def seed_interactions(db, customers: list, count: int = 200) -> list:
-    """Generate interaction records"""
-    interactions = []
-    
-    interaction_types = ["email", "call", "meeting", "demo", "support"]
-    outcomes = ["positive", "neutral", "negative"]
-    outcome_weights = [50, 35, 15]
-    
-    for _ in range(count):
-        int_type = random.choice(interaction_types)
-        duration = {
-            "email": random.randint(5, 15),
-            "call": random.randint(10, 45),
-            "meeting": random.randint(30, 90),
-            "demo": random.randint(30, 60),
-            "support": random.randint(15, 60)
-        }
-        
-        interaction = Interaction(
-            customer_id=random.choice(customers).id if customers else 1,
-            type=int_type,
-            subject=random.choice(INTERACTION_SUBJECTS),
-            notes=f"{int_type.capitalize()} interaction regarding account status and opportunities.",
-            outcome=random.choices(outcomes, outcome_weights)[0],
-            duration_minutes=duration[int_type],
-            created_at=random_date(180, 0)
-        )
-        db.add(interaction)
-        interactions.append(interaction)
-    
-    db.commit()
-    return interactions
-
-
-def seed_revenue(db, customers: list, count: int = 150) -> list:
-    """Generate revenue records over past year"""
-    revenues = []
-    
-    revenue_types = ["subscription", "one_time", "upsell", "renewal"]
-    type_weights = [50, 20, 15, 15]
-    
-    for _ in range(count):
-        rev_type = random.choices(revenue_types, type_weights)[0]
-        
-        # Amount varies by type
-        amount_ranges = {
-            "subscription": (500, 15000),
-            "one_time": (1000, 50000),
-            "upsell": (500, 10000),
-            "renewal": (2000, 20000)
-        }
-        amount_range = amount_ranges[rev_type]
-        
-        revenue = Revenue(
-            customer_id=random.choice(customers).id if customers else 1,
-            amount=round(random.uniform(amount_range[0], amount_range[1]), 2),
-            type=rev_type,
-            description=f"{rev_type.capitalize()} revenue from customer account",
-            date=random_date(365, 0),
-            created_at=random_date(365, 0)
-        )
-        db.add(revenue)
-        revenues.append(revenue)
-    
-    db.commit()
-    return revenues
-
-
-def seed_campaigns(db, count: int = 15) -> list:
-    """Generate marketing campaign records"""
-    campaigns = []
-    
-    statuses = ["draft", "active", "paused", "completed"]
-    status_weights = [10, 40, 15, 35]
-    
-    for i in range(count):
-        status = random.choices(statuses, status_weights)[0]
-        budget = round(random.uniform(5000, 100000), 2)
-        spent_ratio = {"draft": 0, "active": random.uniform(0.3, 0.7), "paused": random.uniform(0.4, 0.6), "completed": random.uniform(0.85, 1.0)}
-        
-        leads_gen = random.randint(10, 500) if status != "draft" else 0
-        conv_rate = random.uniform(0.05, 0.25)
-        
-        campaign = MarketingCampaign(
-            name=CAMPAIGN_NAMES[i] if i < len(CAMPAIGN_NAMES) else f"Campaign {i+1}",
-            channel=random.choice(MARKETING_CHANNELS),
-            status=status,
-            budget=budget,
-            spent=round(budget * spent_ratio[status], 2),
-            leads_generated=leads_gen,
-            conversions=int(leads_gen * conv_rate),
-            start_date=random_date(180, 30) if status != "draft" else random_future_date(1, 30),
-            end_date=random_date(30, 0) if status == "completed" else random_future_date(30, 90),
-            created_at=random_date(200, 30)
-        )
-        db.add(campaign)
-        campaigns.append(campaign)
-    
-    db.commit()
-    return campaigns
-
-
-def seed_all_data():
-    """Main function to seed all data"""
+def weighted(distribution: list) -> tuple:
+    """Split [(value, weight), ...] into values and cumulative weights for random.choices"""
+    values, cumulative, total = [], [], 0
+    for value, weight in distribution:
+        total += weight
+        values.append(value)
+        cumulative.append(total)
+    return values, cumulative
+
+
+def pick(choices: tuple):
+    """Pick one value from a weighted() distribution"""
+    return random.choices(choices[0], cum_weights=choices[1])[0]
+
+
+# Status distribution: 60% active, 20% prospect, 15% inactive, 5% churned
+CUSTOMER_STATUSES = weighted([("active", 60), ("prospect", 20), ("inactive", 15), ("churned", 5)])
+
+# Status distribution for a realistic pipeline, with scores correlated to status
+LEAD_STATUSES = weighted([
+    ("new", 25), ("contacted", 20), ("qualified", 20),
+    ("proposal", 15), ("negotiation", 10), ("won", 5), ("lost", 5)
+])
+LEAD_SCORE_RANGES = {
+    "new": (10, 30), "contacted": (25, 50), "qualified": (45, 70),
+    "proposal": (60, 80), "negotiation": (75, 90), "won": (85, 100), "lost": (20, 50)
+}
+
+# Probability correlates with stage; value tends to be higher for later stages (survivors)
+DEAL_STAGES = weighted([
+    ("prospecting", 20), ("qualification", 20), ("proposal", 25),
+    ("negotiation", 15), ("closed_won", 12), ("closed_lost", 8)
+])
+DEAL_PROBABILITY_RANGES = {
+    "prospecting": (5, 20), "qualification": (20, 40), "proposal": (40, 60),
+    "negotiation": (60, 80), "closed_won": (100, 100), "closed_lost": (0, 0)
+}
+DEAL_VALUE_MULTIPLIERS = {"prospecting": 1, "qualification": 1.2, "proposal": 1.5, "negotiation": 1.8, "closed_won": 2, "closed_lost": 0.8}
+
+TASK_PRIORITIES = weighted([("low", 15), ("medium", 50), ("high", 25), ("urgent", 10)])
+TASK_STATUSES = weighted([("todo", 40), ("in_progress", 30), ("completed", 25), ("cancelled", 5)])
+
+INTERACTION_TYPES = ["email", "call", "meeting", "demo", "support"]
+INTERACTION_OUTCOMES = weighted([("positive", 50), ("neutral", 35), ("negative", 15)])
+INTERACTION_DURATIONS = {
+    "email": (5, 15), "call": (10, 45), "meeting": (30, 90), "demo": (30, 60), "support": (15, 60)
+}
+
+REVENUE_TYPES = weighted([("subscription", 50), ("one_time", 20), ("upsell", 15), ("renewal", 15)])
+REVENUE_AMOUNT_RANGES = {
+    "subscription": (500, 15000), "one_time": (1000, 50000), "upsell": (500, 10000), "renewal": (2000, 20000)
+}
+
+CAMPAIGN_STATUSES = weighted([("draft", 10), ("active", 40), ("paused", 15), ("completed", 35)])
+
+# Rows per table for the default seed
+DEFAULT_COUNTS = {
+    "customers": 50, "leads": 80, "deals": 60, "tasks": 100,
+    "interactions": 200, "revenue": 150, "campaigns": 15
+}
+
+
+def customer_row(number: int) -> dict:
+    """Generate one customer record"""
+    first_name = random.choice(FIRST_NAMES)
+    last_name = random.choice(LAST_NAMES)
+    company = random.choice(COMPANIES)
+    status = pick(CUSTOMER_STATUSES)
+    return {
+        "name": f"{first_name} {last_name}",
+        "email": generate_email(first_name, last_name, company, number),
+        "phone": generate_phone(),
+        "company": company,
+        "industry": random.choice(INDUSTRIES),
+        "status": status,
+        "lifetime_value": round(random.uniform(1000, 500000), 2) if status == "active" else round(random.uniform(0, 50000), 2),
+        "acquisition_source": random.choice(ACQUISITION_SOURCES),
+        "notes": f"Customer acquired through {random.choice(ACQUISITION_SOURCES).lower()}. Primary contact for {company}.",
+        "created_at": random_date(365, 30),
+        "updated_at": random_date(30, 0)
+    }
+
+
+def lead_row(number: int) -> dict:
+    """Generate one lead record"""
+    first_name = random.choice(FIRST_NAMES)
+    last_name = random.choice(LAST_NAMES)
+    company = random.choice(COMPANIES)
+    status = pick(LEAD_STATUSES)
+    score_range = LEAD_SCORE_RANGES[status]
+    return {
+        "name": f"{first_name} {last_name}",
+        "email": generate_email(first_name, last_name, company),
+        "phone": generate_phone(),
+        "company": company,
+        "job_title": random.choice(JOB_TITLES),
+        "source": random.choice(LEAD_SOURCES),
+        "status": status,
+        "score": random.randint(score_range[0], score_range[1]),
+        "estimated_value": round(random.uniform(5000, 250000), 2),
+        "notes": f"Lead from {random.choice(LEAD_SOURCES)}. Interested in our {random.choice(['enterprise', 'professional', 'starter'])} plan.",
+        "created_at": random_date(180, 7),
+        "updated_at": random_date(7, 0),
+        "converted_at": random_date(30, 0) if status == "won" else None
+    }
+
+
+def deal_row(number: int, customer_ids: range) -> dict:
+    """Generate one deal record"""
+    stage = pick(DEAL_STAGES)
+    probability_range = DEAL_PROBABILITY_RANGES[stage]
+    closed = stage in ["closed_won", "closed_lost"]
+    return {
+        "title": f"{random.choice(DEAL_TITLES)} - {random.choice(COMPANIES)}",
+        "description": f"Deal for {random.choice(['annual subscription', 'multi-year contract', 'implementation project', 'consulting engagement'])}",
+        "customer_id": random.choice(customer_ids) if customer_ids and random.random() > 0.2 else None,
+        "stage": stage,
+        "value": round(random.uniform(10000, 200000) * DEAL_VALUE_MULTIPLIERS[stage], 2),
+        "probability": random.randint(probability_range[0], probability_range[1]),
+        "expected_close_date": None if closed else random_future_date(7, 120),
+        "actual_close_date": random_date(60, 0) if closed else None,
+        "created_at": random_date(120, 14),
+        "updated_at": random_date(14, 0)
+    }
+
+
+def task_row(number: int, customer_ids: range) -> dict:
+    """Generate one task record"""
+    status = pick(TASK_STATUSES)
+    return {
+        "title": random.choice(TASK_TITLES),
+        "description": "Task related to customer engagement and follow-up activities.",
+        "customer_id": random.choice(customer_ids) if customer_ids and random.random() > 0.3 else None,
+        "priority": pick(TASK_PRIORITIES),
+        "status": status,
+        "due_date": random_future_date(-10, 30),  # Some overdue tasks
+        "completed_at": random_date(30, 0) if status == "completed" else None,
+        "assignee": random.choice(ASSIGNEES),
+        "created_at": random_date(60, 7),
+        "updated_at": random_date(7, 0)
+    }
+
+
+def interaction_row(number: int, customer_ids: range) -> dict:
+    """Generate one interaction record"""
+    interaction_type = random.choice(INTERACTION_TYPES)
+    duration_range = INTERACTION_DURATIONS[interaction_type]
+    return {
+        "customer_id": random.choice(customer_ids) if customer_ids else 1,
+        "type": interaction_type,
+        "subject": random.choice(INTERACTION_SUBJECTS),
+        "notes": f"{interaction_type.capitalize()} interaction regarding account status and opportunities.",
+        "outcome": pick(INTERACTION_OUTCOMES),
+        "duration_minutes": random.randint(duration_range[0], duration_range[1]),
+        "created_at": random_date(180, 0)
+    }
+
+
+def revenue_row(number: int, customer_ids: range) -> dict:
+    """Generate one revenue record over the past year"""
+    revenue_type = pick(REVENUE_TYPES)
+    amount_range = REVENUE_AMOUNT_RANGES[revenue_type]
+    return {
+        "customer_id": random.choice(customer_ids) if customer_ids else 1,
+        "amount": round(random.uniform(amount_range[0], amount_range[1]), 2),
+        "type": revenue_type,
+        "description": f"{revenue_type.capitalize()} revenue from customer account",
+        "date": random_date(365, 0),
+        "created_at": random_date(365, 0)
+    }
+
+
+def campaign_row(number: int) -> dict:
+    """Generate one marketing campaign record"""
+    status = pick(CAMPAIGN_STATUSES)
+    budget = round(random.uniform(5000, 100000), 2)
+    spent_ratio = {"draft": 0, "active": random.uniform(0.3, 0.7), "paused": random.uniform(0.4, 0.6), "completed": random.uniform(0.85, 1.0)}
+    leads_generated = random.randint(10, 500) if status != "draft" else 0
+    return {
+        "name": CAMPAIGN_NAMES[number] if number < len(CAMPAIGN_NAMES) else f"Campaign {number + 1}",
+        "channel": random.choice(MARKETING_CHANNELS),
+        "status": status,
+        "budget": budget,
+        "spent": round(budget * spent_ratio[status], 2),
+        "leads_generated": leads_generated,
+        "conversions": int(leads_generated * random.uniform(0.05, 0.25)),
+        "start_date": random_date(180, 30) if status != "draft" else random_future_date(1, 30),
+        "end_date": random_date(30, 0) if status == "completed" else random_future_date(30, 90),
+        "created_at": random_date(200, 30)
+    }
+
+
+def generate_chunk(make_row, start: int, stop: int, seed: Optional[int], args: tuple, as_of: datetime) -> list:
+    """Generate rows start..stop, seeded per chunk so the output does not depend on the worker count"""
+    global AS_OF
+    AS_OF = as_of
+    if seed is not None:
+        random.seed(f"{seed}:{make_row.__name__}:{start}")
+    return [make_row(number, *args) for number in range(start, stop)]
+
+
+def generate_chunks(make_row, count: int, args: tuple = (), chunk_size: int = 10_000, seed: Optional[int] = None,
+                    as_of: Optional[datetime] = None, pool=None, in_flight: int = 4) -> Iterator[list]:
+    """Yield count generated rows in chunks of chunk_size
+
+    With a multiprocessing pool the chunks are generated by its workers while
+    the caller consumes them, keeping at most in_flight chunks in memory.
+    """
+    as_of = as_of or datetime.utcnow()
+    chunks = ((make_row, start, min(start + chunk_size, count), seed, args, as_of) for start in range(0, count, chunk_size))
+    if pool is None:
+        for chunk in chunks:
+            yield generate_chunk(*chunk)
+        return
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.apply_async(generate_chunk, chunk))
+        if len(pending) >= in_flight:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def bulk_load(model, chunks: Iterable[list]) -> tuple[int, float]:
+    """Insert chunks of rows with executemany, one transaction per chunk
+
+    Secondary indexes are dropped for the load and rebuilt once at the end,
+    which is much cheaper than updating them per row. Returns the number of
+    rows inserted and the elapsed seconds.
+    """
+    table = model.__table__
+    deferred = [index for index in table.indexes if not index.unique]
+    count = 0
+    started = time.perf_counter()
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            # A crash mid-load only loses the load, so skip the per-commit fsync
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+        conn.commit()
+        try:
+            for rows in chunks:
+                with conn.begin():
+                    conn.execute(insert(table), rows)
+                count += len(rows)
+        finally:
+            with conn.begin():
+                for index in deferred:
+                    index.create(conn, checkfirst=True)
+    return count, time.perf_counter() - started
+
+
+def next_id(model) -> int:
+    """Get the ID the database will give the next row of a table"""
+    table = model.__table__
+    with engine.connect() as conn:
+        return conn.execute(select(func.coalesce(func.max(table.c.id), 0))).scalar_one() + 1
+
+
+def seed_all_data(counts: Optional[dict] = None, seed: Optional[int] = None, chunk_size: int = 10_000, workers: int = 1):
+    """Seed every table in bulk, reporting rows/sec per table
+
+    counts overrides DEFAULT_COUNTS per table, seed makes the generated data
+    reproducible and workers > 1 generates rows in parallel processes.
+    """
+    counts = {**DEFAULT_COUNTS, **(counts or {})}
+    as_of = datetime.utcnow()
     print("🌱 Starting CRM Data Seeding...")
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
-    db = SessionLocal()
+    with engine.connect() as conn:
+        existing_customers = conn.execute(select(func.count()).select_from(Customer.__table__)).scalar_one()
+    if existing_customers > 0:
+        print(f"⚠️  Database already contains {existing_customers} customers. Skipping seed.")
+        return
     
+    steps = [
+        ("📊", "customers", Customer, customer_row, False),
+        ("🎯", "leads", Lead, lead_row, False),
+        ("💰", "deals", Deal, deal_row, True),
+        ("✅", "tasks", Task, task_row, True),
+        ("💬", "interactions", Interaction, interaction_row, True),
+        ("💵", "revenue", Revenue, revenue_row, True),
+        ("📢", "campaigns", MarketingCampaign, campaign_row, False),
+    ]
+    customer_ids = range(0)
+    total_rows = 0
+    total_seconds = 0.0
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
     try:
-        # Check if data already exists
-        existing_customers = db.query(Customer).count()
-        if existing_customers > 0:
-            print(f"⚠️  Database already contains {existing_customers} customers. Skipping seed.")
-            return
-        
-        print("📊 Generating Customers...")
-        customers = seed_customers(db, 50)
-        print(f"   ✓ Created {len(customers)} customers")
-        
-        print("🎯 Generating Leads...")
-        leads = seed_leads(db, 80)
-        print(f"   ✓ Created {len(leads)} leads")
-        
-        print("💰 Generating Deals...")
-        deals = seed_deals(db, customers, 60)
-        print(f"   ✓ Created {len(deals)} deals")
-        
-        print("✅ Generating Tasks...")
-        tasks = seed_tasks(db, customers, 100)
-        print(f"   ✓ Created {len(tasks)} tasks")
-        
-        print("💬 Generating Interactions...")
-        interactions = seed_interactions(db, customers, 200)
-        print(f"   ✓ Created {len(interactions)} interactions")
-        
-        print("💵 Generating Revenue Records...")
-        revenues = seed_revenue(db, customers, 150)
-        print(f"   ✓ Created {len(revenues)} revenue records")
-        
-        print("📢 Generating Marketing Campaigns...")
-        campaigns = seed_campaigns(db, 15)
-        print(f"   ✓ Created {len(campaigns)} campaigns")
-        
-        print("\n✨ Seed completed successfully!")
-        print(f"   Total records created: {len(customers) + len(leads) + len(deals) + len(tasks) + len(interactions) + len(revenues) + len(campaigns)}")
-        
-    except Exception as e:
-        print(f"❌ Error seeding data: {e}")
-        db.rollback()
-        raise
+        for icon, name, model, make_row, needs_customers in steps:
+            print(f"{icon} Generating {name.capitalize()}...")
+            args = (customer_ids,) if needs_customers else ()
+            first_id = next_id(model)
+            chunks = generate_chunks(make_row, counts[name], args, chunk_size, seed, as_of, pool, 2 * workers)
+            _, seconds = bulk_load(model, chunks)
+            if name == "customers":
+                customer_ids = range(first_id, first_id + counts[name])
+            total_rows += counts[name]
+            total_seconds += seconds
+            print(f"   ✓ Created {counts[name]:,} {name} in {seconds:.2f}s ({counts[name] / max(seconds, 1e-9):,.0f} rows/sec)")
     finally:
-        db.close()
+        if pool is not None:
+            pool.close()
+    
+    print("\n✨ Seed completed successfully!")
+    print(f"   Total records created: {total_rows:,} in {total_seconds:.2f}s ({total_rows / max(total_seconds, 1e-9):,.0f} rows/sec)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the CRM database with generated data")
+    for name, default in DEFAULT_COUNTS.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help=f"number of {name} (default {default})")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every count, e.g. --scale 100000")
+    parser.add_argument("--seed", type=int, default=42, help="random seed for reproducible data (default 42)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="rows per insert transaction (default 10000)")
+    parser.add_argument("--workers", type=int, default=1, help="processes generating rows in parallel (default 1)")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    seed_all_data()
+    args = parse_args()
+    seed_all_data(
+        counts={name: int(getattr(args, name) * args.scale) for name in DEFAULT_COUNTS},
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+        workers=args.workers
+    )
@@ -0,0 +1,9 @@
+from .entity_store import EntityStore
+from .indexes import HashIndex, SortedIndex
+from .locks import SharedLock
+from .cursors import Page, encode_cursor, decode_cursor, next_page
+from .columnar import ColumnarIndex, HAS_NUMPY
+from .summaries import GroupedTotals
+from .rollups import TimeSeriesRollup, GRANULARITIES
+from .records import Record, CustomerRecord, LeadRecord, DealRecord, TaskRecord
+from .journal import Journal, Persistence
@@ -0,0 +1,174 @@
+"""
+Optional NumPy column arrays mirroring an EntityStore table
+Range filters and aggregates over these columns run as vectorized masks and
+reductions instead of Python loops. Requires numpy; HAS_NUMPY is False without it.
+"""
+from datetime import datetime
+from typing import Hashable, Iterable, Optional
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+    HAS_NUMPY = False
+
+INITIAL_CAPACITY = 1024
+
+
+class ColumnarIndex:
+    """Column-oriented copy of selected fields, kept in sync by EntityStore
+
+    Numeric fields are float64 (NaN when missing), datetime fields are
+    datetime64[us] (NaT when missing) and categorical fields are int32 codes
+    into a per-field dictionary (-1 when missing). Slots freed by deletes and
+    updates are reused, so the arrays only grow with the live row count.
+    """
+
+    def __init__(
+        self,
+        numeric_fields: Iterable[str] = (),
+        datetime_fields: Iterable[str] = (),
+        categorical_fields: Iterable[str] = ()
+    ):
+        if not HAS_NUMPY:
+            raise RuntimeError("ColumnarIndex requires numpy")
+
+        self.numeric_fields = tuple(numeric_fields)
+        self.datetime_fields = tuple(datetime_fields)
+        self.categorical_fields = tuple(categorical_fields)
+
+        self._capacity = INITIAL_CAPACITY
+        self._size = 0
+        self._free: list[int] = []
+        self._positions: dict[int, int] = {}
+        self._ids = np.zeros(self._capacity, dtype=np.int64)
+        self._live = np.zeros(self._capacity, dtype=bool)
+        self._missing = {
+            **{field: np.float64(np.nan) for field in self.numeric_fields},
+            **{field: np.datetime64("NaT", "us") for field in self.datetime_fields},
+            **{field: np.int32(-1) for field in self.categorical_fields},
+        }
+        self._columns = {
+            field: np.full(self._capacity, missing)
+            for field, missing in self._missing.items()
+        }
+        self._codes: dict[str, dict[Hashable, int]] = {field: {} for field in self.categorical_fields}
+        self._labels: dict[str, list] = {field: [] for field in self.categorical_fields}
+
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        self._ids = np.resize(self._ids, capacity)
+        live = np.zeros(capacity, dtype=bool)
+        live[:self._capacity] = self._live
+        self._live = live
+        for field, column in self._columns.items():
+            grown = np.full(capacity, self._missing[field])
+            grown[:self._capacity] = column
+            self._columns[field] = grown
+        self._capacity = capacity
+
+    def _encode(self, field: str, value: Hashable) -> int:
+        if value is None:
+            return -1
+        codes = self._codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._labels[field])
+            self._labels[field].append(value)
+        return code
+
+    def add(self, item_id: int, row: dict) -> None:
+        if self._free:
+            position = self._free.pop()
+        else:
+            if self._size == self._capacity:
+                self._grow()
+            position = self._size
+            self._size += 1
+
+        self._positions[item_id] = position
+        self._ids[position] = item_id
+        self._live[position] = True
+        for field in self.numeric_fields:
+            value = row.get(field)
+            self._columns[field][position] = self._missing[field] if value is None else value
+        for field in self.datetime_fields:
+            value = row.get(field)
+            self._columns[field][position] = value if isinstance(value, datetime) else self._missing[field]
+        for field in self.categorical_fields:
+            self._columns[field][position] = self._encode(field, row.get(field))
+
+    def remove(self, item_id: int, row: dict) -> None:
+        position = self._positions.pop(item_id, None)
+        if position is None:
+            return
+        self._live[position] = False
+        self._free.append(position)
+
+    def mask(
+        self,
+        equals: Optional[dict[str, Hashable]] = None,
+        minimum: Optional[dict[str, object]] = None,
+        maximum: Optional[dict[str, object]] = None
+    ) -> "np.ndarray":
+        """Build a boolean mask of live rows matching every condition
+
+        equals compares categorical fields, minimum/maximum are inclusive
+        bounds on numeric or datetime fields. None-valued conditions are ignored.
+        """
+        mask = self._live[:self._size].copy()
+        for field, value in (equals or {}).items():
+            if value is None:
+                continue
+            code = self._codes[field].get(value)
+            if code is None:
+                return np.zeros(self._size, dtype=bool)
+            mask &= self._columns[field][:self._size] == code
+        for field, value in (minimum or {}).items():
+            if value is not None:
+                mask &= self._columns[field][:self._size] >= self._scalar(field, value)
+        for field, value in (maximum or {}).items():
+            if value is not None:
+                mask &= self._columns[field][:self._size] <= self._scalar(field, value)
+        return mask
+
+    def _scalar(self, field: str, value: object) -> object:
+        if field in self.datetime_fields:
+            return np.datetime64(value, "us")
+        return value
+
+    def ids(self, mask: "np.ndarray") -> set[int]:
+        """Get the record IDs selected by a mask"""
+        return set(self._ids[:self._size][mask].tolist())
+
+    def count(self, mask: Optional["np.ndarray"] = None) -> int:
+        """Count the live rows selected by a mask"""
+        if mask is None:
+            return len(self._positions)
+        return int(np.count_nonzero(mask))
+
+    def sum(self, field: str, mask: Optional["np.ndarray"] = None) -> float:
+        """Sum a numeric field over the rows selected by a mask, ignoring missing values"""
+        if mask is None:
+            mask = self._live[:self._size]
+        return float(np.nansum(self._columns[field][:self._size][mask]))
+
+    def group_by(self, key: str, field: Optional[str] = None, mask: Optional["np.ndarray"] = None) -> dict:
+        """Count rows, and optionally sum a numeric field, per value of a categorical field
+
+        Returns {value: count} without field, or {value: (count, total)} with it.
+        """
+        if mask is None:
+            mask = self._live[:self._size]
+        mask = mask & (self._columns[key][:self._size] >= 0)
+        codes = self._columns[key][:self._size][mask]
+        size = len(self._labels[key])
+        counts = np.bincount(codes, minlength=size)
+        labels = self._labels[key]
+        if field is None:
+            return {labels[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+        values = np.nan_to_num(self._columns[field][:self._size][mask])
+        totals = np.bincount(codes, weights=values, minlength=size)
+        return {labels[code]: (int(counts[code]), float(totals[code])) for code in np.flatnonzero(counts)}
@@ -0,0 +1,100 @@
+"""
+Opaque cursors for keyset pagination
+A cursor holds the ordering, sort value and ID of the last record of a page,
+so the next page starts right after that position however deep it is and is
+not shifted by records inserted or deleted in between
+"""
+import base64
+import binascii
+import json
+import math
+from datetime import datetime
+from typing import Any, Callable, Mapping, Optional
+
+
+class Page(list):
+    """A page of records plus the cursor for the page after it (None on the last page)"""
+
+    def __init__(self, rows=(), next_cursor: Optional[str] = None):
+        super().__init__(rows)
+        self.next_cursor = next_cursor
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _is_naive_datetime(value) -> bool:
+    return isinstance(value, datetime) and value.tzinfo is None
+
+
+# Sort values a cursor may hold, per ordering; None stands for records missing the sort field
+CURSOR_VALUES = {
+    "id": lambda value: value is None,
+    "score": lambda value: value is None or _is_number(value),
+    "value": lambda value: value is None or _is_number(value),
+    "due_date": lambda value: value is None or _is_naive_datetime(value),
+    "relevance": lambda value: (
+        isinstance(value, tuple) and len(value) == 2
+        and all(isinstance(part, int) and not isinstance(part, bool) for part in value)
+    )
+}
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    raise TypeError(f"Cannot put {type(value).__name__} in a cursor")
+
+
+def _decode(value):
+    if isinstance(value, dict) and "$dt" in value:
+        return datetime.fromisoformat(value["$dt"])
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def encode_cursor(order: str, value: Any, item_id: int) -> str:
+    """Build the cursor for the position after a record in an ordering"""
+    payload = json.dumps([order, value, item_id], default=_encode, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, order: str) -> tuple[Any, int]:
+    """Get the (sort value, id) position from a cursor, raising ValueError unless it was built for order
+
+    The sort value must have the type of the ordering (see CURSOR_VALUES),
+    so a tampered cursor is rejected instead of failing inside an index.
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        cursor_order, value, item_id = json.loads(payload, object_hook=_decode)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if cursor_order != order or not isinstance(item_id, int) or isinstance(item_id, bool):
+        raise ValueError("Invalid cursor")
+    value = _decode(value)
+    check = CURSOR_VALUES.get(order)
+    if check is not None and not check(value):
+        raise ValueError("Invalid cursor")
+    return value, item_id
+
+
+def next_page(
+    rows: list,
+    limit: int,
+    order_by: Optional[str] = None,
+    key: Optional[Callable[[Mapping], Any]] = None,
+    order: Optional[str] = None
+) -> Page:
+    """Wrap a page of rows, with a cursor after the last one when the page is full
+
+    The cursor's sort value is key(row) when given, else the row's order_by
+    field; order names the ordering and defaults to order_by, or "id".
+    """
+    if not rows or len(rows) < limit:
+        return Page(rows)
+    last = rows[-1]
+    value = key(last) if key is not None else (last.get(order_by) if order_by else None)
+    return Page(rows, encode_cursor(order or order_by or "id", value, last["id"]))
@@ -0,0 +1,480 @@
+"""
+In-memory entity store for the CRM tables
+Keeps records in an id-keyed hash index so point reads and writes are O(1)
+Writers never mutate a published record, they swap in a new version, so
+readers share the store without copying it
+"""
+import math
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timezone
+from collections.abc import Mapping
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
+
+from .locks import SharedLock
+from .indexes import HashIndex, SortedIndex, intersect_postings
+from .text_index import TrigramIndex
+
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+
+
+class EntityStore:
+    """Id-indexed in-memory table shared by all routers"""
+
+    def __init__(
+        self,
+        name: str,
+        rows: Iterable[Mapping] = (),
+        indexed_fields: Iterable[str] = (),
+        sorted_fields: Optional[dict[str, str]] = None,
+        datetime_fields: Iterable[str] = (),
+        numeric_fields: Iterable[str] = (),
+        text_fields: Iterable[str] = (),
+        record_type: Optional[type] = None
+    ):
+        self.name = name
+        self._record_type = record_type
+        self._rows: dict[int, Mapping] = {}
+        # Record IDs in ascending order, for ID-ordered pages and cursors
+        self._ids: list[int] = []
+        self._next_id = 1
+        self._lock = SharedLock()
+        self._journal: Optional[Callable] = None
+        self._datetime_fields = (*TIMESTAMP_FIELDS, *datetime_fields)
+        self._numeric_fields = tuple(numeric_fields)
+        self._hash_indexes = {field: HashIndex(field) for field in indexed_fields}
+        self._sorted_indexes = {
+            field: SortedIndex(field, descending=(direction == "desc"))
+            for field, direction in (sorted_fields or {}).items()
+        }
+        self._text_index = TrigramIndex(text_fields) if text_fields else None
+        self._indexes = [*self._hash_indexes.values(), *self._sorted_indexes.values()]
+        if self._text_index is not None:
+            self._indexes.append(self._text_index)
+
+        self._load(rows)
+
+    def _load(self, rows: Iterable[Mapping], skip_invalid: bool = False) -> int:
+        """Add rows in bulk, letting indexes that support it build in one pass
+
+        Invalid rows raise ValueError, or with skip_invalid are left out;
+        returns how many were left out.
+        """
+        loaded = []
+        skipped = 0
+        for row in rows:
+            try:
+                row = self._coerce(row)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+                skipped += 1
+                continue
+            self._rows[row["id"]] = row
+            self._next_id = max(self._next_id, row["id"] + 1)
+            loaded.append((row["id"], row))
+        self._ids = sorted(self._rows)
+        for index in self._indexes:
+            add_many = getattr(index, "add_many", None)
+            if add_many is not None:
+                add_many(loaded)
+            else:
+                for item_id, row in loaded:
+                    index.add(item_id, row)
+        return skipped
+
+    def _coerce(self, data: Mapping) -> Mapping:
+        """Copy and validate a record, raising ValueError for values the indexes cannot hold
+
+        ISO strings in datetime fields are parsed and timezone-aware
+        datetimes converted to naive UTC, so every datetime compares with
+        every other. Numeric fields must hold numbers and every value must be
+        hashable. With a record_type the copy is built as that record class,
+        otherwise it is a plain dict.
+        """
+        row = dict(data)
+        for field in self._datetime_fields:
+            value = row.get(field)
+            if isinstance(value, str):
+                try:
+                    value = datetime.fromisoformat(value)
+                except ValueError:
+                    raise ValueError(f"Invalid datetime for {field}: {value}")
+            if value is None:
+                continue
+            if not isinstance(value, datetime):
+                raise ValueError(f"Invalid datetime for {field}: {value!r}")
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            row[field] = value
+        for field in self._numeric_fields:
+            value = row.get(field)
+            if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float)) or math.isnan(value)):
+                raise ValueError(f"Invalid number for {field}: {value!r}")
+        for field, value in row.items():
+            try:
+                hash(value)
+            except TypeError:
+                raise ValueError(f"Invalid value for {field}: {value!r}")
+        if self._record_type is not None:
+            return self._record_type.from_dict(row)
+        return row
+
+    @property
+    def fields(self) -> Optional[tuple]:
+        """Fields of every record, or None when records are plain dicts"""
+        return self._record_type.FIELDS if self._record_type is not None else None
+
+    def attach(self, index):
+        """Attach an extra index to the store, backfilling it from the current records"""
+        with self._lock.exclusive():
+            for item_id, row in self._rows.items():
+                index.add(item_id, row)
+            self._indexes.append(index)
+        return index
+
+    def reading(self):
+        """Context manager giving a consistent view of the records and indexes
+
+        Any number of readers hold it at once; writers wait for them to finish.
+        Reads nested inside it (find_ids, page, ...) reuse the same hold.
+        """
+        return self._lock.shared()
+
+    def _add_id(self, item_id: int) -> None:
+        ids = self._ids
+        if not ids or item_id > ids[-1]:
+            ids.append(item_id)
+        else:
+            insort(ids, item_id)
+
+    def _remove_id(self, item_id: int) -> None:
+        ids = self._ids
+        position = bisect_left(ids, item_id)
+        if position < len(ids) and ids[position] == item_id:
+            del ids[position]
+
+    def _reindex(self, item_id: int, old: Optional[Mapping], new: Optional[Mapping]) -> None:
+        """Move a record's index entries from its old to its new version, either may be None
+
+        All or nothing: if an index raises, the indexes already moved are
+        moved back before the error propagates.
+        """
+        moved = []
+        try:
+            for index in self._indexes:
+                if old is not None:
+                    index.remove(item_id, old)
+                moved.append((index, False))
+                if new is not None:
+                    index.add(item_id, new)
+                moved[-1] = (index, True)
+        except Exception:
+            for index, added in reversed(moved):
+                if added and new is not None:
+                    index.remove(item_id, new)
+                if old is not None:
+                    index.add(item_id, old)
+            raise
+
+    def _write(self, item_id: int, existing: Optional[Mapping], row: Optional[Mapping]) -> None:
+        """Index, journal and publish a new version of a record, or delete it when row is None
+
+        Nothing changes if an index rejects the row or the journal append fails.
+        """
+        self._reindex(item_id, existing, row)
+        try:
+            self._log([(item_id, row)])
+        except BaseException:
+            self._reindex(item_id, row, existing)
+            raise
+        self._publish(item_id, existing, row)
+
+    def _publish(self, item_id: int, existing: Optional[Mapping], row: Optional[Mapping]) -> None:
+        """Swap an indexed record's new version into the table, or remove it when row is None"""
+        if row is None:
+            del self._rows[item_id]
+            self._remove_id(item_id)
+        else:
+            if existing is None:
+                self._add_id(item_id)
+            self._rows[item_id] = row
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[Mapping]:
+        # Copies references only, so iteration outside reading() never sees a write mid-way
+        return iter(list(self._rows.values()))
+
+    def __contains__(self, item_id: int) -> bool:
+        return item_id in self._rows
+
+    def get(self, item_id: int) -> Optional[Mapping]:
+        """Get a record by ID, without taking the lock
+
+        With a record_type the stored record is immutable and returned by
+        reference; plain dict records are copied. A single dict lookup is
+        atomic, so the read never sees a write mid-way.
+        """
+        row = self._rows.get(item_id)
+        return row.copy() if row is not None else None
+
+    def insert(self, data: Mapping) -> Mapping:
+        """Insert a new record and assign it the next free ID"""
+        with self._lock.exclusive():
+            now = datetime.utcnow()
+            item_id = self._next_id
+            row = self._coerce({"created_at": now, "updated_at": now, **data, "id": item_id})
+            self._write(item_id, None, row)
+            self._next_id += 1
+            return row.copy()
+
+    def update(self, item_id: int, changes: Mapping) -> Optional[Mapping]:
+        """Apply changes to an existing record, returns None if it does not exist"""
+        with self._lock.exclusive():
+            existing = self._rows.get(item_id)
+            if existing is None:
+                return None
+            row = self._coerce({**existing, "updated_at": datetime.utcnow(), **changes, "id": item_id})
+            self._write(item_id, existing, row)
+            return row.copy()
+
+    def delete(self, item_id: int) -> bool:
+        """Delete a record by ID, returns False if it does not exist"""
+        with self._lock.exclusive():
+            existing = self._rows.get(item_id)
+            if existing is None:
+                return False
+            self._write(item_id, existing, None)
+            return True
+
+    def bulk(
+        self,
+        creates: Iterable[Mapping] = (),
+        updates: Iterable[tuple[int, Mapping]] = (),
+        deletes: Iterable[int] = ()
+    ) -> dict[str, list]:
+        """Apply many inserts, updates and deletes in one exclusive hold, with a result per item
+
+        Readers see none or all of the batch. Every item is validated before
+        any is applied, so an invalid item gets its ValueError as its result
+        and never leaves a partial write behind. The valid writes are
+        journaled as one entry before they are indexed, so a crash persists
+        all of them or none. Results follow insert, update and delete (the
+        record, None for an unknown ID, a bool for deletes).
+        """
+        with self._lock.exclusive():
+            now = datetime.utcnow()
+            results = {"create": [], "update": [], "delete": []}
+            # (item_id, previous version, new version) per valid write, in order
+            writes = []
+            # Latest version of each record touched so far, None once deleted
+            staged: dict[int, Optional[Mapping]] = {}
+            next_id = self._next_id
+
+            for data in creates:
+                row = _attempt(self._coerce, {"created_at": now, "updated_at": now, **data, "id": next_id})
+                if not isinstance(row, Exception):
+                    writes.append((next_id, None, row))
+                    staged[next_id] = row
+                    next_id += 1
+                results["create"].append(row)
+            for item_id, changes in updates:
+                existing = staged[item_id] if item_id in staged else self._rows.get(item_id)
+                row = None
+                if existing is not None:
+                    row = _attempt(self._coerce, {**existing, "updated_at": now, **changes, "id": item_id})
+                    if not isinstance(row, Exception):
+                        writes.append((item_id, existing, row))
+                        staged[item_id] = row
+                results["update"].append(row)
+            for item_id in deletes:
+                existing = staged[item_id] if item_id in staged else self._rows.get(item_id)
+                if existing is not None:
+                    writes.append((item_id, existing, None))
+                    staged[item_id] = None
+                results["delete"].append(existing is not None)
+
+            if writes:
+                self._log([(item_id, row) for item_id, _, row in writes])
+                applied = []
+                try:
+                    for item_id, existing, row in writes:
+                        self._reindex(item_id, existing, row)
+                        self._publish(item_id, existing, row)
+                        applied.append((item_id, existing, row))
+                except BaseException:
+                    # The journal already holds the batch: undo it here and journal the undo
+                    for item_id, existing, row in reversed(applied):
+                        self._reindex(item_id, row, existing)
+                        self._publish(item_id, row, existing)
+                    self._log([(item_id, existing) for item_id, existing, _ in reversed(writes)])
+                    raise
+                self._next_id = next_id
+            results["create"] = [row.copy() if isinstance(row, Mapping) else row for row in results["create"]]
+            results["update"] = [row.copy() if isinstance(row, Mapping) else row for row in results["update"]]
+            return results
+
+    def attach_journal(self, append: Callable) -> None:
+        """Log every later mutation through append(table, changes) before applying it
+
+        changes is a list of (op, item_id, row) tuples, one per record a
+        single write or bulk() call changes.
+        """
+        self._journal = append
+
+    @property
+    def journaled(self) -> bool:
+        """Whether mutations are journaled, so writes wait on file I/O"""
+        return self._journal is not None
+
+    def _log(self, writes: list[tuple[int, Optional[Mapping]]]) -> None:
+        """Journal new record versions as one entry, None meaning the record was deleted"""
+        if self._journal is not None:
+            self._journal(self.name, [
+                ("put", item_id, dict(row)) if row is not None else ("delete", item_id, None)
+                for item_id, row in writes
+            ])
+
+    def apply_put(self, data: Mapping) -> None:
+        """Insert or replace a record as-is, without journaling (used for recovery)"""
+        with self._lock.exclusive():
+            row = self._coerce(data)
+            item_id = row["id"]
+            existing = self._rows.get(item_id)
+            self._reindex(item_id, existing, row)
+            if existing is None:
+                self._add_id(item_id)
+            self._rows[item_id] = row
+            self._next_id = max(self._next_id, item_id + 1)
+
+    def apply_delete(self, item_id: int) -> None:
+        """Delete a record if present, without journaling (used for recovery)"""
+        with self._lock.exclusive():
+            existing = self._rows.get(item_id)
+            if existing is not None:
+                self._reindex(item_id, existing, None)
+                del self._rows[item_id]
+                self._remove_id(item_id)
+
+    def restore(self, rows: Iterable[Mapping], next_id: int, skip_invalid: bool = False) -> int:
+        """Replace every record with rows loaded from a snapshot
+
+        Invalid rows raise ValueError, or with skip_invalid are left out;
+        returns how many were left out.
+        """
+        with self._lock.exclusive():
+            # Emptied up front, removing IDs one by one from the front of the list is quadratic
+            self._ids = []
+            for item_id in list(self._rows):
+                self.apply_delete(item_id)
+            skipped = self._load(rows, skip_invalid)
+            self._next_id = max(self._next_id, next_id)
+            return skipped
+
+    def dump(self) -> dict:
+        """Get every record as plain dicts, with the next ID to allocate
+
+        Only the row references are copied under the lock. Published rows are
+        never mutated, so they are converted after it is released and
+        writers do not wait for the conversion.
+        """
+        with self._lock.shared():
+            rows, next_id = list(self._rows.values()), self._next_id
+        return {"rows": [dict(row) for row in rows], "next_id": next_id}
+
+    def find_ids(self, **filters: Hashable) -> Optional[set[int]]:
+        """Get the IDs matching all equality filters, ignoring filters set to None
+
+        Returns None when no filter applies, meaning every record matches.
+        """
+        with self._lock.shared():
+            postings = [
+                self._hash_indexes[field].lookup(value)
+                for field, value in filters.items()
+                if value is not None
+            ]
+            return intersect_postings(postings)
+
+    def search(self, query: str, ids: Optional[set[int]] = None, after: Optional[tuple] = None) -> list[Mapping]:
+        """Get the records whose text fields contain query, best matches first
+
+        after is a (rank, id) position from search_rank() to continue after.
+        """
+        with self._lock.shared():
+            return [self._rows[item_id] for item_id in self._text_index.search(query, ids, after)]
+
+    def search_rank(self, query: str, item_id: int) -> Optional[tuple]:
+        """Get how well a record matches a search query, for continuing search results after it"""
+        return self._text_index.rank(query, item_id)
+
+    def page(
+        self,
+        ids: Optional[set[int]] = None,
+        order_by: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100,
+        where: Optional[Callable[[Mapping], bool]] = None,
+        until: Optional[Callable[[Mapping], bool]] = None,
+        after: Optional[tuple[Any, int]] = None
+    ) -> list[Mapping]:
+        """Get a page of records in ID order or in the order of a sorted index
+
+        ids restricts the page to a candidate set (see find_ids), where filters
+        individual records and until stops the walk at the first record it
+        matches, which lets range filters on the sort field terminate early.
+        after is the (sort value, id) of the last record of the previous page
+        (see store.cursors); the walk seeks straight past it.
+        """
+        if limit <= 0:
+            return []
+
+        with self._lock.shared():
+            if order_by is None:
+                if ids is None:
+                    start = 0 if after is None else bisect_right(self._ids, after[1])
+                    order = map(self._ids.__getitem__, range(start, len(self._ids)))
+                else:
+                    order = iter(sorted(ids if after is None else [item_id for item_id in ids if item_id > after[1]]))
+                candidates = None
+            else:
+                index = self._sorted_indexes[order_by]
+                after_key = None if after is None else index.key(after[1], {order_by: after[0]})
+                candidates = ids
+                # Sorting a small candidate set beats skipping through the index
+                if ids is not None and self._sort_is_cheaper(len(ids), skip + limit):
+                    order = iter(index.sort_ids(ids, after_key))
+                    candidates = None
+                else:
+                    order = index.iter_after(after_key)
+
+            result = []
+            for item_id in order:
+                if candidates is not None and item_id not in candidates:
+                    continue
+                row = self._rows[item_id]
+                if until is not None and until(row):
+                    break
+                if where is not None and not where(row):
+                    continue
+                if skip > 0:
+                    skip -= 1
+                    continue
+                result.append(row)
+                if len(result) >= limit:
+                    break
+            return result
+
+    def _sort_is_cheaper(self, matches: int, wanted: int) -> bool:
+        """Compare sorting the matches against walking the index until enough are found"""
+        if matches == 0:
+            return True
+        walk_cost = min(len(self._rows), wanted * len(self._rows) / matches)
+        return matches * math.log2(matches + 1) <= walk_cost
+
+
+def _attempt(write: Callable, *args) -> Any:
+    try:
+        return write(*args)
+    except ValueError as error:
+        return error
@@ -0,0 +1,122 @@
+"""
+Secondary indexes maintained by EntityStore on every write
+"""
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Hashable, Iterable, Iterator, Optional
+
+
+class HashIndex:
+    """Equality index mapping a field value to the set of record IDs holding it"""
+
+    def __init__(self, field: str):
+        self.field = field
+        self._postings: dict[Hashable, set[int]] = {}
+
+    def add(self, item_id: int, row: dict) -> None:
+        self._postings.setdefault(row.get(self.field), set()).add(item_id)
+
+    def remove(self, item_id: int, row: dict) -> None:
+        value = row.get(self.field)
+        posting = self._postings.get(value)
+        if posting is None:
+            return
+        posting.discard(item_id)
+        if not posting:
+            del self._postings[value]
+
+    def lookup(self, value: Hashable) -> set[int]:
+        """Get the IDs of records whose field equals value"""
+        return self._postings.get(value, set())
+
+
+def intersect_postings(postings: Iterable[set[int]]) -> Optional[set[int]]:
+    """Intersect posting sets starting from the most selective one
+
+    Returns None when no postings are given, meaning "no restriction".
+    """
+    ordered = sorted(postings, key=len)
+    if not ordered:
+        return None
+
+    result = set(ordered[0])
+    for posting in ordered[1:]:
+        if not result:
+            break
+        result &= posting
+    return result
+
+
+class SortedIndex:
+    """Ordered index on a field, kept sorted on write so pages can be read without sorting
+
+    Ties are broken by record ID and records missing the field sort last.
+    Descending order is only supported for numeric fields. With include, only
+    records it accepts are indexed, which keeps partial indexes small.
+    """
+
+    def __init__(self, field: str, descending: bool = False, include: Optional[Callable[[dict], bool]] = None):
+        self.field = field
+        self.descending = descending
+        self.include = include
+        self._entries: list[tuple] = []
+        self._keys: dict[int, tuple] = {}
+
+    def key(self, item_id: int, row: dict) -> tuple:
+        value = row.get(self.field)
+        if value is None:
+            return (1, 0, item_id)
+        return (0, -value if self.descending else value, item_id)
+
+    def add(self, item_id: int, row: dict) -> None:
+        if self.include is not None and not self.include(row):
+            return
+        key = self.key(item_id, row)
+        self._keys[item_id] = key
+        insort(self._entries, key)
+
+    def add_many(self, items: Iterable[tuple[int, dict]]) -> None:
+        """Add many records with one sort instead of an insertion per record"""
+        for item_id, row in items:
+            if self.include is not None and not self.include(row):
+                continue
+            self._keys[item_id] = self.key(item_id, row)
+        self._entries = sorted(self._keys.values())
+
+    def remove(self, item_id: int, row: dict) -> None:
+        key = self._keys.pop(item_id, None)
+        if key is None:
+            return
+        position = bisect_left(self._entries, key)
+        if position < len(self._entries) and self._entries[position] == key:
+            del self._entries[position]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate record IDs in index order"""
+        return self.iter_after(None)
+
+    def iter_after(self, key: Optional[tuple], stop: Optional[int] = None) -> Iterator[int]:
+        """Iterate record IDs in index order, starting after key (see key()) and ending before position stop"""
+        entries = self._entries
+        start = 0 if key is None else bisect_right(entries, key)
+        return (entries[position][-1] for position in range(start, len(entries) if stop is None else stop))
+
+    def sort_ids(self, ids: Iterable[int], after: Optional[tuple] = None) -> list[int]:
+        """Sort a set of record IDs into index order, keeping only those after key after"""
+        keys = self._keys
+        if after is not None:
+            ids = [item_id for item_id in ids if keys[item_id] > after]
+        return sorted(ids, key=keys.__getitem__)
+
+    def count_before(self, value) -> int:
+        """Count records whose field is below value (ascending indexes only)"""
+        return bisect_left(self._entries, (0, value))
+
+    def ids_before(self, value, after: Optional[tuple] = None) -> Iterator[int]:
+        """Iterate the IDs of records whose field is below value in index order, starting after key after
+
+        Ascending indexes only.
+        """
+        return self.iter_after(after, self.count_before(value))
@@ -0,0 +1,254 @@
+"""
+Durable write path for the in-memory store
+Every mutation is appended to an NDJSON journal that a background thread
+fsyncs in batches, and the tables are periodically compacted into a snapshot. On startup the
+latest snapshot is loaded and the journal tail after it is replayed.
+"""
+import glob
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+SNAPSHOT_FILE = "snapshot.json"
+SEGMENT_PATTERN = "journal-*.ndjson"
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, default=_encode, separators=(",", ":"))
+
+
+class Journal:
+    """Append-only journal split into segments named after their first LSN
+
+    Appends are handed to the OS immediately, so they survive a process
+    crash, but never fsync: writers call append() while holding their
+    store's lock, and an fsync there would stall every reader queued behind
+    them. sync() fsyncs outside the append lock, run by a background thread
+    that wait_for_sync() wakes once sync_every entries are pending, so a
+    machine crash can lose at most the entries since the last sync.
+    """
+
+    def __init__(self, directory: str, sync_every: int = 256):
+        self.directory = directory
+        self.sync_every = sync_every
+        # Guards appends; held briefly and never across an fsync
+        self._lock = threading.Lock()
+        # Serializes sync, rotate and close, which fsync while appends go on
+        self._sync_lock = threading.Lock()
+        self._sync_due = threading.Event()
+        self._file = None
+        self._pending = 0
+        self.lsn = 0
+
+    @staticmethod
+    def _segment_start(path: str) -> int:
+        return int(os.path.basename(path)[len("journal-"):-len(".ndjson")])
+
+    def segments(self) -> list[str]:
+        """Get the journal segment paths, oldest first"""
+        return sorted(glob.glob(os.path.join(self.directory, SEGMENT_PATTERN)), key=self._segment_start)
+
+    def entries(self, after_lsn: int = 0) -> Iterator[dict]:
+        """Read journal entries with an LSN above after_lsn, in order
+
+        A torn final line left by a crash mid-write is ignored.
+        """
+        for path in self.segments():
+            with open(path, "r", encoding="utf-8") as segment:
+                for line in segment:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if entry["lsn"] > after_lsn:
+                        yield entry
+
+    def open(self, last_lsn: int) -> None:
+        """Start a new segment after last_lsn"""
+        with self._lock:
+            self.lsn = last_lsn
+            self._open_segment()
+
+    def _open_segment(self) -> None:
+        path = os.path.join(self.directory, f"journal-{self.lsn + 1:012d}.ndjson")
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, table: str, changes: list[tuple[str, int, Optional[dict]]]) -> int:
+        """Append (op, item_id, row) mutations of a table as one entry and return its LSN
+
+        Several mutations make a "batch" entry. Replay applies an entry as a
+        whole and ignores a torn final line, so a batch is recovered
+        completely or not at all.
+        """
+        if len(changes) == 1:
+            (op, item_id, row), = changes
+            entry = {"table": table, "op": op, "id": item_id, "row": row}
+        else:
+            entry = {
+                "table": table,
+                "op": "batch",
+                "changes": [{"op": op, "id": item_id, "row": row} for op, item_id, row in changes]
+            }
+        with self._lock:
+            self.lsn += 1
+            self._file.write(_dumps({"lsn": self.lsn, **entry}) + "\n")
+            self._file.flush()
+            self._pending += 1
+            if self._pending >= self.sync_every:
+                self._sync_due.set()
+            return self.lsn
+
+    def wait_for_sync(self, timeout: float) -> None:
+        """Wait until sync_every entries are pending, or at most timeout seconds"""
+        self._sync_due.wait(timeout)
+        self._sync_due.clear()
+
+    def sync(self) -> None:
+        """Fsync pending entries; appends go on meanwhile"""
+        with self._sync_lock:
+            with self._lock:
+                file = self._file if self._pending else None
+                self._pending = 0
+            if file is not None:
+                os.fsync(file.fileno())
+
+    def rotate(self) -> int:
+        """Start a new segment, then sync and close the current one; returns the last LSN written to it
+
+        Appends continue in the new segment while the old one is synced.
+        """
+        with self._sync_lock:
+            with self._lock:
+                file, lsn = self._file, self.lsn
+                self._open_segment()
+                self._pending = 0
+            os.fsync(file.fileno())
+            file.close()
+            return lsn
+
+    def drop_segments_through(self, lsn: int) -> None:
+        """Delete segments that only hold entries up to lsn"""
+        segments = self.segments()
+        for path, following in zip(segments, segments[1:]):
+            if self._segment_start(following) - 1 <= lsn:
+                os.remove(path)
+
+    def close(self) -> None:
+        with self._sync_lock:
+            with self._lock:
+                file, self._file = self._file, None
+                self._pending = 0
+            if file is not None:
+                os.fsync(file.fileno())
+                file.close()
+
+
+class Persistence:
+    """Snapshot plus journal persistence for a set of EntityStores
+
+    Journal replay applies full-row puts and deletes, which are idempotent,
+    so a snapshot taken while writes continue may safely overlap the journal.
+    Rows the stores reject on restore (e.g. written before a validation
+    rule existed) are skipped and counted, so they never stop startup.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        stores: dict,
+        sync_every: int = 256,
+        sync_interval: float = 0.05,
+        snapshot_every: int = 100_000
+    ):
+        self.directory = directory
+        self.stores = stores
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.journal = Journal(directory, sync_every)
+        self._snapshot_lsn = 0
+        self._snapshot_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    def open(self) -> dict:
+        """Restore the stores from disk, start journaling and return restore stats"""
+        os.makedirs(self.directory, exist_ok=True)
+        started = time.perf_counter()
+
+        skipped = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        has_snapshot = os.path.exists(snapshot_path)
+        if has_snapshot:
+            with open(snapshot_path, "r", encoding="utf-8") as snapshot:
+                data = json.load(snapshot)
+            self._snapshot_lsn = data["lsn"]
+            for name, table in data["tables"].items():
+                skipped += self.stores[name].restore(table["rows"], table["next_id"], skip_invalid=True)
+
+        replayed = 0
+        last_lsn = self._snapshot_lsn
+        for entry in self.journal.entries(after_lsn=self._snapshot_lsn):
+            store = self.stores[entry["table"]]
+            for change in entry["changes"] if entry["op"] == "batch" else (entry,):
+                if change["op"] == "delete":
+                    store.apply_delete(change["id"])
+                else:
+                    try:
+                        store.apply_put(change["row"])
+                    except ValueError:
+                        skipped += 1
+            last_lsn = entry["lsn"]
+            replayed += 1
+
+        self.journal.open(last_lsn)
+        for store in self.stores.values():
+            store.attach_journal(self.journal.append)
+
+        # First start: persist the seed data so later journal entries have a base
+        if not has_snapshot and not replayed:
+            self.snapshot()
+
+        self._worker = threading.Thread(target=self._run, name="store-journal", daemon=True)
+        self._worker.start()
+        return {"replayed": replayed, "skipped": skipped, "seconds": round(time.perf_counter() - started, 3)}
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self.journal.wait_for_sync(self.sync_interval)
+            self.journal.sync()
+            if self.journal.lsn - self._snapshot_lsn >= self.snapshot_every:
+                self.snapshot()
+
+    def snapshot(self) -> None:
+        """Write a compacted snapshot of every store and drop the journal it covers"""
+        with self._snapshot_lock:
+            lsn = self.journal.rotate()
+            tables = {name: store.dump() for name, store in self.stores.items()}
+
+            path = os.path.join(self.directory, SNAPSHOT_FILE)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as snapshot:
+                snapshot.write(_dumps({"lsn": lsn, "tables": tables}))
+                snapshot.flush()
+                os.fsync(snapshot.fileno())
+            os.replace(temp_path, path)
+
+            self._snapshot_lsn = lsn
+            self.journal.drop_segments_through(lsn)
+
+    def close(self) -> None:
+        """Stop the background flusher, snapshot and close the journal"""
+        self._stopped.set()
+        if self._worker is not None:
+            self._worker.join()
+        self.snapshot()
+        self.journal.close()
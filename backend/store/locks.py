@@ -0,0 +1,95 @@
+"""
+Reader/writer lock for the in-memory stores
+Any number of readers share the store while writers get it exclusively
+"""
+import threading
+
+
+class SharedLock:
+    """Reentrant reader/writer lock that lets waiting writers go first
+
+    A thread already holding the lock (shared or exclusive) may take it
+    again in shared mode, so nested reads never wait on a queued writer.
+    Upgrading a shared hold to an exclusive one would deadlock and raises.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers: dict[int, int] = {}
+        self._writer = None
+        self._writer_depth = 0
+        self._waiting_writers = 0
+        self._shared = _Hold(self.acquire_shared, self.release_shared)
+        self._exclusive = _Hold(self.acquire_exclusive, self.release_exclusive)
+
+    def shared(self):
+        """Context manager holding the lock in shared mode"""
+        return self._shared
+
+    def exclusive(self):
+        """Context manager holding the lock in exclusive mode"""
+        return self._exclusive
+
+    def acquire_shared(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers.get(me)
+            if depth is not None:
+                self._readers[me] = depth + 1
+                return
+            if self._writer != me:
+                while self._writer is not None or self._waiting_writers:
+                    self._cond.wait()
+            self._readers[me] = 1
+
+    def release_shared(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers[me] - 1
+            if depth:
+                self._readers[me] = depth
+                return
+            del self._readers[me]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_exclusive(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._writer_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError("Cannot upgrade a shared hold to an exclusive one")
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._writer_depth = 1
+
+    def release_exclusive(self) -> None:
+        with self._cond:
+            self._writer_depth -= 1
+            if not self._writer_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+
+class _Hold:
+    """Reusable context manager around an acquire/release pair"""
+
+    __slots__ = ("_acquire", "_release")
+
+    def __init__(self, acquire, release):
+        self._acquire = acquire
+        self._release = release
+
+    def __enter__(self):
+        self._acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._release()
@@ -0,0 +1,145 @@
+"""
+Compact slotted record types for the in-memory CRM tables
+Records are immutable read-only mappings, so routers can return them directly
+and FastAPI converts them to JSON at the API boundary.
+"""
+import sys
+from collections.abc import Mapping
+from enum import Enum
+from typing import Any, Iterator, Optional
+
+from database.models import CustomerStatus, LeadStatus, DealStage, TaskStatus, TaskPriority
+
+
+def intern_value(enum: type[Enum], value: Any) -> Any:
+    """Get the shared string for a categorical value
+
+    Known values resolve to the enum's own value string, so every record
+    holding "active" points at the same object. Values outside the enum
+    are kept, interned, rather than rejected.
+    """
+    if value is None:
+        return None
+    try:
+        return enum(value).value
+    except ValueError:
+        return sys.intern(str(value)) if isinstance(value, str) else value
+
+
+class Record(Mapping):
+    """Base class for slotted records
+
+    Subclasses list their FIELDS, the ENUMS backing categorical fields and
+    other INTERNED string fields with few distinct values. Fields outside
+    FIELDS are kept in a lazily created overflow dict.
+    """
+
+    FIELDS: tuple[str, ...] = ()
+    ENUMS: dict[str, type[Enum]] = {}
+    INTERNED: tuple[str, ...] = ()
+    __slots__ = ("_extra",)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        # Per-field converter applied to non-None values when building a record
+        converters = {}
+        for field, enum in cls.ENUMS.items():
+            canonical = {member.value: member.value for member in enum}
+            converters[field] = lambda value, enum=enum, canonical=canonical: canonical.get(value) or intern_value(enum, value)
+        for field in cls.INTERNED:
+            converters[field] = lambda value: sys.intern(value) if isinstance(value, str) else value
+        cls._LAYOUT = tuple((field, converters.get(field)) for field in cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Record":
+        """Build a record from a mapping, interning categorical values"""
+        record = object.__new__(cls)
+        set_field = object.__setattr__
+        get = data.get
+        for field, convert in cls._LAYOUT:
+            value = get(field)
+            if convert is not None and value is not None:
+                value = convert(value)
+            set_field(record, field, value)
+
+        extra = None
+        if not cls._FIELD_SET.issuperset(data):
+            extra = {field: value for field, value in data.items() if field not in cls._FIELD_SET}
+        set_field(record, "_extra", extra)
+        return record
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __getitem__(self, field: str) -> Any:
+        if field in self._FIELD_SET:
+            return getattr(self, field)
+        if self._extra is not None and field in self._extra:
+            return self._extra[field]
+        raise KeyError(field)
+
+    def get(self, field: str, default: Optional[Any] = None) -> Any:
+        if field in self._FIELD_SET:
+            return getattr(self, field)
+        if self._extra is not None:
+            return self._extra.get(field, default)
+        return default
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.FIELDS
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + (len(self._extra) if self._extra is not None else 0)
+
+    def copy(self) -> "Record":
+        """Records are immutable, so a copy is the record itself"""
+        return self
+
+    def to_dict(self) -> dict:
+        """Convert to a plain dict"""
+        return dict(self)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class CustomerRecord(Record):
+    FIELDS = (
+        "id", "name", "email", "phone", "company", "status", "industry", "lifetime_value",
+        "acquisition_source", "notes", "created_at", "updated_at"
+    )
+    ENUMS = {"status": CustomerStatus}
+    INTERNED = ("industry", "acquisition_source")
+    __slots__ = FIELDS
+
+
+class LeadRecord(Record):
+    FIELDS = (
+        "id", "name", "email", "phone", "company", "job_title", "status", "source", "score",
+        "estimated_value", "notes", "created_at", "updated_at"
+    )
+    ENUMS = {"status": LeadStatus}
+    INTERNED = ("source",)
+    __slots__ = FIELDS
+
+
+class DealRecord(Record):
+    FIELDS = (
+        "id", "title", "value", "stage", "probability", "customer_id", "expected_close",
+        "notes", "created_at", "updated_at"
+    )
+    ENUMS = {"stage": DealStage}
+    __slots__ = FIELDS
+
+
+class TaskRecord(Record):
+    FIELDS = (
+        "id", "title", "description", "status", "priority", "assignee", "due_date",
+        "customer_id", "deal_id", "completed_at", "created_at", "updated_at"
+    )
+    ENUMS = {"status": TaskStatus, "priority": TaskPriority}
+    INTERNED = ("assignee",)
+    __slots__ = FIELDS
@@ -0,0 +1,132 @@
+"""
+Time-series rollups kept current on every write
+Totals per day and per calendar month, split by a category field, so charts
+over any range and granularity are summed from buckets instead of scanning
+the raw rows
+"""
+from datetime import date, datetime, timedelta
+from typing import Hashable, Iterable, Optional
+
+GRANULARITIES = ("day", "week", "month")
+MAX_POINTS = 1000
+
+
+def period_start(day: date, granularity: str) -> date:
+    """Get the first day of the day, week (starting Monday) or month holding day"""
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_period(start: date, granularity: str) -> date:
+    """Get the first day of the period after the one starting at start"""
+    if granularity == "week":
+        return start + timedelta(days=7)
+    if granularity == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def months_back(day: date, months: int) -> date:
+    """Get the first day of the month that is months before the month holding day"""
+    month_index = day.year * 12 + day.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+class TimeSeriesRollup:
+    """Sum and count of value_field per day and per month, by category_field
+
+    Implements the add/remove index protocol, so it can be attached to an
+    EntityStore or a SQL table and follow every insert, update and delete.
+    Rows missing date_field are not counted.
+    """
+
+    def __init__(self, date_field: str = "date", value_field: str = "amount", category_field: str = "type"):
+        self.date_field = date_field
+        self.value_field = value_field
+        self.category_field = category_field
+        self._days: dict[date, dict[Hashable, list]] = {}
+        self._months: dict[date, dict[Hashable, list]] = {}
+
+    def add(self, item_id: int, row: dict) -> None:
+        self._apply(row, 1)
+
+    def remove(self, item_id: int, row: dict) -> None:
+        self._apply(row, -1)
+
+    def _apply(self, row: dict, sign: int) -> None:
+        when = row.get(self.date_field)
+        if when is None:
+            return
+        day = when.date() if isinstance(when, datetime) else when
+        self._bump(day, row.get(self.category_field), sign * (row.get(self.value_field) or 0), sign)
+
+    def _bump(self, day: date, category: Hashable, amount: float, count: int) -> None:
+        for buckets, key in ((self._days, day), (self._months, day.replace(day=1))):
+            bucket = buckets.setdefault(key, {})
+            totals = bucket.setdefault(category, [0.0, 0])
+            totals[0] += amount
+            totals[1] += count
+            if totals[1] <= 0:
+                del bucket[category]
+                if not bucket:
+                    del buckets[key]
+
+    def load(self, rows: Iterable[tuple[date, Hashable, float, int]]) -> None:
+        """Replace every bucket with (day, category, sum, count) rows, e.g. from a GROUP BY query"""
+        self._days, self._months = {}, {}
+        for day, category, amount, count in rows:
+            self._bump(day, category, amount, count)
+
+    def series(self, start: Optional[date] = None, end: Optional[date] = None, granularity: str = "month") -> list[dict]:
+        """Get the totals of every period from start to end, both inclusive, with the sum per category
+
+        Defaults to the 12 calendar months up to today. Periods are labelled
+        by their first day and clipped to the range; whole months are read
+        from the monthly buckets and only the days of clipped periods are
+        summed one by one.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Invalid granularity: {granularity}. Valid options: {', '.join(GRANULARITIES)}")
+        end = end or datetime.utcnow().date()
+        start = start or months_back(end, 11)
+        if start > end:
+            raise ValueError("start must not be after end")
+
+        points = []
+        period = period_start(start, granularity)
+        while period <= end:
+            if len(points) == MAX_POINTS:
+                raise ValueError(f"Range too long: at most {MAX_POINTS} {granularity}s per request")
+            following = next_period(period, granularity)
+            first, last = max(period, start), min(following - timedelta(days=1), end)
+            if granularity == "month" and first == period and last == following - timedelta(days=1):
+                buckets = [self._months.get(period)]
+            else:
+                buckets = [self._days.get(first + timedelta(days=offset)) for offset in range((last - first).days + 1)]
+
+            by_category, total, count = {}, 0.0, 0
+            for bucket in buckets:
+                for category, (amount, payments) in (bucket or {}).items():
+                    by_category[category] = by_category.get(category, 0.0) + amount
+                    total += amount
+                    count += payments
+            points.append({"period": period, "total": total, "count": count, "by_category": by_category})
+            period = following
+        return points
+
+    def totals(self, start: date, end: date) -> dict:
+        """Get the total, count and sum per category from start to end, both inclusive"""
+        by_category, total, count = {}, 0.0, 0
+        for point in self.series(start, end, "month"):
+            total += point["total"]
+            count += point["count"]
+            for category, amount in point["by_category"].items():
+                by_category[category] = by_category.get(category, 0.0) + amount
+        return {"total": total, "count": count, "by_category": by_category}
+
+    def grand_total(self) -> float:
+        """Get the total over every bucket"""
+        return sum(amount for bucket in self._months.values() for amount, _ in bucket.values())
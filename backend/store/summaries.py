@@ -0,0 +1,55 @@
+"""
+Incrementally maintained group counts and sums for dashboard summaries
+"""
+from typing import Hashable, Iterable, Union
+
+
+class GroupedTotals:
+    """Per-group record counts and field sums, updated in O(1) on every write
+
+    Groups are keyed by one field, or by a tuple of values for several fields.
+    Missing or None numeric values count as zero in the sums.
+    """
+
+    def __init__(self, key_fields: Union[str, tuple[str, ...]], sum_fields: Iterable[str] = ()):
+        self.key_fields = key_fields
+        self.sum_fields = tuple(sum_fields)
+        self._groups: dict[Hashable, list] = {}
+
+    def _key(self, row: dict) -> Hashable:
+        if isinstance(self.key_fields, str):
+            return row.get(self.key_fields)
+        return tuple(row.get(field) for field in self.key_fields)
+
+    def add(self, item_id: int, row: dict) -> None:
+        key = self._key(row)
+        totals = self._groups.get(key)
+        if totals is None:
+            totals = self._groups[key] = [0] + [0.0] * len(self.sum_fields)
+        totals[0] += 1
+        for i, field in enumerate(self.sum_fields, start=1):
+            totals[i] += row.get(field) or 0
+
+    def remove(self, item_id: int, row: dict) -> None:
+        key = self._key(row)
+        totals = self._groups.get(key)
+        if totals is None:
+            return
+        totals[0] -= 1
+        if totals[0] <= 0:
+            del self._groups[key]
+            return
+        for i, field in enumerate(self.sum_fields, start=1):
+            totals[i] -= row.get(field) or 0
+
+    def load(self, groups: dict[Hashable, tuple]) -> None:
+        """Replace every group with precomputed (count, *sums) totals"""
+        self._groups = {key: list(totals) for key, totals in groups.items() if totals[0] > 0}
+
+    def groups(self) -> dict[Hashable, tuple]:
+        """Get (count, *sums) for every non-empty group"""
+        return {key: tuple(totals) for key, totals in self._groups.items()}
+
+    def counts(self) -> dict[Hashable, int]:
+        """Get the record count of every non-empty group"""
+        return {key: totals[0] for key, totals in self._groups.items()}
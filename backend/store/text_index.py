@@ -0,0 +1,106 @@
+"""
+Trigram inverted index for substring search over text fields
+"""
+from typing import Iterable, Optional
+
+from .indexes import intersect_postings
+
+GRAM_SIZE = 3
+FIELD_SEPARATOR = "\x00"
+
+
+def trigrams(text: str) -> set[str]:
+    """Get the set of overlapping 3-character grams of a lowercased string"""
+    return {text[i:i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to the record IDs whose text fields contain them"""
+
+    def __init__(self, fields: Iterable[str]):
+        self.fields = tuple(fields)
+        self._postings: dict[str, set[int]] = {}
+        # Lowercased field values joined by FIELD_SEPARATOR, so a candidate
+        # can be verified with a single substring test
+        self._texts: dict[int, str] = {}
+
+    def add(self, item_id: int, row: dict) -> None:
+        texts = [str(row.get(field) or "").lower() for field in self.fields]
+        self._texts[item_id] = FIELD_SEPARATOR.join(texts)
+        for gram in set().union(*map(trigrams, texts)):
+            self._postings.setdefault(gram, set()).add(item_id)
+
+    def remove(self, item_id: int, row: dict) -> None:
+        text = self._texts.pop(item_id, None)
+        if text is None:
+            return
+        for gram in set().union(*map(trigrams, text.split(FIELD_SEPARATOR))):
+            posting = self._postings.get(gram)
+            if posting is None:
+                continue
+            posting.discard(item_id)
+            if not posting:
+                del self._postings[gram]
+
+    def candidates(self, query: str) -> Optional[set[int]]:
+        """Get the IDs that contain every trigram of the query
+
+        Candidates still need a substring check, since sharing all trigrams
+        does not guarantee the query occurs contiguously. Returns None for
+        queries shorter than a trigram, which the index cannot answer.
+        """
+        grams = trigrams(query.lower())
+        if not grams:
+            return None
+        return intersect_postings(self._postings.get(gram, set()) for gram in grams)
+
+    def rank(self, query: str, item_id: int) -> Optional[tuple]:
+        """Get the match_rank of a record for query, None if it does not match"""
+        return match_rank(query.lower(), self._texts.get(item_id, "").split(FIELD_SEPARATOR))
+
+    def search(self, query: str, ids: Optional[set[int]] = None, after: Optional[tuple] = None) -> list[int]:
+        """Get the IDs whose fields contain query, best matches first, ties in ID order
+
+        Only candidates sharing every trigram of the query are checked.
+        Queries shorter than a trigram check every ID (or every ID in ids).
+        With after, a (rank, id) position, only the matches ranked after it are returned.
+        """
+        query = query.lower()
+        candidates = self.candidates(query)
+        if candidates is None:
+            candidates = ids if ids is not None else self._texts.keys()
+        elif ids is not None:
+            candidates = candidates & ids
+
+        texts = self._texts
+        matches = [item_id for item_id in candidates if query in texts.get(item_id, "")]
+        ranked = [(match_rank(query, texts[item_id].split(FIELD_SEPARATOR)), item_id) for item_id in matches]
+        if after is not None:
+            ranked = [entry for entry in ranked if entry > after]
+        ranked.sort()
+        return [item_id for _, item_id in ranked]
+
+
+def match_rank(query: str, texts: list[str]) -> Optional[tuple]:
+    """Rank how well lowercased field texts match a lowercased query, None if none match
+
+    Lower is better: an exact field match beats a prefix, which beats a match
+    at a word boundary, which beats any other substring. Earlier fields win ties.
+    """
+    best = None
+    for position, text in enumerate(texts):
+        offset = text.find(query)
+        if offset < 0:
+            continue
+        if text == query:
+            kind = 0
+        elif offset == 0:
+            kind = 1
+        elif not text[offset - 1].isalnum():
+            kind = 2
+        else:
+            kind = 3
+        rank = (kind, position)
+        if best is None or rank < best:
+            best = rank
+    return best